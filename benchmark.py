@@ -0,0 +1,341 @@
+"""Benchmark script comparing OCR backends on sample documents."""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+# Add project root to Python path for imports to work
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Compute the character error rate (edit distance / reference length).
+    
+    Whitespace runs are collapsed first so layout differences between
+    engines are not counted as errors.
+    
+    Args:
+        reference: Expected text
+        hypothesis: Recognized text
+    
+    Returns:
+        Character error rate (0 is a perfect match)
+    """
+    reference = ' '.join(reference.split())
+    hypothesis = ' '.join(hypothesis.split())
+    if not reference:
+        return 0.0 if not hypothesis else 1.0
+    
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_char in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_char in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_char != hyp_char)
+            ))
+        previous = current
+    return previous[-1] / len(reference)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the current process in MB (0 if unknown)."""
+    from src.utils.memory import MB, peak_rss
+    return (peak_rss() or 0) / MB
+
+
+def page_name(file_path, page_index, page_count):
+    """Name a page as its file name, with #<page> if the file has several pages."""
+    name = os.path.basename(file_path)
+    if page_count > 1:
+        name = f"{name}#{page_index + 1}"
+    return name
+
+
+def load_pages(files, dpi):
+    """Load every page of the benchmark files as (name, page) pairs."""
+    from src.utils.file_handler import FileHandler
+    
+    pages = []
+    for file_path in files:
+        page_count = FileHandler.count_pages(file_path)
+        for page in FileHandler.iter_pages(file_path, dpi):
+            pages.append((page_name(file_path, page.page_index, page_count), page))
+    return pages
+
+
+def run_backend(engine_type, backend, files, language, dpi, repeat):
+    """
+    Benchmark one backend.
+    
+    Called in a fresh worker process per backend so load time and peak
+    memory are not skewed by models loaded for another backend.
+    """
+    from src.ocr.registry import EngineRegistry
+    
+    pages = load_pages(files, dpi)
+    EngineRegistry.set_backend(backend)
+    
+    start = time.perf_counter()
+    engine = EngineRegistry.create_engine(engine_type)
+    # The first inference builds the readers, count it as loading
+    engine.extract_text(EngineRegistry._dummy_image(), language, preprocess=False)
+    load_seconds = time.perf_counter() - start
+    
+    texts = {}
+    latencies = []
+    for name, page in pages:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            texts[name] = engine.extract_text(page, language, preprocess=False)
+            latencies.append(time.perf_counter() - start)
+    
+    return {
+        'backend': backend,
+        'load_seconds': load_seconds,
+        'latencies': latencies,
+        'texts': texts,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def read_truth(truth_dir, name):
+    """Read the ground truth text of a page, if available."""
+    if not truth_dir:
+        return None
+    path = os.path.join(truth_dir, os.path.splitext(name.split('#')[0])[0] + '.txt')
+    if '#' in name:
+        path = path[:-4] + f".{name.split('#')[1]}.txt"
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def cmd_backends(args) -> int:
+    """Compare native and ONNX Runtime backends of a neural engine."""
+    from src.cli import collect_files
+    
+    files = collect_files(args.inputs)
+    if not files:
+        print("No supported input files found")
+        return 1
+    
+    backends = [name.strip() for name in args.backends.split(',') if name.strip()]
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for backend in backends:
+        print(f"Running {args.engine} with {backend} backend...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            try:
+                results.append(pool.submit(
+                    run_backend, args.engine, backend, files, args.language, args.dpi, args.repeat
+                ).result())
+            except Exception as e:
+                print(f"  {backend} failed: {e}")
+    
+    if not results:
+        return 1
+    
+    # Without ground truth, accuracy is measured against the first backend
+    reference = results[0]
+    print()
+    print(f"{'Backend':<12} {'Load (s)':>9} {'Page (s)':>9} {'p95 (s)':>9} {'Peak MB':>9} {'CER':>7}")
+    for result in results:
+        latencies = sorted(result['latencies'])
+        mean = sum(latencies) / len(latencies) if latencies else 0.0
+        p95 = latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0
+        
+        errors = []
+        for name, text in result['texts'].items():
+            truth = read_truth(args.truth, name)
+            if truth is None:
+                truth = reference['texts'].get(name, '')
+            errors.append(character_error_rate(truth, text))
+        cer = sum(errors) / len(errors) if errors else 0.0
+        
+        print(
+            f"{result['backend']:<12} {result['load_seconds']:>9.2f} {mean:>9.3f} "
+            f"{p95:>9.3f} {result['peak_rss_mb']:>9.0f} {cer:>7.2%}"
+        )
+    if not args.truth:
+        print(f"\nCER is measured against the {reference['backend']} backend output (no --truth given)")
+    return 0
+
+
+def profile_names(value):
+    """Parse a comma-separated list of speed profile names for argparse."""
+    from src.ocr.profiles import PROFILES
+    
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in PROFILES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown profile(s): {', '.join(unknown)} (choose from {', '.join(PROFILES)})"
+        )
+    if not names:
+        raise argparse.ArgumentTypeError("no profile given")
+    return names
+
+
+def cmd_profiles(args) -> int:
+    """Compare throughput and accuracy of the speed profiles."""
+    from src.cli import collect_files
+    from src.ocr.pipeline import OCRPipeline
+    from src.ocr.profiles import PROFILES, apply_profile
+    from src.ocr.registry import EngineRegistry
+    from src.ocr.tiling import TiledRecognizer
+    
+    files = collect_files(args.inputs)
+    if not files:
+        print("No supported input files found")
+        return 1
+    
+    engine = EngineRegistry.get_engine(args.engine)
+    results = []
+    for name in args.profiles:
+        profile = PROFILES[name]
+        print(f"Running {args.engine} with {name} profile...")
+        apply_profile(engine, profile)
+        pipeline = OCRPipeline(
+            TiledRecognizer(engine), args.language, dpi=profile.dpi,
+            preprocess_options=profile.preprocess_options
+        )
+        
+        texts = {}
+        # Timing includes rasterization, which the profile's DPI affects too
+        start = time.perf_counter()
+        for result in pipeline.process_files(files):
+            texts[page_name(result.source, result.page_index, result.page_count)] = result.text
+        elapsed = time.perf_counter() - start
+        results.append({'profile': name, 'seconds': elapsed, 'texts': texts})
+    
+    # Without ground truth, accuracy is measured against the most accurate profile run
+    reference = next((r for r in results if r['profile'] == 'accurate'), results[-1])
+    print()
+    print(f"{'Profile':<10} {'Pages':>6} {'Time (s)':>9} {'Pages/s':>8} {'CER':>7}")
+    for result in results:
+        pages = len(result['texts'])
+        errors = []
+        for name, text in result['texts'].items():
+            truth = read_truth(args.truth, name)
+            if truth is None:
+                truth = reference['texts'].get(name, '')
+            errors.append(character_error_rate(truth, text))
+        cer = sum(errors) / len(errors) if errors else 0.0
+        rate = pages / result['seconds'] if result['seconds'] else 0.0
+        print(f"{result['profile']:<10} {pages:>6} {result['seconds']:>9.2f} {rate:>8.2f} {cer:>7.2%}")
+    if not args.truth:
+        print(f"\nCER is measured against the {reference['profile']} profile output (no --truth given)")
+    return 0
+
+
+def transport_worker(conn):
+    """Receive pages (arrays or shared memory descriptors) and touch every memory page of each."""
+    from src.utils.shm_transport import PageDescriptor, SharedPageReader
+    
+    reader = SharedPageReader()
+    while True:
+        page = conn.recv()
+        if page is None:
+            reader.close()
+            return
+        array = reader.view(page) if isinstance(page, PageDescriptor) else page
+        # Read one byte per 4 KB so both transports pay for faulting the pixels in
+        conn.send(int(array.reshape(-1)[::4096].max()))
+        page = array = None
+
+
+def cmd_transport(args) -> int:
+    """Compare pickled and shared-memory transfer of pages to a worker process."""
+    import numpy as np
+    from src.utils.shm_transport import SharedPagePool, pack_page
+    
+    shape = (args.height, args.width, 3) if args.channels == 3 else (args.height, args.width)
+    rng = np.random.default_rng(0)
+    pages = [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(2)]
+    size_mb = pages[0].nbytes / (1024 * 1024)
+    print(f"{args.pages} page(s) of {args.width}x{args.height}x{args.channels} ({size_mb:.1f} MB)")
+    
+    context = multiprocessing.get_context('spawn')
+    print()
+    print(f"{'Transport':<10} {'ms/page':>8} {'MB/s':>8} {'Pages/s':>8}")
+    for transport in ('pickle', 'shm'):
+        parent_conn, child_conn = context.Pipe()
+        worker = context.Process(target=transport_worker, args=(child_conn,), daemon=True)
+        worker.start()
+        pool = SharedPagePool()
+        
+        start = time.perf_counter()
+        for index in range(args.pages):
+            array = pages[index % len(pages)]
+            page = pack_page(pool, array) if transport == 'shm' else array
+            parent_conn.send(page)
+            parent_conn.recv()
+            if page is not array:
+                pool.release(page)
+        elapsed = time.perf_counter() - start
+        
+        parent_conn.send(None)
+        worker.join()
+        pool.close()
+        per_page = elapsed / args.pages
+        print(f"{transport:<10} {per_page * 1000:>8.2f} {size_mb / per_page:>8.0f} {1 / per_page:>8.1f}")
+        if transport == 'shm':
+            print(f"\nShared memory: {pool.report()}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    from src.ocr.registry import EngineRegistry
+    
+    parser = argparse.ArgumentParser(description="Benchmark the Arabic-French OCR Tool")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+    
+    backends = subparsers.add_parser('backends', help="Compare native and ONNX Runtime backends")
+    backends.add_argument('inputs', nargs='+', help="Sample files or directories")
+    backends.add_argument('--engine', choices=['easyocr', 'paddleocr'], default='easyocr')
+    backends.add_argument('--backends', default='native,onnx,onnx-int8',
+                          help="Comma-separated backends to compare (default: native,onnx,onnx-int8)")
+    backends.add_argument('--language', choices=['Both', 'Arabic', 'French'], default='Both')
+    backends.add_argument('--dpi', type=int, default=300, help="DPI for PDF conversion")
+    backends.add_argument('--repeat', type=int, default=1, help="Recognize every page this many times")
+    backends.add_argument('--truth', metavar='DIR',
+                          help="Directory of ground truth <name>.txt files (<name>.<page>.txt for PDF pages)")
+    backends.set_defaults(func=cmd_backends)
+    
+    profiles = subparsers.add_parser('profiles', help="Compare the fast, balanced and accurate speed profiles")
+    profiles.add_argument('inputs', nargs='+', help="Sample files or directories")
+    profiles.add_argument('--engine', choices=EngineRegistry.ENGINE_TYPES, default='tesseract')
+    profiles.add_argument('--profiles', type=profile_names, default='fast,balanced,accurate',
+                          help="Comma-separated profiles to compare (default: fast,balanced,accurate)")
+    profiles.add_argument('--language', choices=['Both', 'Arabic', 'French'], default='Both')
+    profiles.add_argument('--truth', metavar='DIR',
+                          help="Directory of ground truth <name>.txt files (<name>.<page>.txt for PDF pages)")
+    profiles.set_defaults(func=cmd_profiles)
+    
+    transport = subparsers.add_parser('transport', help="Compare pickled and shared-memory page transfer to worker processes")
+    transport.add_argument('--width', type=int, default=2480, help="Page width in pixels (default: A4 at 300 DPI)")
+    transport.add_argument('--height', type=int, default=3508, help="Page height in pixels (default: A4 at 300 DPI)")
+    transport.add_argument('--channels', type=int, choices=[1, 3], default=3)
+    transport.add_argument('--pages', type=int, default=50, help="Number of pages to send")
+    transport.set_defaults(func=cmd_transport)
+    
+    return parser
+
+
+def main(argv=None) -> int:
+    """Run the benchmark."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
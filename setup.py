@@ -35,6 +35,7 @@ setup(
     entry_points={
         "console_scripts": [
             "arabic-french-ocr=src.main:main",
+            "arabic-french-ocr-batch=src.cli:main",
         ],
     },
 )
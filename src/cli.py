@@ -0,0 +1,386 @@
+"""Command-line batch runner for Arabic-French OCR Tool."""
+
+import sys
+import os
+import argparse
+import logging
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+# Add project root to Python path for imports to work
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.ocr.registry import EngineRegistry
+from src.ocr.tiling import TiledRecognizer
+from src.ocr.pipeline import OCRPipeline
+from src.ocr.results import PageResult
+from src.ocr.dedup import DuplicateIndex
+from src.ocr.blank import BlankPageDetector
+from src.ocr.model_manager import ModelManager
+from src.ocr.onnx_backend import BACKENDS
+from src.ocr import sharding
+from src.ocr.scheduler import JobScheduler, ScheduleStats
+from src.ocr.profiles import DEFAULT_PROFILE, PROFILES, apply_profile, get_profile
+from src.ocr.supervisor import SupervisedEngine
+from src.utils.file_handler import FileHandler
+from src.utils.export import ExportHandler
+from src.utils.memory import MemoryGovernor
+from src.utils.paths import get_data_dir
+from src.utils.search_index import SearchIndex
+from src.utils.profiling import RunProfiler
+
+logger = logging.getLogger('ocr')
+
+
+def collect_files(inputs: Iterable[str]) -> List[str]:
+    """
+    Expand input paths into a list of supported files.
+    
+    Directories are searched recursively, files are kept in the order
+    given and directory contents are sorted for reproducible batches.
+    
+    Args:
+        inputs: File and directory paths
+    
+    Returns:
+        List of supported file paths
+    """
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, _, names in sorted(os.walk(path)):
+                for name in sorted(names):
+                    file_path = os.path.join(root, name)
+                    if FileHandler.is_supported_file(file_path):
+                        files.append(file_path)
+        elif FileHandler.is_supported_file(path):
+            files.append(path)
+        else:
+            logger.warning("Skipping unsupported file: %s", path)
+    return files
+
+
+def log_progress(results: Iterable[PageResult]) -> Iterator[PageResult]:
+    """Pass page results through, logging each one."""
+    for result in results:
+        name = os.path.basename(result.source)
+        if result.blank:
+            logger.info("%s: page %d/%d (blank)", name, result.page_index + 1, result.page_count)
+        elif result.duplicate_of:
+            logger.info("%s: page %d/%d (duplicate of %s)", name, result.page_index + 1, result.page_count, result.duplicate_of)
+        elif result.ok:
+            logger.info("%s: page %d/%d", name, result.page_index + 1, result.page_count)
+        else:
+            logger.error("%s: %s", name, result.error)
+        yield result
+
+
+def cmd_run(args) -> int:
+    """Run OCR on the input files, profiling the run if requested."""
+    if not args.profile:
+        return run_batch(args)
+    
+    profiler = RunProfiler(args.profile)
+    with profiler:
+        status = run_batch(args)
+    profiler.write(args.profile_dir or get_data_dir('profiles'))
+    logger.info("Profile: %s", profiler.report())
+    return status
+
+
+def run_batch(args) -> int:
+    """Run OCR on the input files and stream results to the output file."""
+    EngineRegistry.set_backend(args.backend)
+    if not args.isolate:
+        # Load the models while the inputs are collected and planned;
+        # supervised workers load their own, so there is nothing to warm here
+        EngineRegistry.start_warmup([args.engine], args.language)
+    
+    files = collect_files(args.inputs)
+    if not files:
+        logger.error("No supported input files found")
+        return 1
+    
+    output = args.output
+    selection = None
+    if args.shard:
+        try:
+            shard_index, shard_count = sharding.parse_shard(args.shard)
+        except ValueError as e:
+            logger.error("%s", e)
+            return 1
+        # Each shard writes JSON Lines and a manifest into the output directory
+        os.makedirs(args.output, exist_ok=True)
+        page_counts, selection = sharding.plan_shard(files, shard_index, shard_count)
+        files = [file_path for file_path in files if file_path in selection]
+        base = os.path.join(args.output, sharding.shard_name(shard_index, shard_count))
+        output = base + '.jsonl'
+        logger.info(
+            "Shard %d/%d: %d of %d page(s)", shard_index, shard_count,
+            sum(len(pages) for pages in selection.values()),
+            sum(count for _, count in page_counts)
+        )
+    
+    if args.schedule != 'fifo':
+        if args.shard:
+            # Merging relies on every shard writing pages in batch order
+            logger.error("--schedule cannot be combined with --shard")
+            return 1
+        files = JobScheduler(args.schedule).order(files)
+    
+    if args.isolate:
+        options = {}
+        if args.cascade_threshold is not None and args.engine.startswith(EngineRegistry.CASCADE_PREFIX):
+            options['threshold'] = args.cascade_threshold
+        base_engine = SupervisedEngine(
+            args.engine, args.backend,
+            page_timeout=args.page_timeout,
+            retries=args.retries,
+            on_failure=args.on_failure,
+            options=options
+        )
+    else:
+        base_engine = EngineRegistry.get_engine(args.engine)
+        if args.cascade_threshold is not None and hasattr(base_engine, 'threshold'):
+            base_engine.threshold = args.cascade_threshold
+    profile = get_profile(args.speed)
+    apply_profile(base_engine, profile)
+    dpi = args.dpi or profile.dpi
+    
+    budget = args.memory_budget * 1024 * 1024 if args.memory_budget else None
+    governor = MemoryGovernor(budget, trace_allocations=args.trace_allocations)
+    engine = TiledRecognizer(base_engine, memory_governor=governor)
+    # Searchable PDFs need the page pixels alongside the word boxes
+    output_format = ExportHandler.detect_format(output)
+    keep_images = output_format == 'pdf'
+    preprocess_options = profile.preprocess_options
+    if output_format in ExportHandler.LAYOUT_FORMATS:
+        # Word boxes must match the original page the layout is laid over,
+        # which a deskewed (rotated) image does not
+        preprocess_options = dict(preprocess_options, deskew=False)
+    
+    dedup_index = None
+    if args.dedup or args.dedup_db:
+        dedup_index = DuplicateIndex(
+            args.dedup_db,
+            max_distance=args.dedup_distance,
+            settings_key=f"{args.engine}:{args.language}:{args.preprocess}:{args.adaptive}:{args.speed}"
+        )
+    
+    blank_detector = None
+    if args.skip_blank:
+        blank_detector = BlankPageDetector(
+            ink_threshold=args.blank_ink_threshold,
+            std_threshold=args.blank_std_threshold
+        )
+    
+    pipeline = OCRPipeline(
+        engine, args.language, args.preprocess, dpi,
+        keep_images=keep_images, dedup_index=dedup_index,
+        blank_detector=blank_detector, adaptive=args.adaptive,
+        preprocess_options=preprocess_options, memory_governor=governor,
+        grayscale_pdf=args.engine in EngineRegistry.GRAYSCALE_ENGINES and not keep_images
+    )
+    
+    counters = {'pages': 0, 'errors': 0}
+    
+    def count(results):
+        for result in results:
+            counters['pages' if result.ok else 'errors'] += 1
+            yield result
+    
+    search_index = None
+    if args.index or args.index_db:
+        try:
+            search_index = SearchIndex(args.index_db)
+        except RuntimeError as e:
+            logger.error("%s", e)
+            return 1
+    
+    def index(results):
+        for result in results:
+            search_index.add_result(result)
+            yield result
+    
+    stats = ScheduleStats()
+    results = count(stats.track(log_progress(pipeline.process_files(files, selection))))
+    if search_index is not None:
+        results = index(results)
+    success = ExportHandler.stream_export(results, output)
+    if search_index is not None:
+        search_index.close()
+    
+    if dedup_index is not None:
+        logger.info("Deduplication: %s", dedup_index.report())
+        dedup_index.close()
+    if hasattr(base_engine, 'lines_rerun'):
+        logger.info("Cascade: %s", base_engine.report())
+    for part in (base_engine, getattr(base_engine, 'fallback', None)):
+        if hasattr(part, 'models'):
+            logger.info("Models: %s", part.models.report())
+    logger.info("Schedule (%s): %s", args.schedule, stats.report())
+    logger.info("Memory: %s", governor.report())
+    governor.stop()
+    if args.isolate:
+        logger.info("Workers: %s", base_engine.report())
+        base_engine.close()
+    if blank_detector is not None:
+        logger.info("Blank pages: %s", blank_detector.report(pipeline.average_page_seconds()))
+    if not success:
+        return 1
+    
+    if args.shard:
+        sharding.write_manifest(base + sharding.MANIFEST_SUFFIX, shard_index, shard_count, page_counts, counters)
+    logger.info("Results written to %s", output)
+    return 0
+
+
+def cmd_merge(args) -> int:
+    """Merge shard outputs into one ordered result file."""
+    if ExportHandler.detect_format(args.output) == 'pdf':
+        logger.error("Searchable PDFs need the page images and cannot be built from shard outputs")
+        return 1
+    
+    try:
+        # Check the manifests before the output file is created
+        sharding.read_manifests(args.directory)
+    except (OSError, ValueError) as e:
+        logger.error("%s", e)
+        return 1
+    
+    missing = 0
+    
+    def check(results):
+        nonlocal missing
+        for result in results:
+            if result.error == sharding.MISSING_PAGE_ERROR:
+                missing += 1
+            yield result
+    
+    if not ExportHandler.stream_export(check(sharding.merge_shards(args.directory)), args.output):
+        return 1
+    if missing:
+        logger.warning("%d page(s) missing from the shard outputs", missing)
+    logger.info("Merged results written to %s", args.output)
+    return 0
+
+
+def cmd_search(args) -> int:
+    """Search the full-text index of processed documents."""
+    try:
+        search_index = SearchIndex(args.db)
+    except RuntimeError as e:
+        logger.error("%s", e)
+        return 1
+    
+    try:
+        hits = search_index.search(' '.join(args.query), limit=args.limit)
+    finally:
+        search_index.close()
+    
+    for hit in hits:
+        page = f" (page {hit.page_index + 1}/{hit.page_count})" if hit.page_count > 1 else ""
+        print(f"{hit.path}{page}: {hit.snippet}")
+    if not hits:
+        logger.info("No matches")
+    return 0 if hits else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='arabic-french-ocr-batch',
+        description="Batch OCR for Arabic and French documents"
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+    
+    run = subparsers.add_parser('run', help="Run OCR on files and directories")
+    run.add_argument('inputs', nargs='+', help="Input files or directories")
+    run.add_argument('-o', '--output', required=True,
+                     help="Output file (.txt, .jsonl, .docx, .hocr, .alto.xml or searchable .pdf), "
+                          "or output directory with --shard")
+    run.add_argument('--engine', choices=EngineRegistry.ENGINE_TYPES, default='tesseract')
+    run.add_argument('--backend', choices=BACKENDS, default=EngineRegistry.backend,
+                     help="Inference backend of EasyOCR/PaddleOCR: native, or ONNX Runtime on CPU with float or int8 models")
+    run.add_argument('--cascade-threshold', type=float, metavar='CONF',
+                     help="Mean line confidence (0-1) below which cascade engines re-run a line (default: 0.6)")
+    run.add_argument('--isolate', action='store_true',
+                     help="Run the engine in a supervised worker process that is restarted if it crashes or hangs")
+    run.add_argument('--page-timeout', type=float, default=120.0, metavar='SECONDS',
+                     help="With --isolate, seconds a page may take before the worker is restarted (default: 120)")
+    run.add_argument('--retries', type=int, default=1,
+                     help="With --isolate, attempts on a fresh worker for a page that crashed or hung it (default: 1)")
+    run.add_argument('--on-failure', choices=SupervisedEngine.POLICIES, default='skip',
+                     help="With --isolate, skip a page that still fails or fail the rest of its file (default: skip)")
+    run.add_argument('--language', choices=['Both', 'Arabic', 'French'], default='Both')
+    run.add_argument('--no-preprocess', dest='preprocess', action='store_false',
+                     help="Disable image preprocessing")
+    run.add_argument('--full-preprocess', dest='adaptive', action='store_false',
+                     help="Run every preprocessing stage on every page instead of choosing stages per page")
+    run.add_argument('--speed', choices=list(PROFILES), default=DEFAULT_PROFILE,
+                     help="Speed profile setting DPI, Tesseract models and modes, confidence thresholds "
+                          "and preprocessing (default: balanced)")
+    run.add_argument('--dpi', type=int, help="DPI for PDF conversion (default: from the speed profile)")
+    run.add_argument('--dedup', action='store_true',
+                     help="Reuse results for near-identical pages within the batch")
+    run.add_argument('--dedup-db', metavar='PATH',
+                     help="Persistent duplicate index shared across batches (implies --dedup)")
+    run.add_argument('--dedup-distance', type=int, default=4, metavar='N',
+                     choices=range(DuplicateIndex.BANDS),
+                     help=f"Maximum perceptual hash distance between duplicates, "
+                          f"0 to {DuplicateIndex.BANDS - 1} (default: 4)")
+    run.add_argument('--skip-blank', action='store_true',
+                     help="Detect blank pages and skip OCR for them")
+    run.add_argument('--blank-ink-threshold', type=float, default=0.0005,
+                     help="Maximum share of ink pixels on a blank page (default: 0.0005)")
+    run.add_argument('--blank-std-threshold', type=float, default=4.0,
+                     help="Maximum gray level deviation of a blank page, checked with the ink share (default: 4.0)")
+    run.add_argument('--schedule', choices=JobScheduler.POLICIES, default='fifo',
+                     help="File order: fifo (as given), sjf (smallest first, fastest first results) "
+                          "or lpt (largest first, shortest total time with several workers)")
+    run.add_argument('--shard', metavar='I/N',
+                     help="Process only shard I of N (pages are assigned by a stable hash of path and "
+                          "page index), writing JSON Lines and a manifest into the output directory")
+    run.add_argument('--index', action='store_true',
+                     help="Add the recognized pages to the full-text search index")
+    run.add_argument('--index-db', metavar='PATH',
+                     help="Search index database (implies --index, default: search.sqlite in the application data directory)")
+    run.add_argument('--memory-budget', type=int, metavar='MB',
+                     default=(ModelManager.budget_from_env('OCR_MEMORY_BUDGET_MB', None) or 0) // (1024 * 1024),
+                     help="Process memory to stay below: page loading pauses and tiles run with fewer "
+                          "workers when it gets close (default: OCR_MEMORY_BUDGET_MB, 0 for no limit)")
+    run.add_argument('--trace-allocations', action='store_true',
+                     help="Report the Python/NumPy allocation sites that grew most for each document (slower)")
+    run.add_argument('--profile', nargs='?', const='sample', choices=RunProfiler.MODES,
+                     help="Profile the run and write speedscope and collapsed-stack flame graph files: "
+                          "sample (default, low overhead, all worker threads) or cprofile (every call, main thread)")
+    run.add_argument('--profile-dir', metavar='DIR',
+                     help="Directory for profile files (default: profiles in the application data directory)")
+    run.set_defaults(func=cmd_run)
+    
+    merge = subparsers.add_parser('merge', help="Merge the outputs of sharded runs")
+    merge.add_argument('directory', help="Directory holding the shard outputs")
+    merge.add_argument('-o', '--output', required=True, help="Output file (.txt, .jsonl, .docx, .hocr or .alto.xml)")
+    merge.set_defaults(func=cmd_merge)
+    
+    search = subparsers.add_parser('search', help="Search previously processed documents")
+    search.add_argument('query', nargs='+', help="Words or numbers to find (all must match)")
+    search.add_argument('--db', metavar='PATH',
+                        help="Search index database (default: search.sqlite in the application data directory)")
+    search.add_argument('--limit', type=int, default=20, help="Maximum number of results (default: 20)")
+    search.set_defaults(func=cmd_search)
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the command-line interface."""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,114 +6,229 @@ from typing import List, Optional
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QTextEdit, QComboBox, QFileDialog, QMessageBox,
-    QProgressBar, QListWidget, QSplitter, QGroupBox, QCheckBox
+    QProgressBar, QListWidget, QListWidgetItem, QSplitter, QGroupBox, QCheckBox
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QMimeData
-from PyQt5.QtGui import QPixmap, QDragEnterEvent, QDropEvent, QFont
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QMimeData, QSize
+from PyQt5.QtGui import QPixmap, QIcon, QDragEnterEvent, QDropEvent, QFont
 from PIL import Image
 
 from src.ocr.engine import OCREngine
+from src.ocr.registry import EngineRegistry
+from src.ocr.tiling import TiledRecognizer
+from src.ocr.pipeline import OCRPipeline
+from src.ocr.dedup import DuplicateIndex
+from src.ocr.blank import BlankPageDetector
+from src.ocr.model_manager import ModelManager
+from src.ocr.scheduler import JobScheduler, ScheduleStats
+from src.ocr.profiles import DEFAULT_PROFILE, PROFILES, apply_profile, get_profile
+from src.ocr.supervisor import SupervisedEngine
 from src.utils.file_handler import FileHandler
 from src.utils.export import ExportHandler
+from src.utils.thumbnails import ThumbnailCache
+from src.utils.paths import get_data_dir
+from src.utils.progress import ThroughputMeter
+from src.utils.memory import MemoryGovernor
+from src.utils.search_index import SearchIndex
+from src.gui.search_dialog import SearchDialog
+from src.utils.profiling import RunProfiler
 
 
 class OCRWorker(QThread):
     """Worker thread for OCR processing to keep UI responsive."""
     
-    progress = pyqtSignal(int, int)  # current, total
-    result = pyqtSignal(str, str)  # text, filename
+    progress = pyqtSignal(int, int, float, float)  # pages done, total pages, pages/sec, ETA seconds (-1 if unknown)
+    page_result = pyqtSignal(str, int, int, str)  # filename, page number, page count, text
     error = pyqtSignal(str)
     finished = pyqtSignal()
     
-    def __init__(self, files: List[str], language: str, preprocess: bool, engine_type: str = 'tesseract'):
+    def __init__(self, files: List[str], language: str, preprocess: bool, engine_type: str = 'tesseract', dedup: bool = False, skip_blank: bool = False, schedule: str = 'fifo', adaptive: bool = True, speed: str = DEFAULT_PROFILE, profiling: bool = False, supervised: Optional[SupervisedEngine] = None):
         super().__init__()
         self.files = files
         self.language = language
         self.preprocess = preprocess
         self.engine_type = engine_type
+        self.dedup = dedup
+        self.dedup_report = ""
+        self.skip_blank = skip_blank
+        self.blank_report = ""
+        self.schedule = schedule
+        self.adaptive = adaptive
+        self.profile = get_profile(speed)
+        self.schedule_report = ""
+        self.profiling = profiling
+        self.profile_report = ""
+        self.memory_report = ""
+        self.supervised = supervised
+        self.worker_report = ""
         self.ocr_engine = None
     
+    def _emit_progress(self, meter: ThroughputMeter, total: int):
+        """Emit page progress with the current throughput and ETA."""
+        eta = meter.eta(max(total - meter.done, 0))
+        self.progress.emit(meter.done, total, meter.rate(), -1.0 if eta is None else eta)
+    
     def _init_engine(self):
-        """Lazy initialize the selected engine."""
+        """Lazy initialize the selected engine, reusing a warmed-up instance."""
         if self.ocr_engine is not None:
             return
         
-        if self.engine_type == 'easyocr':
-            try:
-                import os
-                os.environ.setdefault('KMP_DUPLICATE_LIB_OK', 'TRUE')
-                from src.ocr.easyocr_engine import EasyOCREngine
-                self.ocr_engine = EasyOCREngine()
-            except Exception as e:
-                error_msg = str(e)
-                if 'DLL' in error_msg or 'WinError' in error_msg:
-                    raise RuntimeError(f"Failed to load EasyOCR engine due to Windows DLL issue. Please install Microsoft Visual C++ Redistributable: https://aka.ms/vs/17/release/vc_redist.x64.exe")
-                raise RuntimeError(f"Failed to load EasyOCR engine: {str(e)}")
-        elif self.engine_type == 'paddleocr':
-            try:
-                import os
-                os.environ.setdefault('KMP_DUPLICATE_LIB_OK', 'TRUE')
-                from src.ocr.paddleocr_engine import PaddleOCREngine
-                self.ocr_engine = PaddleOCREngine()
-            except Exception as e:
-                error_msg = str(e)
-                if 'DLL' in error_msg or 'WinError' in error_msg:
-                    raise RuntimeError(f"Failed to load PaddleOCR engine due to Windows DLL issue. Please install Microsoft Visual C++ Redistributable: https://aka.ms/vs/17/release/vc_redist.x64.exe")
-                raise RuntimeError(f"Failed to load PaddleOCR engine: {str(e)}")
+        # Oversized scans are split into tiles automatically
+        if self.supervised is not None:
+            self.ocr_engine = TiledRecognizer(self.supervised)
         else:
-            self.ocr_engine = OCREngine()
+            self.ocr_engine = TiledRecognizer(EngineRegistry.get_engine(self.engine_type))
     
     def run(self):
-        """Run OCR processing on files."""
+        """Run OCR processing on files, profiling the run if requested."""
+        profiler = RunProfiler() if self.profiling else None
         try:
-            # Initialize engine on first use (lazy loading)
-            self._init_engine()
-            
-            for idx, file_path in enumerate(self.files):
+            if profiler is not None:
+                profiler.start()
+            self._process()
+        except Exception as e:
+            self.error.emit(f"OCR processing failed: {str(e)}")
+        finally:
+            if profiler is not None:
+                profiler.stop()
                 try:
-                    # Load images from file
-                    images = FileHandler.load_file(file_path)
-                    
-                    all_text = []
-                    for page_num, image in enumerate(images):
-                        # Extract text
-                        text = self.ocr_engine.extract_text(
-                            image, 
-                            self.language,
-                            preprocess=self.preprocess
-                        )
-                        
-                        if len(images) > 1:
-                            all_text.append(f"--- Page {page_num + 1} ---\n{text}")
-                        else:
-                            all_text.append(text)
-                    
-                    combined_text = '\n\n'.join(all_text)
-                    self.result.emit(combined_text, os.path.basename(file_path))
-                    
+                    directory = get_data_dir('profiles')
+                    profiler.write(directory)
+                    self.profile_report = f"profile written to {directory}: {profiler.report()}"
                 except Exception as e:
-                    self.error.emit(f"Error processing {os.path.basename(file_path)}: {str(e)}")
+                    # A failed write must not keep the window in its processing state
+                    self.error.emit(f"Failed to write run profile: {str(e)}")
+        self.finished.emit()
+    
+    def _process(self):
+        """Recognize the files page by page, emitting results as they come."""
+        # Initialize engine on first use (lazy loading)
+        self._init_engine()
+        apply_profile(self.ocr_engine, self.profile)
+        
+        # Pages wait for memory instead of running the process out of it
+        governor = MemoryGovernor(ModelManager.budget_from_env('OCR_MEMORY_BUDGET_MB', None))
+        self.ocr_engine.memory_governor = governor
+        
+        dedup_index = None
+        if self.dedup:
+            dedup_index = DuplicateIndex(
+                os.path.join(get_data_dir(), 'dedup.sqlite'),
+                settings_key=f"{self.engine_type}:{self.language}:{self.preprocess}:{self.adaptive}:{self.profile.name}"
+            )
+        
+        blank_detector = BlankPageDetector() if self.skip_blank else None
+        
+        # Results are kept searchable after the window is cleared
+        try:
+            search_index = SearchIndex()
+        except RuntimeError as e:
+            self.error.emit(f"Search index unavailable: {str(e)}")
+            search_index = None
+        
+        pipeline = OCRPipeline(
+            self.ocr_engine, self.language, self.preprocess, self.profile.dpi,
+            dedup_index=dedup_index, blank_detector=blank_detector,
+            adaptive=self.adaptive, preprocess_options=self.profile.preprocess_options,
+            memory_governor=governor,
+            grayscale_pdf=self.engine_type in EngineRegistry.GRAYSCALE_ENGINES
+        )
+        
+        # Small documents first keeps the first results quick to appear
+        files = JobScheduler(self.schedule).order(self.files)
+        stats = ScheduleStats()
+        
+        # Page counts come from metadata, so progress is known up front
+        page_counts = {}
+        for file_path in files:
+            try:
+                page_counts[file_path] = FileHandler.count_pages(file_path)
+            except Exception:
+                page_counts[file_path] = 1
+        total = sum(page_counts.values())
+        meter = ThroughputMeter()
+        self.progress.emit(0, total, 0.0, -1.0)
+        
+        for file_path in files:
+            done_before = meter.done
+            try:
+                # Pages are decoded lazily and each one is shown as soon as it is recognized
+                for page_result in pipeline.process_file(file_path):
+                    self.page_result.emit(
+                        os.path.basename(file_path), page_result.page_index + 1,
+                        page_result.page_count, page_result.text
+                    )
+                    meter.update()
+                    self._emit_progress(meter, total)
+                    if search_index is not None:
+                        search_index.add_result(page_result)
                 
-                self.progress.emit(idx + 1, len(self.files))
-            
-            self.finished.emit()
+            except Exception as e:
+                self.error.emit(f"Error processing {os.path.basename(file_path)}: {str(e)}")
             
-        except Exception as e:
-            self.error.emit(f"OCR processing failed: {str(e)}")
-            self.finished.emit()
+            # Count pages that were not processed because of an error as done
+            skipped = page_counts[file_path] - (meter.done - done_before)
+            if skipped > 0:
+                meter.done += skipped
+                self._emit_progress(meter, total)
+            stats.file_done(file_path)
+        
+        if search_index is not None:
+            search_index.close()
+        if dedup_index is not None:
+            self.dedup_report = dedup_index.report()
+            dedup_index.close()
+        self.schedule_report = stats.report()
+        self.memory_report = f"memory {governor.report()}"
+        if self.supervised is not None:
+            self.worker_report = f"workers {self.supervised.report()}"
+        if blank_detector is not None:
+            self.blank_report = blank_detector.report(pipeline.average_page_seconds())
+
+
+class ThumbnailWorker(QThread):
+    """Worker thread that generates file list previews off the UI thread."""
+    
+    thumbnail_ready = pyqtSignal(str, str)  # file path, thumbnail path
+    
+    def __init__(self, files: List[str], cache: ThumbnailCache):
+        super().__init__()
+        self.files = files
+        self.cache = cache
+    
+    def run(self):
+        """Generate (or look up) a cached thumbnail for each file."""
+        for file_path in self.files:
+            try:
+                self.thumbnail_ready.emit(file_path, self.cache.get_thumbnail(file_path))
+            except Exception:
+                # A missing preview is not worth interrupting the user
+                continue
 
 
 class MainWindow(QMainWindow):
     """Main window for OCR application."""
     
-    def __init__(self):
+    # Emitted from the warm-up thread, delivered on the UI thread
+    engine_warmed = pyqtSignal(str, str)  # engine type, error message ('' if ready)
+    
+    def __init__(self, warmup_engines: Optional[List[str]] = None):
         super().__init__()
         self.current_files = []
         self.extracted_text = ""
         self.ocr_worker = None
+        self.warmup_thread = None
+        self.engine_status = {}
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnail_workers = []
+        # Supervised engine workers by engine type, kept alive between runs
+        self.supervised_engines = {}
         
         self.init_ui()
         self.check_tesseract()
+        
+        self.engine_warmed.connect(self.on_engine_warmed)
+        if warmup_engines:
+            self.start_warmup(warmup_engines)
     
     def init_ui(self):
         """Initialize the user interface."""
@@ -139,7 +254,10 @@ class MainWindow(QMainWindow):
         # OCR Engine selection
         engine_label = QLabel("OCR Engine:")
         self.engine_combo = QComboBox()
-        self.engine_combo.addItems(['Tesseract (Fast)', 'EasyOCR (Invoices)', 'PaddleOCR (Advanced)'])
+        self.engine_combo.addItems([
+            'Tesseract (Fast)', 'EasyOCR (Invoices)', 'PaddleOCR (Advanced)',
+            'Cascade: Tesseract + EasyOCR', 'Cascade: Tesseract + PaddleOCR'
+        ])
         controls_layout.addWidget(engine_label)
         controls_layout.addWidget(self.engine_combo)
         
@@ -150,11 +268,64 @@ class MainWindow(QMainWindow):
         controls_layout.addWidget(lang_label)
         controls_layout.addWidget(self.language_combo)
         
+        # Speed profile selection
+        speed_label = QLabel("Speed:")
+        self.speed_combo = QComboBox()
+        self.speed_combo.addItems([name.capitalize() for name in PROFILES])
+        self.speed_combo.setCurrentIndex(list(PROFILES).index(DEFAULT_PROFILE))
+        self.speed_combo.setToolTip("Fast: lower DPI and fast models, Accurate: higher DPI and best models")
+        controls_layout.addWidget(speed_label)
+        controls_layout.addWidget(self.speed_combo)
+        
         # Preprocessing checkbox
         self.preprocess_checkbox = QCheckBox("Enable Preprocessing")
         self.preprocess_checkbox.setChecked(True)
         controls_layout.addWidget(self.preprocess_checkbox)
         
+        # Adaptive preprocessing checkbox
+        self.adaptive_checkbox = QCheckBox("Adaptive")
+        self.adaptive_checkbox.setChecked(True)
+        self.adaptive_checkbox.setToolTip("Analyze each page and skip preprocessing stages it does not need")
+        self.preprocess_checkbox.toggled.connect(self.adaptive_checkbox.setEnabled)
+        controls_layout.addWidget(self.adaptive_checkbox)
+        
+        # Duplicate page detection checkbox
+        self.dedup_checkbox = QCheckBox("Skip Duplicate Pages")
+        self.dedup_checkbox.setToolTip("Reuse results for near-identical pages instead of running OCR again")
+        controls_layout.addWidget(self.dedup_checkbox)
+        
+        # Blank page detection checkbox
+        self.blank_checkbox = QCheckBox("Skip Blank Pages")
+        self.blank_checkbox.setToolTip("Detect empty pages (e.g. duplex backs) and skip OCR for them")
+        controls_layout.addWidget(self.blank_checkbox)
+        
+        # File order selection
+        order_label = QLabel("Order:")
+        self.schedule_combo = QComboBox()
+        self.schedule_combo.addItems(['Smallest First', 'As Listed', 'Largest First'])
+        self.schedule_combo.setToolTip(
+            "Smallest First shows results for small documents quickly, "
+            "Largest First finishes the whole batch soonest"
+        )
+        controls_layout.addWidget(order_label)
+        controls_layout.addWidget(self.schedule_combo)
+        
+        # Debug: profile the next run
+        self.profile_checkbox = QCheckBox("Profile Run")
+        self.profile_checkbox.setToolTip(
+            "Debug: record where the run spends its time and write flame graph files "
+            "(speedscope, collapsed stacks) to the profiles folder"
+        )
+        controls_layout.addWidget(self.profile_checkbox)
+        
+        # Crash isolation: run the engine in a separate, restartable process
+        self.isolate_checkbox = QCheckBox("Isolate Engine")
+        self.isolate_checkbox.setToolTip(
+            "Run the OCR engine in a separate process that is restarted if it crashes "
+            "or hangs on a page; the page is skipped and the batch continues"
+        )
+        controls_layout.addWidget(self.isolate_checkbox)
+        
         controls_layout.addStretch()
         
         # Buttons
@@ -167,6 +338,11 @@ class MainWindow(QMainWindow):
         self.process_btn.setEnabled(False)
         controls_layout.addWidget(self.process_btn)
         
+        self.search_btn = QPushButton("Search")
+        self.search_btn.setToolTip("Search the text of all previously processed documents")
+        self.search_btn.clicked.connect(self.open_search)
+        controls_layout.addWidget(self.search_btn)
+        
         self.clear_btn = QPushButton("Clear All")
         self.clear_btn.clicked.connect(self.clear_all)
         controls_layout.addWidget(self.clear_btn)
@@ -188,6 +364,7 @@ class MainWindow(QMainWindow):
         self.file_list = QListWidget()
         self.file_list.setAcceptDrops(True)
         self.file_list.setDragEnabled(True)
+        self.file_list.setIconSize(QSize(64, 64))
         file_layout.addWidget(self.file_list)
         
         file_btn_layout = QHBoxLayout()
@@ -232,6 +409,8 @@ class MainWindow(QMainWindow):
         
         # Status bar
         self.statusBar().showMessage("Ready")
+        self.engine_status_label = QLabel()
+        self.statusBar().addPermanentWidget(self.engine_status_label)
         
         # Enable drag and drop
         self.setAcceptDrops(True)
@@ -261,6 +440,34 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.show_warning("OCR Engine Error", f"Error initializing OCR engine: {str(e)}")
     
+    def start_warmup(self, engine_types: List[str]):
+        """Preload engines in the background and show their readiness."""
+        for engine_type in engine_types:
+            self.engine_status[engine_type] = "warming up..."
+        self.update_engine_status()
+        
+        self.warmup_thread = EngineRegistry.start_warmup(
+            engine_types, self.language_combo.currentText(),
+            callback=lambda engine_type, error: self.engine_warmed.emit(engine_type, error or '')
+        )
+    
+    def on_engine_warmed(self, engine_type: str, message: str):
+        """Mark an engine as ready or failed to warm up."""
+        if message:
+            self.engine_status[engine_type] = "failed"
+            self.engine_status_label.setToolTip(message)
+        else:
+            self.engine_status[engine_type] = "ready"
+        self.update_engine_status()
+    
+    def update_engine_status(self):
+        """Refresh the engine readiness label in the status bar."""
+        parts = [
+            f"{EngineRegistry.DISPLAY_NAMES.get(engine_type, engine_type)}: {status}"
+            for engine_type, status in self.engine_status.items()
+        ]
+        self.engine_status_label.setText(" | ".join(parts))
+    
     def dragEnterEvent(self, event: QDragEnterEvent):
         """Handle drag enter event."""
         if event.mimeData().hasUrls():
@@ -287,10 +494,17 @@ class MainWindow(QMainWindow):
         """Add files to the list."""
         valid_files, invalid_files = FileHandler.validate_files(files)
         
+        new_files = []
         for file_path in valid_files:
             if file_path not in self.current_files:
                 self.current_files.append(file_path)
-                self.file_list.addItem(os.path.basename(file_path))
+                item = QListWidgetItem(os.path.basename(file_path))
+                item.setData(Qt.UserRole, file_path)
+                self.file_list.addItem(item)
+                new_files.append(file_path)
+        
+        if new_files:
+            self.load_thumbnails(new_files)
         
         if invalid_files:
             self.show_warning(
@@ -301,6 +515,22 @@ class MainWindow(QMainWindow):
         self.process_btn.setEnabled(len(self.current_files) > 0)
         self.statusBar().showMessage(f"{len(self.current_files)} file(s) selected")
     
+    def load_thumbnails(self, files: List[str]):
+        """Generate previews for files in the background."""
+        worker = ThumbnailWorker(files, self.thumbnail_cache)
+        worker.thumbnail_ready.connect(self.set_thumbnail)
+        worker.finished.connect(lambda: self.thumbnail_workers.remove(worker))
+        self.thumbnail_workers.append(worker)
+        worker.start()
+    
+    def set_thumbnail(self, file_path: str, thumbnail_path: str):
+        """Show a generated preview next to its file in the list."""
+        for row in range(self.file_list.count()):
+            item = self.file_list.item(row)
+            if item.data(Qt.UserRole) == file_path:
+                item.setIcon(QIcon(QPixmap(thumbnail_path)))
+                break
+    
     def remove_selected_files(self):
         """Remove selected files from the list."""
         selected_items = self.file_list.selectedItems()
@@ -322,7 +552,9 @@ class MainWindow(QMainWindow):
         language = self.language_combo.currentText()
         preprocess = self.preprocess_checkbox.isChecked()
         engine_text = self.engine_combo.currentText()
-        if 'EasyOCR' in engine_text:
+        if engine_text.startswith('Cascade'):
+            engine_type = 'cascade-easyocr' if 'EasyOCR' in engine_text else 'cascade-paddleocr'
+        elif 'EasyOCR' in engine_text:
             engine_type = 'easyocr'
         elif 'PaddleOCR' in engine_text:
             engine_type = 'paddleocr'
@@ -333,50 +565,102 @@ class MainWindow(QMainWindow):
         self.process_btn.setEnabled(False)
         self.select_btn.setEnabled(False)
         
-        # Show progress bar
+        # Show progress bar, busy until the page count is known
         self.progress_bar.setVisible(True)
-        self.progress_bar.setMaximum(len(self.current_files))
+        self.progress_bar.setMaximum(0)
         self.progress_bar.setValue(0)
         
         # Clear previous output
         self.output_text.clear()
         self.extracted_text = ""
         
+        supervised = None
+        if self.isolate_checkbox.isChecked():
+            supervised = self.supervised_engines.get(engine_type)
+            if supervised is None:
+                supervised = SupervisedEngine(engine_type, EngineRegistry.backend)
+                self.supervised_engines[engine_type] = supervised
+        
         # Create and start worker thread
-        self.ocr_worker = OCRWorker(self.current_files, language, preprocess, engine_type)
+        self.ocr_worker = OCRWorker(
+            self.current_files, language, preprocess, engine_type,
+            dedup=self.dedup_checkbox.isChecked(),
+            skip_blank=self.blank_checkbox.isChecked(),
+            schedule=('sjf', 'fifo', 'lpt')[self.schedule_combo.currentIndex()],
+            adaptive=self.adaptive_checkbox.isChecked(),
+            speed=self.speed_combo.currentText().lower(),
+            profiling=self.profile_checkbox.isChecked(),
+            supervised=supervised
+        )
         self.ocr_worker.progress.connect(self.update_progress)
-        self.ocr_worker.result.connect(self.append_result)
+        self.ocr_worker.page_result.connect(self.append_page)
         self.ocr_worker.error.connect(self.show_error)
         self.ocr_worker.finished.connect(self.ocr_finished)
         self.ocr_worker.start()
         
         self.statusBar().showMessage("Processing OCR...")
     
-    def update_progress(self, current: int, total: int):
-        """Update progress bar."""
+    def update_progress(self, current: int, total: int, rate: float, eta: float):
+        """Update progress bar and status bar with page progress and ETA."""
+        eta_text = ThroughputMeter.format_eta(eta if eta >= 0 else None)
+        self.progress_bar.setMaximum(total)
         self.progress_bar.setValue(current)
-        self.statusBar().showMessage(f"Processing {current}/{total} files...")
+        self.progress_bar.setFormat(f"%p% - page {current}/{total} - ETA {eta_text}")
+        self.statusBar().showMessage(
+            f"Processing page {current}/{total} ({rate:.1f} pages/s, ETA {eta_text})..."
+        )
     
-    def append_result(self, text: str, filename: str):
-        """Append OCR result to output."""
-        if self.extracted_text:
-            self.extracted_text += f"\n\n{'='*50}\n{filename}\n{'='*50}\n\n"
+    def append_page(self, filename: str, page_number: int, page_count: int, text: str):
+        """Append a recognized page to the output while the document is still running."""
+        if page_number == 1:
+            header = f"{'='*50}\n{filename}\n{'='*50}\n\n"
+            chunk = f"\n\n{header}" if self.extracted_text else header
         else:
-            self.extracted_text = f"{'='*50}\n{filename}\n{'='*50}\n\n"
-        
-        self.extracted_text += text
-        self.output_text.setPlainText(self.extracted_text)
+            chunk = "\n\n"
+        if page_count > 1:
+            chunk += f"--- Page {page_number} ---\n"
+        chunk += text
+        
+        self.extracted_text += chunk
+        # Append instead of resetting the whole text, which gets slow for long documents
+        cursor = self.output_text.textCursor()
+        cursor.movePosition(cursor.End)
+        cursor.insertText(chunk)
     
     def ocr_finished(self):
         """Handle OCR completion."""
         self.progress_bar.setVisible(False)
         self.process_btn.setEnabled(True)
         self.select_btn.setEnabled(True)
-        self.statusBar().showMessage("OCR processing completed")
+        reports = []
+        if self.ocr_worker is not None:
+            reports = [
+                r for r in (
+                    self.ocr_worker.schedule_report, self.ocr_worker.dedup_report,
+                    self.ocr_worker.blank_report, self.ocr_worker.memory_report, self.ocr_worker.worker_report,
+                    self.ocr_worker.profile_report
+                ) if r
+            ]
+        if reports:
+            self.statusBar().showMessage(f"OCR processing completed ({'; '.join(reports)})")
+        else:
+            self.statusBar().showMessage("OCR processing completed")
         
         if self.extracted_text:
             QMessageBox.information(self, "Success", "OCR processing completed successfully!")
     
+    def open_search(self):
+        """Open the search dialog over previously processed documents."""
+        try:
+            search_index = SearchIndex()
+        except RuntimeError as e:
+            self.show_error(str(e))
+            return
+        try:
+            SearchDialog(search_index, self).exec_()
+        finally:
+            search_index.close()
+    
     def copy_to_clipboard(self):
         """Copy extracted text to clipboard."""
         if not self.extracted_text:
@@ -432,3 +716,9 @@ class MainWindow(QMainWindow):
     def show_error(self, message: str):
         """Show error message."""
         QMessageBox.critical(self, "Error", message)
+    
+    def closeEvent(self, event):
+        """Stop supervised engine workers when the window closes."""
+        for supervised in self.supervised_engines.values():
+            supervised.close()
+        super().closeEvent(event)
@@ -0,0 +1,85 @@
+"""Search dialog over previously processed documents."""
+
+import os
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QTextEdit, QLabel, QSplitter
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+
+from src.utils.search_index import SearchIndex
+
+
+class SearchDialog(QDialog):
+    """Dialog for finding pages in the full-text search index."""
+    
+    # Search as you type, once typing pauses for this many milliseconds
+    SEARCH_DELAY_MS = 200
+    
+    def __init__(self, search_index: SearchIndex, parent=None):
+        """
+        Initialize search dialog.
+        
+        Args:
+            search_index: Index to search, used from the GUI thread only
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.search_index = search_index
+        self.setWindowTitle("Search Processed Documents")
+        self.resize(900, 600)
+        
+        layout = QVBoxLayout()
+        
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Invoice number, name, words in Arabic or French...")
+        layout.addWidget(self.query_edit)
+        
+        self.status_label = QLabel(f"{search_index.page_total()} page(s) indexed")
+        layout.addWidget(self.status_label)
+        
+        splitter = QSplitter(Qt.Vertical)
+        self.results_list = QListWidget()
+        splitter.addWidget(self.results_list)
+        
+        self.page_text = QTextEdit()
+        self.page_text.setReadOnly(True)
+        self.page_text.setFont(QFont("Arial", 10))
+        splitter.addWidget(self.page_text)
+        splitter.setSizes([250, 350])
+        layout.addWidget(splitter)
+        
+        self.setLayout(layout)
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.run_search)
+        self.query_edit.textChanged.connect(self.search_timer.start)
+        self.query_edit.returnPressed.connect(self.run_search)
+        self.results_list.currentItemChanged.connect(self.show_page)
+    
+    def run_search(self):
+        """Search for the current query and list the matching pages."""
+        self.search_timer.stop()
+        self.results_list.clear()
+        self.page_text.clear()
+        query = self.query_edit.text().strip()
+        if not query:
+            return
+        
+        hits = self.search_index.search(query, prefix=True)
+        for hit in hits:
+            page = f" - page {hit.page_index + 1}/{hit.page_count}" if hit.page_count > 1 else ""
+            item = QListWidgetItem(f"{os.path.basename(hit.path)}{page}: {hit.snippet}")
+            item.setToolTip(hit.path)
+            item.setData(Qt.UserRole, (hit.file_hash, hit.page_index))
+            self.results_list.addItem(item)
+        self.status_label.setText(f"{len(hits)} match(es)" if hits else "No matches")
+    
+    def show_page(self, item: QListWidgetItem, previous: QListWidgetItem = None):
+        """Show the full text of the selected page."""
+        if item is None:
+            return
+        file_hash, page_index = item.data(Qt.UserRole)
+        self.page_text.setPlainText(self.search_index.page_text(file_hash, page_index) or "")
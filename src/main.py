@@ -2,6 +2,8 @@
 
 import sys
 import os
+import argparse
+import multiprocessing
 from pathlib import Path
 
 # Fix for Windows PyTorch DLL issues
@@ -21,18 +23,35 @@ sys.path.insert(0, str(project_root))
 
 from PyQt5.QtWidgets import QApplication
 from src.gui.main_window import MainWindow
+from src.ocr.registry import EngineRegistry
+
+
+def parse_args(argv):
+    """Parse application options, leaving Qt options untouched."""
+    parser = argparse.ArgumentParser(description="Arabic-French OCR Tool")
+    parser.add_argument(
+        '--warmup',
+        default=os.environ.get('OCR_WARMUP', ''),
+        help="Comma-separated engines to preload at start (tesseract, easyocr, paddleocr or all)"
+    )
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
 
 
 def main():
     """Run the OCR application."""
+    args = parse_args(sys.argv)
+    
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # Modern look
     
-    window = MainWindow()
+    window = MainWindow(warmup_engines=EngineRegistry.parse_engine_list(args.warmup))
     window.show()
     
     sys.exit(app.exec_())
 
 
 if __name__ == '__main__':
+    # Supervised engine workers re-launch the executable in PyInstaller builds
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,123 @@
+"""Fast detection of blank and near-blank pages."""
+
+import time
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+from src.utils.page import ImageLike, as_array
+
+
+class BlankPageDetector:
+    """
+    Classifies blank pages (e.g. duplex backs) before any preprocessing.
+    
+    The page is reduced to a small grayscale thumbnail, scanner borders
+    are cropped away, and the page counts as blank when almost no pixels
+    are clearly darker than the paper background and its gray level
+    barely varies. Ink coverage decides: a single short line of text has
+    a low standard deviation on an otherwise white page, so the
+    deviation only confirms a low-ink result and never marks a page with
+    ink as blank. The check takes milliseconds, against seconds for the
+    preprocessing and OCR run it saves.
+    """
+    
+    BLANK_MARKER = '[Blank page]'
+    
+    def __init__(
+        self,
+        ink_threshold: float = 0.0005,
+        std_threshold: float = 4.0,
+        sample_width: int = 256,
+        ink_contrast: int = 40,
+        margin: float = 0.05
+    ):
+        """
+        Initialize detector.
+        
+        Args:
+            ink_threshold: Maximum share of ink pixels on a blank page
+            std_threshold: Maximum gray level standard deviation on a
+                blank page, checked in addition to the ink share
+            sample_width: Width of the thumbnail that is analyzed
+            ink_contrast: How much darker than the background a pixel
+                must be to count as ink (0-255)
+            margin: Share of each edge ignored to skip scanner borders
+        """
+        self.ink_threshold = ink_threshold
+        self.std_threshold = std_threshold
+        self.sample_width = sample_width
+        self.ink_contrast = ink_contrast
+        self.margin = margin
+        
+        self.pages_checked = 0
+        self.blank_pages = 0
+        self.check_seconds = 0.0
+    
+    def measure(self, image: ImageLike) -> Tuple[float, float]:
+        """
+        Measure ink coverage and gray level variation of a page.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+        
+        Returns:
+            Tuple of (ink ratio, gray level standard deviation)
+        """
+        array = as_array(image)
+        # Strided view first so the resize touches only a fraction of the pixels
+        step = max(1, array.shape[1] // (self.sample_width * 4))
+        array = array[::step, ::step]
+        height, width = array.shape[:2]
+        sample_height = max(1, int(height * self.sample_width / max(width, 1)))
+        small = cv2.resize(array, (self.sample_width, sample_height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+        
+        dy = int(sample_height * self.margin)
+        dx = int(self.sample_width * self.margin)
+        small = small[dy:sample_height - dy, dx:self.sample_width - dx]
+        if small.size == 0:
+            return 0.0, 0.0
+        
+        background = float(np.median(small))
+        ink = np.count_nonzero(small < background - self.ink_contrast)
+        return float(ink) / small.size, float(small.std())
+    
+    def is_blank(self, image: ImageLike) -> bool:
+        """
+        Check whether a page is blank, updating the counters.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+        
+        Returns:
+            True if the page is blank or near-blank
+        """
+        start = time.perf_counter()
+        ink_ratio, std = self.measure(image)
+        blank = ink_ratio < self.ink_threshold and std < self.std_threshold
+        
+        self.check_seconds += time.perf_counter() - start
+        self.pages_checked += 1
+        if blank:
+            self.blank_pages += 1
+        return blank
+    
+    def report(self, average_page_seconds: float = 0.0) -> str:
+        """
+        Summarize blank page detection for the run.
+        
+        Args:
+            average_page_seconds: Average time to recognize a non-blank
+                page, used to estimate the time saved
+        
+        Returns:
+            Human-readable summary
+        """
+        saved = self.blank_pages * average_page_seconds - self.check_seconds
+        return (
+            f"{self.blank_pages} of {self.pages_checked} page(s) blank, "
+            f"about {max(saved, 0.0):.1f}s saved"
+        )
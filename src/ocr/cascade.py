@@ -0,0 +1,177 @@
+"""Confidence-driven cascade from a fast engine to a neural one."""
+
+import threading
+from typing import List
+
+import numpy as np
+
+from .layout import reading_order
+from .preprocessor import ImagePreprocessor
+from .results import OCRWord, group_lines, words_to_text
+from src.utils.page import ImageLike, as_array
+
+
+class CascadeEngine:
+    """
+    Runs a fast engine on the whole page and a slower one on weak lines.
+    
+    The primary engine (Tesseract) recognizes the page first. Lines whose
+    mean word confidence falls below the threshold are cropped and
+    recognized again by the fallback engine (EasyOCR or PaddleOCR), and
+    the fallback words replace the line when they are more confident.
+    Since typically only a few lines per page are re-run, throughput stays
+    close to the primary engine.
+    """
+    
+    DEFAULT_THRESHOLD = 0.6
+    
+    def __init__(self, primary, fallback, threshold: float = DEFAULT_THRESHOLD, padding: float = 0.25):
+        """
+        Initialize cascade.
+        
+        Args:
+            primary: Fast engine providing extract_words() with confidences
+            fallback: Engine used to re-recognize low-confidence lines
+            threshold: Lines with a mean confidence below this are re-run
+            padding: Margin added around a line crop, relative to line height
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.threshold = threshold
+        self.padding = padding
+        self.PARALLEL_SAFE = (
+            getattr(primary, 'PARALLEL_SAFE', False) and getattr(fallback, 'PARALLEL_SAFE', False)
+        )
+        
+        self.lines_total = 0
+        self.lines_rerun = 0
+        self.lines_replaced = 0
+        self._stats_lock = threading.Lock()
+    
+    @staticmethod
+    def mean_confidence(words: List[OCRWord]) -> float:
+        """Average confidence of a list of words (0 if empty)."""
+        if not words:
+            return 0.0
+        return sum(word.confidence for word in words) / len(words)
+    
+    def _line_crop(self, array: np.ndarray, line: List[OCRWord]):
+        """Get the padded crop around a line and its offset in the page."""
+        x0 = min(word.bbox[0] for word in line)
+        y0 = min(word.bbox[1] for word in line)
+        x1 = max(word.bbox[2] for word in line)
+        y1 = max(word.bbox[3] for word in line)
+        pad = (y1 - y0) * self.padding
+        
+        height, width = array.shape[:2]
+        left = max(0, int(x0 - pad))
+        top = max(0, int(y0 - pad))
+        right = min(width, int(x1 + pad) + 1)
+        bottom = min(height, int(y1 + pad) + 1)
+        return np.ascontiguousarray(array[top:bottom, left:right]), left, top
+    
+    def _rerun_line(self, array: np.ndarray, line: List[OCRWord], language: str) -> List[OCRWord]:
+        """Re-recognize one line with the fallback engine, keeping the better result."""
+        crop, left, top = self._line_crop(array, line)
+        if crop.size == 0:
+            return line
+        
+        candidates = self.fallback.extract_words(crop, language, preprocess=False)
+        if not candidates or self.mean_confidence(candidates) <= self.mean_confidence(line):
+            return line
+        
+        # The words take over the primary line key so paragraph grouping
+        # stays intact, which also fixes their order: put them in reading
+        # order (right to left for Arabic) first
+        boxes = np.array([word.bbox for word in candidates], dtype=np.float64)
+        order = [i for indices in reading_order(boxes, [word.text for word in candidates]) for i in indices]
+        line_key = line[0].line_key
+        replaced = []
+        for i in order:
+            moved = candidates[i].translate(left, top)
+            replaced.append(OCRWord(moved.text, moved.confidence, moved.bbox, line_key=line_key))
+        with self._stats_lock:
+            self.lines_replaced += 1
+        return replaced
+    
+    def extract_words(
+        self,
+        image: ImageLike,
+        language: str = 'Both',
+        preprocess: bool = True,
+        **preprocess_kwargs
+    ) -> List[OCRWord]:
+        """
+        Extract words, re-recognizing low-confidence lines.
+        
+        The primary engine works on the preprocessed page, the fallback
+        engine on crops of the original pixels, which it preprocesses
+        itself. Skew is corrected on the original page before the other
+        stages, so both share its geometry and crop coordinates match the
+        primary word boxes.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess the image
+            **preprocess_kwargs: Additional preprocessing options
+        
+        Returns:
+            List of OCRWord objects
+        """
+        original = array = as_array(image)
+        if preprocess:
+            if preprocess_kwargs.get('deskew', True):
+                skew = ImagePreprocessor.analyze_quality(original).skew
+                if abs(skew) >= ImagePreprocessor.SKEW_THRESHOLD:
+                    original = ImagePreprocessor.deskew(original, skew)
+            array = ImagePreprocessor.preprocess_image(original, **dict(preprocess_kwargs, deskew=False))
+        
+        words = self.primary.extract_words(array, language, preprocess=False)
+        lines = group_lines(words)
+        
+        result = []
+        rerun = 0
+        for line in lines:
+            if self.mean_confidence(line) < self.threshold:
+                rerun += 1
+                line = self._rerun_line(original, line, language)
+            result.extend(line)
+        
+        with self._stats_lock:
+            self.lines_total += len(lines)
+            self.lines_rerun += rerun
+        return result
+    
+    def extract_text(
+        self,
+        image: ImageLike,
+        language: str = 'Both',
+        preprocess: bool = True,
+        **preprocess_kwargs
+    ) -> str:
+        """
+        Extract text, re-recognizing low-confidence lines.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess the image
+            **preprocess_kwargs: Additional preprocessing options
+        
+        Returns:
+            Extracted text as string
+        """
+        return words_to_text(self.extract_words(image, language, preprocess, **preprocess_kwargs))
+    
+    def report(self) -> str:
+        """
+        Summarize how much of the work went to the fallback engine.
+        
+        Returns:
+            Human-readable summary
+        """
+        return (
+            f"{self.lines_rerun} of {self.lines_total} line(s) re-run, "
+            f"{self.lines_replaced} replaced"
+        )
@@ -0,0 +1,280 @@
+"""Duplicate-page index that lets repeated pages reuse earlier OCR results."""
+
+import base64
+import json
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .results import OCRWord, PageResult
+from src.utils.phash import HASH_SIZE, VERIFY_SIZE, hamming_distance, thumbnail_difference
+
+
+class DuplicateIndex:
+    """
+    Index of page fingerprints mapped to their OCR results.
+    
+    Lookups find a previously recognized page whose perceptual hash is
+    within a small Hamming distance. Hashes are split into bands and
+    indexed per band: by the pigeonhole principle two hashes within
+    distance d < BANDS share at least one identical band, so candidates
+    are found without scanning the whole index.
+    
+    A hash match alone is not enough: pages filled in from one template
+    (invoices, forms) hash alike even when their numbers differ. Every
+    candidate is confirmed by comparing verification thumbnails pixel by
+    pixel and by page shape, and only near-exact matches are reused.
+    
+    Results are kept in memory for the current batch and, when a database
+    path is given, persisted in SQLite so later batches reuse them too.
+    Entries are scoped by a settings key (engine, language, preprocessing)
+    so results are only reused under the same OCR settings.
+    """
+    
+    BANDS = 8
+    HASH_BITS = HASH_SIZE * HASH_SIZE
+    
+    # Largest thumbnail gray level difference of a duplicate: rescans and
+    # recompressed copies stay around 10, a changed digit exceeds 20
+    MAX_DIFFERENCE = 16
+    
+    # Largest relative difference in aspect ratio of a duplicate
+    MAX_ASPECT_CHANGE = 0.01
+    
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_distance: int = 4,
+        settings_key: str = '',
+        max_difference: int = MAX_DIFFERENCE
+    ):
+        """
+        Initialize duplicate index.
+        
+        Args:
+            db_path: SQLite database for the persistent index (None for in-batch only)
+            max_distance: Maximum Hamming distance between candidate pages
+            settings_key: Identifier of the OCR settings results are valid for
+            max_difference: Maximum verification thumbnail difference of
+                duplicate pages
+        
+        Raises:
+            ValueError: If max_distance is too large for the band layout
+        """
+        if max_distance >= self.BANDS:
+            raise ValueError(f"max_distance must be smaller than {self.BANDS}")
+        
+        self.max_distance = max_distance
+        self.settings_key = settings_key
+        self.max_difference = max_difference
+        self.band_bits = self.HASH_BITS // self.BANDS
+        
+        self._entries: List[Tuple[int, dict, np.ndarray]] = []
+        self._bands: Dict[Tuple[int, int], List[int]] = {}
+        self._lock = threading.Lock()
+        
+        self.lookups = 0
+        self.hits = 0
+        self.rejected = 0
+        
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.executescript('''
+                CREATE TABLE IF NOT EXISTS pages (
+                    id INTEGER PRIMARY KEY,
+                    settings TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS bands (
+                    settings TEXT NOT NULL,
+                    band INTEGER NOT NULL,
+                    value INTEGER NOT NULL,
+                    page_id INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS bands_lookup ON bands (settings, band, value);
+            ''')
+    
+    def _split(self, fingerprint: int) -> List[int]:
+        """Split a hash into band values."""
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (band * self.band_bits)) & mask for band in range(self.BANDS)]
+    
+    @staticmethod
+    def _serialize(result: PageResult) -> dict:
+        """Keep the parts of a result that can be reused for another page."""
+        data = result.to_dict()
+        return {
+            'source': result.source,
+            'page': result.page_index + 1,
+            'text': result.text,
+            'words': data.get('words', []),
+            'size': [result.width, result.height]
+        }
+    
+    @staticmethod
+    def _encode_thumbnail(thumbnail: np.ndarray) -> str:
+        """Compress a verification thumbnail for the persistent index."""
+        return base64.b64encode(zlib.compress(thumbnail.tobytes())).decode('ascii')
+    
+    @staticmethod
+    def _decode_thumbnail(encoded: Optional[str]) -> Optional[np.ndarray]:
+        """Restore a verification thumbnail (None for entries stored without one)."""
+        if not encoded:
+            return None
+        pixels = np.frombuffer(zlib.decompress(base64.b64decode(encoded)), dtype=np.uint8)
+        if pixels.size != VERIFY_SIZE * VERIFY_SIZE:
+            return None
+        return pixels.reshape(VERIFY_SIZE, VERIFY_SIZE)
+    
+    def _confirm(self, data: dict, stored_thumbnail: Optional[np.ndarray], thumbnail: np.ndarray, size: Tuple[int, int]) -> bool:
+        """Check a hash candidate against the page's thumbnail and shape."""
+        stored_size = data.get('size')
+        if stored_thumbnail is None or not stored_size or not all(stored_size) or not all(size):
+            return False
+        stored_aspect = stored_size[0] / stored_size[1]
+        if abs(size[0] / size[1] - stored_aspect) > self.MAX_ASPECT_CHANGE * stored_aspect:
+            return False
+        return thumbnail_difference(stored_thumbnail, thumbnail) <= self.max_difference
+    
+    def _lookup_memory(self, fingerprint: int, bands: List[int], thumbnail: np.ndarray, size: Tuple[int, int]) -> Optional[dict]:
+        """Find a duplicate among pages of the current batch."""
+        checked = set()
+        for band, value in enumerate(bands):
+            for entry_id in self._bands.get((band, value), []):
+                if entry_id in checked:
+                    continue
+                checked.add(entry_id)
+                stored, data, stored_thumbnail = self._entries[entry_id]
+                if hamming_distance(stored, fingerprint) > self.max_distance:
+                    continue
+                if self._confirm(data, stored_thumbnail, thumbnail, size):
+                    return data
+                self.rejected += 1
+        return None
+    
+    def _lookup_db(self, fingerprint: int, bands: List[int], thumbnail: np.ndarray, size: Tuple[int, int]) -> Optional[dict]:
+        """Find a duplicate in the persistent index."""
+        checked = set()
+        for band, value in enumerate(bands):
+            rows = self._db.execute(
+                'SELECT p.id, p.hash, p.data FROM bands b JOIN pages p ON p.id = b.page_id '
+                'WHERE b.settings = ? AND b.band = ? AND b.value = ?',
+                (self.settings_key, band, value)
+            ).fetchall()
+            for page_id, stored, data in rows:
+                if page_id in checked:
+                    continue
+                checked.add(page_id)
+                if hamming_distance(int(stored, 16), fingerprint) > self.max_distance:
+                    continue
+                data = json.loads(data)
+                stored_thumbnail = self._decode_thumbnail(data.pop('thumbnail', None))
+                if self._confirm(data, stored_thumbnail, thumbnail, size):
+                    return data
+                self.rejected += 1
+        return None
+    
+    def lookup(self, fingerprint: int, thumbnail: np.ndarray, size: Tuple[int, int]) -> Optional[dict]:
+        """
+        Find the stored result of a near-identical page.
+        
+        Args:
+            fingerprint: Perceptual hash of the page
+            thumbnail: Verification thumbnail of the page (see
+                src.utils.phash.verification_thumbnail)
+            size: Page size as (width, height)
+        
+        Returns:
+            Dictionary with 'source', 'page', 'text', 'words' and 'size', or None
+        """
+        bands = self._split(fingerprint)
+        with self._lock:
+            self.lookups += 1
+            data = self._lookup_memory(fingerprint, bands, thumbnail, size)
+            if data is None and self._db is not None:
+                data = self._lookup_db(fingerprint, bands, thumbnail, size)
+            if data is not None:
+                self.hits += 1
+            return data
+    
+    def add(self, fingerprint: int, result: PageResult, thumbnail: np.ndarray):
+        """
+        Store the result of a recognized page.
+        
+        Args:
+            fingerprint: Perceptual hash of the page
+            result: OCR result of the page
+            thumbnail: Verification thumbnail of the page
+        """
+        data = self._serialize(result)
+        bands = self._split(fingerprint)
+        with self._lock:
+            entry_id = len(self._entries)
+            self._entries.append((fingerprint, data, thumbnail))
+            for band, value in enumerate(bands):
+                self._bands.setdefault((band, value), []).append(entry_id)
+            
+            if self._db is not None:
+                cursor = self._db.execute(
+                    'INSERT INTO pages (settings, hash, data) VALUES (?, ?, ?)',
+                    (
+                        self.settings_key, format(fingerprint, 'x'),
+                        json.dumps(dict(data, thumbnail=self._encode_thumbnail(thumbnail)), ensure_ascii=False)
+                    )
+                )
+                self._db.executemany(
+                    'INSERT INTO bands (settings, band, value, page_id) VALUES (?, ?, ?, ?)',
+                    [(self.settings_key, band, value, cursor.lastrowid) for band, value in enumerate(bands)]
+                )
+                self._db.commit()
+    
+    @staticmethod
+    def apply(data: dict, result: PageResult) -> PageResult:
+        """
+        Fill a page result from a stored duplicate.
+        
+        Word boxes are scaled to the current page, so a duplicate scanned
+        at another resolution keeps its own coordinates.
+        
+        Args:
+            data: Stored entry returned by lookup()
+            result: Result of the current page (source, page index, size)
+        
+        Returns:
+            The updated result, marked with the page it duplicates
+        """
+        result.text = data['text']
+        scale_x = scale_y = 1.0
+        stored_size = data.get('size')
+        if stored_size and all(stored_size) and result.width and result.height:
+            scale_x = result.width / stored_size[0]
+            scale_y = result.height / stored_size[1]
+        result.words = [
+            OCRWord(text, conf, (x0 * scale_x, y0 * scale_y, x1 * scale_x, y1 * scale_y))
+            for text, conf, x0, y0, x1, y1 in data.get('words', [])
+        ]
+        result.duplicate_of = f"{data['source']}#{data['page']}"
+        return result
+    
+    def report(self) -> str:
+        """
+        Summarize deduplication for the run.
+        
+        Returns:
+            Human-readable summary
+        """
+        summary = f"{self.hits} of {self.lookups} page(s) reused from duplicates"
+        if self.rejected:
+            summary += f", {self.rejected} hash match(es) rejected by the pixel check"
+        return summary
+    
+    def close(self):
+        """Close the persistent index."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
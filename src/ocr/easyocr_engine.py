@@ -1,9 +1,12 @@
 """EasyOCR engine for text extraction."""
 
-from PIL import Image
+import gc
 import easyocr
-from typing import Optional
-import numpy as np
+from typing import List, Optional
+
+from .results import OCRWord, words_to_text
+from .model_manager import ModelManager
+from src.utils.page import ImageLike, as_array
 
 
 class EasyOCREngine:
@@ -20,40 +23,85 @@ class EasyOCREngine:
         'Both': ['ar', 'fr', 'en']  # Include English for currency and numbers
     }
     
-    def __init__(self):
-        """Initialize EasyOCR engine."""
+    NAME = 'easyocr'
+    
+    # Detections below this confidence are dropped (set per run by the speed profile)
+    MIN_CONFIDENCE = 0.3
+    
+    # Torch models are not safe to call from several threads at once
+    PARALLEL_SAFE = False
+    
+    def __init__(self, backend: str = 'native', memory_budget: Optional[int] = None):
+        """
+        Initialize EasyOCR engine.
+        
+        Args:
+            backend: 'native' (torch), 'onnx' or 'onnx-int8' (ONNX Runtime on CPU)
+            memory_budget: Bytes of model weights kept loaded, defaults to
+                OCR_MODEL_MEMORY_MB (1024 MB, 0 for unbounded)
+        """
         import os
+        from .onnx_backend import check_backend
+        check_backend(backend)
+        self.backend = backend
+        
         # Set environment for Windows compatibility
         os.environ.setdefault('KMP_DUPLICATE_LIB_OK', 'TRUE')
         os.environ.setdefault('OMP_NUM_THREADS', '1')
         
-        # Initialize readers for supported languages
+        # Readers for each language set are loaded on demand and the least
+        # recently used ones are unloaded when the memory budget is exceeded
         # First run downloads models (~200MB), subsequent runs use cache
-        self.readers = {}
+        if memory_budget is None:
+            memory_budget = ModelManager.budget_from_env()
+        self.models = ModelManager(memory_budget, on_evict=self._release_reader)
+        self._gpu_available = None
     
-    def get_reader(self, languages):
-        """Lazy load reader for specific languages."""
-        lang_key = frozenset(languages) if isinstance(languages, list) else languages
-        
-        if lang_key not in self.readers:
-            reader_langs = languages if isinstance(languages, list) else [languages]
-            # Auto-detect GPU availability
+    def gpu_available(self) -> bool:
+        """Check GPU availability once and cache the result."""
+        if self._gpu_available is None:
             try:
                 import torch
-                gpu_available = torch.cuda.is_available()
+                self._gpu_available = torch.cuda.is_available()
             except:
-                gpu_available = False
-            
-            self.readers[lang_key] = easyocr.Reader(
+                self._gpu_available = False
+        return self._gpu_available
+    
+    def _load_reader(self, reader_langs: List[str]):
+        """Build a reader for a list of language codes."""
+        if self.backend == 'native':
+            return easyocr.Reader(
                 reader_langs,
-                gpu=gpu_available  # Automatically use GPU if available
+                gpu=self.gpu_available()  # Automatically use GPU if available
             )
         
-        return self.readers[lang_key]
+        from .onnx_backend import apply_to_easyocr
+        # Float models on CPU, torch's own quantization does not export
+        reader = easyocr.Reader(reader_langs, gpu=False, quantize=False)
+        apply_to_easyocr(reader, quantize=self.backend == 'onnx-int8')
+        return reader
+    
+    def _release_reader(self, lang_key):
+        """Return GPU memory of an evicted reader to the driver."""
+        if self._gpu_available:
+            import torch
+            # Torch modules hold reference cycles, collect them so their
+            # tensors are freed before the cache is emptied
+            gc.collect()
+            torch.cuda.empty_cache()
+    
+    def get_reader(self, languages):
+        """Lazy load reader for specific languages."""
+        lang_key = frozenset(languages) if isinstance(languages, list) else languages
+        reader_langs = languages if isinstance(languages, list) else [languages]
+        
+        # The manager holds a lock, so a warm-up thread and a job never
+        # build the same reader twice
+        return self.models.get(lang_key, lambda: self._load_reader(reader_langs))
     
     def extract_text(
         self,
-        image: Image.Image,
+        image: ImageLike,
         language: str = 'Both',
         preprocess: bool = True,
         **kwargs
@@ -62,7 +110,7 @@ class EasyOCREngine:
         Extract text from image using EasyOCR.
         
         Args:
-            image: PIL Image object
+            image: Page, numpy array or PIL Image
             language: Language for OCR ('Arabic', 'French', or 'Both')
             preprocess: Whether to preprocess (not critical for EasyOCR)
             **kwargs: Additional options
@@ -70,6 +118,32 @@ class EasyOCREngine:
         Returns:
             Extracted text as string
             
+        Raises:
+            ValueError: If language is not supported
+        """
+        # Detections come back in no reliable order, rebuild lines and
+        # reading direction from the boxes
+        return words_to_text(self.extract_words(image, language, preprocess, **kwargs))
+    
+    def extract_words(
+        self,
+        image: ImageLike,
+        language: str = 'Both',
+        preprocess: bool = True,
+        **kwargs
+    ) -> List[OCRWord]:
+        """
+        Extract text fragments with bounding boxes and confidences.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess (not critical for EasyOCR)
+            **kwargs: Additional options
+            
+        Returns:
+            List of OCRWord objects
+            
         Raises:
             ValueError: If language is not supported
         """
@@ -77,43 +151,13 @@ class EasyOCREngine:
             raise ValueError(f"Unsupported language: {language}. Use 'Arabic', 'French', or 'Both'")
         
         try:
-            # Convert PIL Image to numpy array for EasyOCR
-            image_array = np.array(image)
-            
-            # Get the appropriate reader
-            languages = self.LANGUAGE_CODES[language]
-            reader = self.get_reader(languages)
-            
-            # Perform OCR
-            # detail=1 returns detailed information (bounding boxes, confidence)
-            result = reader.readtext(image_array, detail=1)
-            
-            # Extract text from results
-            # Result is list of (bbox, text, confidence)
-            text_lines = []
-            previous_y = None
-            
-            if result:
-                for detection in result:
-                    text = detection[1]
-                    confidence = detection[2]
-                    
-                    # Filter very low confidence detections
-                    if confidence > 0.3:  # EasyOCR threshold
-                        # Try to detect line breaks based on y-coordinate
-                        bbox = detection[0]
-                        current_y = bbox[0][1]  # y-coordinate of top-left
-                        
-                        # If y-coordinate changes significantly, add newline
-                        if previous_y is not None and abs(current_y - previous_y) > 15:
-                            if text_lines and not text_lines[-1].endswith('\n'):
-                                text_lines.append('\n')
-                        
-                        text_lines.append(text)
-                        previous_y = current_y
-            
-            combined_text = ''.join(text_lines)
-            return combined_text.strip()
-            
+            reader = self.get_reader(self.LANGUAGE_CODES[language])
+            result = reader.readtext(as_array(image), detail=1)
         except Exception as e:
             raise RuntimeError(f"EasyOCR failed: {str(e)}")
+        
+        return [
+            OCRWord.from_quad(text, confidence, bbox)
+            for bbox, text, confidence in result
+            if confidence > self.MIN_CONFIDENCE
+        ]
@@ -2,10 +2,10 @@
 
 import os
 import pytesseract
-from PIL import Image
-import numpy as np
 from typing import Optional, List, Tuple
 from .preprocessor import ImagePreprocessor
+from .results import OCRWord
+from src.utils.page import ImageLike, as_array
 
 
 class OCREngine:
@@ -21,6 +21,16 @@ class OCREngine:
         'Both': 'ara+fra'
     }
     
+    NAME = 'tesseract'
+    
+    # Tesseract runs in a subprocess, so concurrent calls are safe
+    PARALLEL_SAFE = True
+    
+    # --oem 1: Use LSTM OCR engine only (best for modern documents)
+    # --psm 3: Fully automatic page segmentation (best for invoices/tables)
+    # Speed profiles override this per run
+    TESSERACT_CONFIG = '--oem 1 --psm 3'
+    
     def __init__(self, tesseract_cmd: Optional[str] = None):
         """
         Initialize OCR engine.
@@ -35,7 +45,7 @@ class OCREngine:
     
     def extract_text(
         self,
-        image: Image.Image,
+        image: ImageLike,
         language: str = 'Both',
         preprocess: bool = True,
         **preprocess_kwargs
@@ -44,7 +54,7 @@ class OCREngine:
         Extract text from image using OCR.
         
         Args:
-            image: PIL Image object
+            image: Page, numpy array or PIL Image
             language: Language for OCR ('Arabic', 'French', or 'Both')
             preprocess: Whether to preprocess the image
             **preprocess_kwargs: Additional preprocessing options
@@ -58,36 +68,85 @@ class OCREngine:
         if language not in self.LANGUAGE_CODES:
             raise ValueError(f"Unsupported language: {language}. Use 'Arabic', 'French', or 'Both'")
         
-        # Preprocess image if enabled
+        # Preprocess image if enabled, pytesseract accepts numpy arrays directly
         if preprocess:
-            image_array = self.preprocessor.preprocess_image(image, **preprocess_kwargs)
-            # Convert back to PIL Image
-            processed_image = Image.fromarray(image_array)
+            processed_image = self.preprocessor.preprocess_image(image, **preprocess_kwargs)
         else:
-            processed_image = image
+            processed_image = as_array(image)
         
         # Perform OCR
         lang_code = self.LANGUAGE_CODES[language]
         
         try:
             # Use improved config for better document/invoice detection
-            # --oem 1: Use LSTM OCR engine only (best for modern documents)
-            # --psm 3: Fully automatic page segmentation (best for invoices/tables)
             # This works better for complex layouts like invoices
-            config = '--oem 1 --psm 3'
-            
             text = pytesseract.image_to_string(
                 processed_image,
                 lang=lang_code,
-                config=config
+                config=self.TESSERACT_CONFIG
             )
             return text.strip()
         except Exception as e:
             raise RuntimeError(f"OCR failed: {str(e)}")
     
+    def extract_words(
+        self,
+        image: ImageLike,
+        language: str = 'Both',
+        preprocess: bool = True,
+        **preprocess_kwargs
+    ) -> List[OCRWord]:
+        """
+        Extract words with bounding boxes and confidences.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess the image
+            **preprocess_kwargs: Additional preprocessing options
+            
+        Returns:
+            List of OCRWord objects, with Tesseract's line grouping as line key
+            
+        Raises:
+            ValueError: If language is not supported
+        """
+        if language not in self.LANGUAGE_CODES:
+            raise ValueError(f"Unsupported language: {language}. Use 'Arabic', 'French', or 'Both'")
+        
+        if preprocess:
+            processed_image = self.preprocessor.preprocess_image(image, **preprocess_kwargs)
+        else:
+            processed_image = as_array(image)
+        
+        try:
+            data = pytesseract.image_to_data(
+                processed_image,
+                lang=self.LANGUAGE_CODES[language],
+                config=self.TESSERACT_CONFIG,
+                output_type=pytesseract.Output.DICT
+            )
+        except Exception as e:
+            raise RuntimeError(f"OCR failed: {str(e)}")
+        
+        words = []
+        for i, conf in enumerate(data['conf']):
+            conf = float(conf)
+            word = data['text'][i]
+            if conf == -1 or not word.strip():  # -1 means no text detected
+                continue
+            left, top = data['left'][i], data['top'][i]
+            words.append(OCRWord(
+                word,
+                conf / 100.0,
+                (left, top, left + data['width'][i], top + data['height'][i]),
+                line_key=(data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            ))
+        return words
+    
     def extract_text_with_confidence(
         self,
-        image: Image.Image,
+        image: ImageLike,
         language: str = 'Both',
         preprocess: bool = True
     ) -> Tuple[str, float]:
@@ -95,7 +154,7 @@ class OCREngine:
         Extract text with confidence score.
         
         Args:
-            image: PIL Image object
+            image: Page, numpy array or PIL Image
             language: Language for OCR ('Arabic', 'French', or 'Both')
             preprocess: Whether to preprocess the image
             
@@ -107,10 +166,9 @@ class OCREngine:
         
         # Preprocess image if enabled
         if preprocess:
-            image_array = self.preprocessor.preprocess_image(image)
-            processed_image = Image.fromarray(image_array)
+            processed_image = self.preprocessor.preprocess_image(image)
         else:
-            processed_image = image
+            processed_image = as_array(image)
         
         # Get detailed OCR data
         lang_code = self.LANGUAGE_CODES[language]
@@ -0,0 +1,85 @@
+"""Line and reading-order reconstruction for engines that return loose boxes."""
+
+from typing import List, Sequence
+
+import numpy as np
+
+from src.utils.script import ARABIC_CHARS, LATIN_CHARS
+
+
+# Two boxes are on the same line if their vertical overlap is at least
+# this share of the smaller box's height
+OVERLAP_RATIO = 0.5
+
+
+def cluster_lines(boxes: np.ndarray, overlap_ratio: float = OVERLAP_RATIO) -> np.ndarray:
+    """
+    Assign boxes to text lines by vertical overlap.
+    
+    Boxes are sorted by vertical center and a new line starts wherever a
+    box overlaps the box before it by less than overlap_ratio of the
+    smaller of the two heights. Relating the overlap to box height keeps
+    small boxes (punctuation, numbers in a table cell) on their line and
+    separates tightly spaced lines of large print, which a fixed pixel
+    threshold cannot do at every resolution. Sorting dominates, so this
+    is O(n log n) in the number of boxes.
+    
+    Args:
+        boxes: Array of shape (n, 4) with (x0, y0, x1, y1) rows
+        overlap_ratio: Minimum vertical overlap, relative to the smaller
+            box height, for two boxes to share a line
+    
+    Returns:
+        Line number of each box (0 for the top line), as an int array
+    """
+    count = len(boxes)
+    if count == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    order = np.argsort((boxes[:, 1] + boxes[:, 3]) / 2, kind='stable')
+    top = boxes[order, 1]
+    bottom = boxes[order, 3]
+    height = np.maximum(bottom - top, 1.0)
+    
+    overlap = np.minimum(bottom[:-1], bottom[1:]) - np.maximum(top[:-1], top[1:])
+    breaks = np.empty(count, dtype=bool)
+    breaks[0] = True
+    breaks[1:] = overlap < overlap_ratio * np.minimum(height[:-1], height[1:])
+    
+    lines = np.empty(count, dtype=np.int64)
+    lines[order] = np.cumsum(breaks) - 1
+    return lines
+
+
+def reading_order(boxes: np.ndarray, texts: Sequence[str], overlap_ratio: float = OVERLAP_RATIO) -> List[np.ndarray]:
+    """
+    Group boxes into lines and order each line by its script.
+    
+    Lines with mostly Arabic letters are read right to left (by right
+    edge, descending), other lines left to right. Lines are returned top
+    to bottom.
+    
+    Args:
+        boxes: Array of shape (n, 4) with (x0, y0, x1, y1) rows
+        texts: Text of each box, used to detect each line's direction
+        overlap_ratio: See cluster_lines()
+    
+    Returns:
+        One array of box indices per line, in reading order
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    if not len(boxes):
+        return []
+    
+    lines = cluster_lines(boxes, overlap_ratio)
+    line_count = int(lines.max()) + 1
+    
+    arabic = np.fromiter((len(ARABIC_CHARS.findall(text)) for text in texts), dtype=np.int64, count=len(boxes))
+    latin = np.fromiter((len(LATIN_CHARS.findall(text)) for text in texts), dtype=np.int64, count=len(boxes))
+    rtl = np.bincount(lines, arabic, line_count) > np.bincount(lines, latin, line_count)
+    
+    # One sort for all lines: by line, then by distance from the line's start edge
+    position = np.where(rtl[lines], -boxes[:, 2], boxes[:, 0])
+    order = np.lexsort((position, lines))
+    bounds = np.flatnonzero(np.diff(lines[order])) + 1
+    return np.split(order, bounds)
@@ -0,0 +1,194 @@
+"""Memory-bounded cache of loaded OCR models."""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def torch_footprint(model) -> int:
+    """
+    Estimate the memory held by a model's weights.
+    
+    Counts the parameters and buffers of torch modules, and the model
+    size of ONNX Runtime wrappers exposing an nbytes attribute. Objects
+    such as an EasyOCR reader are searched one level deep for modules.
+    
+    Args:
+        model: torch module, ONNX wrapper or object holding them
+    
+    Returns:
+        Size in bytes (0 if unknown)
+    """
+    parts = [model]
+    if hasattr(model, '__dict__') and not hasattr(model, 'parameters'):
+        parts += [
+            value for value in vars(model).values()
+            if hasattr(value, 'parameters') or isinstance(getattr(value, 'nbytes', None), int)
+        ]
+    
+    total = 0
+    seen = set()
+    for part in parts:
+        if isinstance(getattr(part, 'nbytes', None), int):
+            total += part.nbytes
+            continue
+        if not hasattr(part, 'parameters'):
+            continue
+        tensors = list(part.parameters()) + list(getattr(part, 'buffers', lambda: [])())
+        for tensor in tensors:
+            if id(tensor) not in seen:
+                seen.add(id(tensor))
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelManager:
+    """
+    Least-recently-used model cache with a memory budget.
+    
+    Models are loaded on demand through a loader callable, their weight
+    footprint is measured, and the least recently used models are evicted
+    whenever the total would exceed the budget. An evicted model is simply
+    loaded again the next time it is needed. The model being loaded is
+    always kept, even if it alone exceeds the budget.
+    """
+    
+    def __init__(
+        self,
+        budget_bytes: Optional[int] = None,
+        footprint: Callable[[object], int] = torch_footprint,
+        on_evict: Optional[Callable[[Hashable], None]] = None
+    ):
+        """
+        Initialize model manager.
+        
+        Args:
+            budget_bytes: Memory budget for all models (None for unbounded)
+            footprint: Function returning the size of a loaded model in bytes
+            on_evict: Called with the key of an evicted model once the
+                manager has dropped its references to it
+        """
+        self.budget_bytes = budget_bytes
+        self.footprint = footprint
+        self.on_evict = on_evict
+        
+        self._models: 'OrderedDict[Hashable, object]' = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._lock = threading.RLock()
+        
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def budget_from_env(variable: str = 'OCR_MODEL_MEMORY_MB', default_mb: Optional[int] = 1024) -> Optional[int]:
+        """
+        Read a memory budget in megabytes from the environment.
+        
+        Args:
+            variable: Environment variable name
+            default_mb: Budget used when the variable is unset or not a number
+                (None for unbounded)
+        
+        Returns:
+            Budget in bytes, or None for unbounded (variable set to 0)
+        """
+        value = os.environ.get(variable, '').strip()
+        megabytes = default_mb
+        if value:
+            try:
+                megabytes = int(value)
+            except ValueError:
+                logger.warning("Ignoring invalid %s=%r, expected megabytes", variable, value)
+        return megabytes * 1024 * 1024 if megabytes else None
+    
+    @property
+    def used_bytes(self) -> int:
+        """Total footprint of the loaded models."""
+        return sum(self._sizes.values())
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._models
+    
+    def get(self, key: Hashable, loader: Callable[[], object]):
+        """
+        Get a model, loading it (and evicting others) if needed.
+        
+        Args:
+            key: Model identifier
+            loader: Callable creating the model when it is not loaded
+        
+        Returns:
+            The loaded model
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return self._models[key]
+            
+            model = loader()
+            size = self.footprint(model)
+            self.loads += 1
+            self._models[key] = model
+            self._sizes[key] = size
+            logger.info("Loaded model %s (%.0f MB)", key, size / 1e6)
+            
+            self._enforce_budget(keep=key)
+            return model
+    
+    def _enforce_budget(self, keep: Hashable):
+        """Evict least recently used models until the budget is met."""
+        if self.budget_bytes is None:
+            return
+        for key in list(self._models):
+            if self.used_bytes <= self.budget_bytes:
+                break
+            if key != keep:
+                self.evict(key)
+    
+    def evict(self, key: Hashable) -> bool:
+        """
+        Unload a model.
+        
+        Args:
+            key: Model identifier
+        
+        Returns:
+            True if the model was loaded
+        """
+        with self._lock:
+            model = self._models.pop(key, None)
+            if model is None:
+                return False
+            size = self._sizes.pop(key, 0)
+            self.evictions += 1
+            logger.info("Evicted model %s (%.0f MB)", key, size / 1e6)
+        # Drop the last reference before the hook, so it can free the
+        # memory the model held
+        del model
+        if self.on_evict:
+            self.on_evict(key)
+        return True
+    
+    def clear(self):
+        """Unload all models."""
+        for key in list(self._models):
+            self.evict(key)
+    
+    def report(self) -> str:
+        """
+        Summarize cache activity.
+        
+        Returns:
+            Human-readable summary
+        """
+        budget = f"{self.budget_bytes / 1e6:.0f} MB" if self.budget_bytes else "unbounded"
+        return (
+            f"{len(self._models)} model(s) loaded, {self.used_bytes / 1e6:.0f} MB of {budget}; "
+            f"{self.loads} load(s), {self.evictions} eviction(s), {self.hits} hit(s)"
+        )
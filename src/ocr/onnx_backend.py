@@ -0,0 +1,279 @@
+"""ONNX Runtime backend for the EasyOCR and PaddleOCR models."""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+from typing import Dict, Optional
+
+from src.utils.paths import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ort = None
+    ONNX_AVAILABLE = False
+
+
+BACKENDS = ('native', 'onnx', 'onnx-int8')
+
+
+def check_backend(backend: str):
+    """
+    Validate a backend name and make sure its dependencies are installed.
+    
+    Args:
+        backend: 'native', 'onnx' or 'onnx-int8'
+    
+    Raises:
+        ValueError: If the backend is unknown
+        RuntimeError: If ONNX Runtime is required but not installed
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}. Use one of {', '.join(BACKENDS)}")
+    if backend != 'native' and not ONNX_AVAILABLE:
+        raise RuntimeError("The ONNX backend requires onnxruntime. Install it with: pip install onnxruntime")
+
+
+def model_path(name: str) -> str:
+    """
+    Get the cache path of an exported float32 model.
+    
+    Args:
+        name: Model name, e.g. 'easyocr-craft'
+    
+    Returns:
+        Path of the .onnx file
+    """
+    return os.path.join(get_cache_dir('onnx'), name + '.onnx')
+
+
+def quantize_model(source: str, target: str) -> str:
+    """
+    Quantize model weights to int8 with ONNX Runtime dynamic quantization.
+    
+    Activations stay float and are quantized on the fly, so no
+    calibration data is needed.
+    
+    Args:
+        source: Float32 ONNX model
+        target: Output path of the int8 model
+    
+    Returns:
+        Target path
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    quantize_dynamic(source, target + '.tmp', weight_type=QuantType.QInt8)
+    os.replace(target + '.tmp', target)
+    logger.info("Quantized %s to int8", os.path.basename(source))
+    return target
+
+
+def ensure_quantized(path: str, quantize: bool) -> str:
+    """Return the int8 variant of an exported model, creating it if needed."""
+    if not quantize:
+        return path
+    target = path[:-len('.onnx')] + '.int8.onnx'
+    if not os.path.exists(target):
+        quantize_model(path, target)
+    return target
+
+
+def create_session(path: str, threads: Optional[int] = None):
+    """
+    Create a CPU inference session.
+    
+    Args:
+        path: ONNX model file
+        threads: Intra-op thread count (default: ONNX Runtime's choice)
+    
+    Returns:
+        onnxruntime.InferenceSession
+    """
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+    return ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+
+
+def _export_torch(module, args, path: str, input_names, output_names, dynamic_axes: Dict):
+    """Export a torch module to ONNX through a temporary file."""
+    import torch
+    
+    module.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            module, args, path + '.tmp',
+            input_names=input_names,
+            output_names=output_names,
+            dynamic_axes=dynamic_axes,
+            opset_version=13
+        )
+    os.replace(path + '.tmp', path)
+    logger.info("Exported %s", os.path.basename(path))
+
+
+def _session_module(path: str, threads: Optional[int] = None):
+    """
+    Load an ONNX model and wrap its session as a torch module.
+    
+    EasyOCR calls its detector and recognizer as torch modules, so the
+    wrapper converts tensors to numpy on the way in and back on the way
+    out. Extra positional arguments (the recognizer's unused text input)
+    are ignored. The model file size is exposed as nbytes for memory
+    accounting.
+    """
+    session = create_session(path, threads)
+    import torch
+    
+    class SessionModule(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.session = session
+            self.nbytes = os.path.getsize(path)
+            self.input_name = session.get_inputs()[0].name
+        
+        def forward(self, x, *args):
+            outputs = self.session.run(None, {self.input_name: x.detach().cpu().numpy()})
+            tensors = tuple(torch.from_numpy(output) for output in outputs)
+            return tensors if len(tensors) > 1 else tensors[0]
+    
+    return SessionModule()
+
+
+def apply_to_easyocr(reader, quantize: bool = False, threads: Optional[int] = None):
+    """
+    Replace the torch models of an EasyOCR reader with ONNX Runtime sessions.
+    
+    The CRAFT detector and the language's recognizer are exported on first
+    use and cached, so later runs only load the ONNX files.
+    
+    Args:
+        reader: easyocr.Reader created on CPU
+        quantize: Whether to run int8 quantized models
+        threads: Intra-op thread count per session
+    """
+    import torch
+    
+    detector_path = model_path('easyocr-craft')
+    if not os.path.exists(detector_path):
+        _export_torch(
+            reader.detector, torch.zeros(1, 3, 640, 640), detector_path,
+            ['image'], ['score', 'feature'],
+            {'image': {0: 'batch', 2: 'height', 3: 'width'}}
+        )
+    
+    recognizer_path = model_path(f"easyocr-{getattr(reader, 'model_lang', 'rec')}")
+    if not os.path.exists(recognizer_path):
+        recognizer = reader.recognizer
+        
+        class RecognizerExport(torch.nn.Module):
+            # The CTC recognizers ignore their text argument
+            def __init__(self):
+                super().__init__()
+                self.model = recognizer
+            
+            def forward(self, x):
+                return self.model(x, None)
+        
+        _export_torch(
+            RecognizerExport(), torch.zeros(1, 1, 64, 256), recognizer_path,
+            ['image'], ['logits'],
+            {'image': {0: 'batch', 3: 'width'}, 'logits': {0: 'batch', 1: 'steps'}}
+        )
+    
+    reader.detector = _session_module(ensure_quantized(detector_path, quantize), threads)
+    reader.recognizer = _session_module(ensure_quantized(recognizer_path, quantize), threads)
+
+
+def _paddle2onnx(model_dir: str, target: str):
+    """Convert a Paddle inference model directory to ONNX with paddle2onnx."""
+    command = shutil.which('paddle2onnx')
+    command = [command] if command else [sys.executable, '-m', 'paddle2onnx.command']
+    subprocess.run(command + [
+        '--model_dir', model_dir,
+        '--model_filename', 'inference.pdmodel',
+        '--params_filename', 'inference.pdiparams',
+        '--save_file', target + '.tmp',
+        '--opset_version', '11'
+    ], check=True, capture_output=True)
+    os.replace(target + '.tmp', target)
+    logger.info("Exported %s", os.path.basename(target))
+
+
+def _paddle_manifest() -> str:
+    """Path of the file recording which ONNX models belong to a Paddle pipeline."""
+    return os.path.join(get_cache_dir('onnx'), 'paddle.json')
+
+
+def cached_paddle_options(key: str = 'default', quantize: bool = False) -> Optional[Dict[str, object]]:
+    """
+    Get the PaddleOCR options of a previously exported pipeline.
+    
+    This lets later runs load the ONNX models directly, without first
+    building the native Paddle pipeline to locate its model directories.
+    
+    Args:
+        key: Pipeline identifier used when exporting
+        quantize: Whether the int8 variant is wanted
+    
+    Returns:
+        Keyword arguments for PaddleOCR, or None if not exported yet
+    """
+    try:
+        with open(_paddle_manifest(), 'r', encoding='utf-8') as f:
+            options = json.load(f).get(f"{key}:{'int8' if quantize else 'fp32'}")
+    except (OSError, ValueError):
+        return None
+    if not options or not all(os.path.exists(v) for k, v in options.items() if k.endswith('_model_dir')):
+        return None
+    return options
+
+
+def paddle_onnx_options(
+    model_dirs: Dict[str, str],
+    key: str = 'default',
+    quantize: bool = False
+) -> Dict[str, object]:
+    """
+    Export PaddleOCR inference models to ONNX and build the options to load them.
+    
+    Args:
+        model_dirs: Inference model directories keyed by 'det', 'rec' and
+            'cls', as used by an initialized PaddleOCR instance
+        key: Pipeline identifier under which the export is recorded
+        quantize: Whether to run int8 quantized models
+    
+    Returns:
+        Keyword arguments for PaddleOCR (use_onnx and model paths)
+    
+    Raises:
+        RuntimeError: If a model cannot be converted
+    """
+    options: Dict[str, object] = {'use_onnx': True}
+    for kind, model_dir in model_dirs.items():
+        name = 'paddle-' + os.path.basename(os.path.normpath(model_dir))
+        path = model_path(name)
+        if not os.path.exists(path):
+            try:
+                _paddle2onnx(model_dir, path)
+            except (OSError, subprocess.CalledProcessError) as e:
+                raise RuntimeError(f"Failed to convert {model_dir} to ONNX (is paddle2onnx installed?): {str(e)}")
+        options[f'{kind}_model_dir'] = ensure_quantized(path, quantize)
+    
+    try:
+        with open(_paddle_manifest(), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    manifest[f"{key}:{'int8' if quantize else 'fp32'}"] = options
+    with open(_paddle_manifest(), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return options
@@ -1,9 +1,15 @@
 
 """PaddleOCR engine for text extraction."""
 
-from PIL import Image
 from paddleocr import PaddleOCR
-from typing import Optional
+from typing import List, Optional
+import cv2
+import numpy as np
+
+from .results import OCRWord, words_to_text
+from .model_manager import ModelManager
+from src.utils.page import ImageLike, as_array
+from src.utils.script import looks_latin
 
 
 class PaddleOCREngine:
@@ -19,33 +25,182 @@ class PaddleOCREngine:
         'Both': ['ar', 'fr']  # PaddleOCR can handle multiple languages
     }
     
-    def __init__(self):
-        """Initialize PaddleOCR engine."""
+    NAME = 'paddleocr'
+    
+    # Detections below this confidence are dropped (set per run by the speed profile)
+    MIN_CONFIDENCE = 0.1
+    
+    # Paddle predictors are not safe to call from several threads at once
+    PARALLEL_SAFE = False
+    
+    def __init__(self, backend: str = 'native'):
+        """
+        Initialize PaddleOCR engine.
+        
+        Args:
+            backend: 'native' (Paddle inference), 'onnx' or 'onnx-int8'
+                (ONNX Runtime on CPU)
+        """
         import os
+        from .onnx_backend import check_backend
+        check_backend(backend)
+        self.backend = backend
+        
         # Set environment for Windows compatibility
         os.environ.setdefault('KMP_DUPLICATE_LIB_OK', 'TRUE')
         
         # Auto-detect GPU availability
         try:
             import paddle
-            gpu_available = paddle.device.is_compiled_with_cuda()
+            self.gpu_available = backend == 'native' and paddle.device.is_compiled_with_cuda()
         except:
-            gpu_available = False
+            self.gpu_available = False
         
-        # Initialize with default settings
+        # One pipeline per Paddle language, loaded on first use
         # First run downloads models (~200MB), subsequent runs use cache
+        self.pipelines = ModelManager(footprint=lambda pipeline: 0)
+    
+    def _create_pipeline(self, lang: str):
+        """Build the PaddleOCR pipeline for one Paddle language code."""
+        if self.backend != 'native':
+            return self._create_onnx(lang, self.backend == 'onnx-int8')
+        
         try:
-            self.ocr = PaddleOCR(use_angle_cls=True, use_gpu=gpu_available, show_log=False)
+            return PaddleOCR(lang=lang, use_angle_cls=True, use_gpu=self.gpu_available, show_log=False)
         except Exception as e:
             # If that fails, try with minimal settings
             try:
-                self.ocr = PaddleOCR(use_gpu=False, show_log=False)
+                return PaddleOCR(lang=lang, use_gpu=False, show_log=False)
             except Exception as e2:
                 raise RuntimeError(f"Failed to initialize PaddleOCR: {str(e2)}")
     
+    @staticmethod
+    def _create_onnx(lang: str, quantize: bool):
+        """
+        Create a PaddleOCR pipeline running ONNX models.
+        
+        On first use the native pipeline is built once to download its
+        models, which are then converted; later runs load the ONNX files
+        directly.
+        """
+        from .onnx_backend import cached_paddle_options, paddle_onnx_options
+        
+        options = cached_paddle_options(key=lang, quantize=quantize)
+        if options is None:
+            args = PaddleOCR(lang=lang, use_angle_cls=True, use_gpu=False, show_log=False).args
+            options = paddle_onnx_options(
+                {'det': args.det_model_dir, 'rec': args.rec_model_dir, 'cls': args.cls_model_dir},
+                key=lang,
+                quantize=quantize
+            )
+        try:
+            return PaddleOCR(lang=lang, use_angle_cls=True, use_gpu=False, show_log=False, **options)
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize PaddleOCR with ONNX models: {str(e)}")
+    
+    def get_pipeline(self, lang: str):
+        """
+        Get the pipeline for a Paddle language code, loading it on first use.
+        
+        Args:
+            lang: Paddle language code ('ar' or 'fr')
+        
+        Returns:
+            PaddleOCR instance
+        """
+        return self.pipelines.get(lang, lambda: self._create_pipeline(lang))
+    
+    @staticmethod
+    def _crop_box(image: np.ndarray, box) -> np.ndarray:
+        """Cut a detected text box out of the image, straightened to a horizontal strip."""
+        points = np.array(box, dtype=np.float32)
+        width = int(max(np.linalg.norm(points[0] - points[1]), np.linalg.norm(points[2] - points[3])))
+        height = int(max(np.linalg.norm(points[0] - points[3]), np.linalg.norm(points[1] - points[2])))
+        target = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+        crop = cv2.warpPerspective(
+            image, cv2.getPerspectiveTransform(points, target), (max(width, 1), max(height, 1)),
+            borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC
+        )
+        # Vertical boxes are most likely rotated text lines
+        if height >= width * 1.5:
+            crop = np.rot90(crop)
+        if crop.ndim == 2:
+            crop = cv2.cvtColor(crop, cv2.COLOR_GRAY2BGR)
+        return np.ascontiguousarray(crop)
+    
+    def _recognize_crops(self, lang: str, crops: List[np.ndarray]) -> list:
+        """
+        Recognize a batch of line crops with one language's recognizer.
+        
+        The pipeline's classifier and recognizer are called directly: with
+        a list, PaddleOCR.ocr() treats every crop as a separate page.
+        """
+        if not crops:
+            return []
+        pipeline = self.get_pipeline(lang)
+        if pipeline.use_angle_cls:
+            crops, _, _ = pipeline.text_classifier(crops)
+        lines, _ = pipeline.text_recognizer(crops)
+        return [(text, float(confidence)) for text, confidence in lines]
+    
+    def _recognize_mixed(self, image: np.ndarray) -> list:
+        """
+        Recognize a mixed Arabic/French page, routing each line by script.
+        
+        Lines are detected once. Each line is checked from its pixels
+        (looks_latin()) and recognized only by the recognizer it needs:
+        clearly Latin lines by the Latin (French) model, all other lines by
+        the Arabic model, whose character set also covers Latin letters and
+        digits.
+        """
+        boxes, _ = self.get_pipeline('ar').text_detector(image)
+        if boxes is None or len(boxes) == 0:
+            return []
+        # Detection alone returns boxes unordered, put them in reading order
+        boxes = sorted((box.tolist() for box in boxes), key=lambda box: (box[0][1], box[0][0]))
+        
+        crops = [self._crop_box(image, box) for box in boxes]
+        latin = [looks_latin(crop) for crop in crops]
+        
+        lines = [None] * len(crops)
+        for lang, routed in (('ar', False), ('fr', True)):
+            indices = [index for index, is_latin in enumerate(latin) if is_latin == routed]
+            for index, line in zip(indices, self._recognize_crops(lang, [crops[i] for i in indices])):
+                lines[index] = line
+        
+        return [(box, text, confidence) for box, (text, confidence) in zip(boxes, lines)]
+    
+    def _recognize(self, image: ImageLike, language: str) -> list:
+        """Run the pipeline(s) for a language and return (box, text, confidence) tuples."""
+        # PaddleOCR takes numpy arrays, use the page buffer without copying
+        image_array = as_array(image)
+        languages = self.LANGUAGE_CODES[language]
+        if isinstance(languages, list):
+            return self._recognize_mixed(image_array)
+        return self._parse_result(self.get_pipeline(languages).ocr(image_array))
+    
+    @staticmethod
+    def _parse_result(result) -> list:
+        """
+        Flatten PaddleOCR output into (box, text, confidence) tuples.
+        
+        result is a list with one entry per image, each a list of
+        detections shaped [box, (text, confidence)], where box is
+        ((x1, y1), (x2, y2), (x3, y3), (x4, y4)).
+        """
+        detections = []
+        for line in result or []:
+            for box_info in line or []:
+                if len(box_info) == 2:
+                    box, (text, confidence) = box_info
+                else:
+                    box, text, confidence = box_info
+                detections.append((box, text, float(confidence)))
+        return detections
+    
     def extract_text(
         self,
-        image: Image.Image,
+        image: ImageLike,
         language: str = 'Both',
         preprocess: bool = True,
         **kwargs
@@ -54,7 +209,7 @@ class PaddleOCREngine:
         Extract text from image using PaddleOCR.
         
         Args:
-            image: PIL Image object
+            image: Page, numpy array or PIL Image
             language: Language for OCR ('Arabic', 'French', or 'Both')
             preprocess: Whether to preprocess (not used with PaddleOCR as it handles it internally)
             **kwargs: Additional options
@@ -62,6 +217,32 @@ class PaddleOCREngine:
         Returns:
             Extracted text as string
             
+        Raises:
+            ValueError: If language is not supported
+        """
+        # Boxes on one line (e.g. invoice columns) are separate detections,
+        # rebuild lines and reading direction from the boxes
+        return words_to_text(self.extract_words(image, language, preprocess, **kwargs))
+    
+    def extract_words(
+        self,
+        image: ImageLike,
+        language: str = 'Both',
+        preprocess: bool = True,
+        **kwargs
+    ) -> List[OCRWord]:
+        """
+        Extract text fragments with bounding boxes and confidences.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess (not used with PaddleOCR)
+            **kwargs: Additional options
+        
+        Returns:
+            List of OCRWord objects
+        
         Raises:
             ValueError: If language is not supported
         """
@@ -69,32 +250,12 @@ class PaddleOCREngine:
             raise ValueError(f"Unsupported language: {language}. Use 'Arabic', 'French', or 'Both'")
         
         try:
-            # Convert PIL Image to numpy array for PaddleOCR
-            import numpy as np
-            image_array = np.array(image)
-            
-            # Perform OCR
-            result = self.ocr.ocr(image_array)
-            
-            # Extract text from results
-            # result is a list of lists, where each inner list contains line results
-            # Each line result is a list of boxes and text info
-            text_lines = []
-            
-            if result:
-                for line in result:
-                    if line:
-                        for box_info in line:
-                            # box_info is ((x1, y1), (x2, y2), (x3, y3), (x4, y4)), text, confidence
-                            text = box_info[1]
-                            confidence = box_info[2]
-                            
-                            # Filter very low confidence detections
-                            if confidence > 0.1:
-                                text_lines.append(text)
-            
-            combined_text = '\n'.join(text_lines)
-            return combined_text.strip()
-            
+            detections = self._recognize(image, language)
         except Exception as e:
             raise RuntimeError(f"PaddleOCR failed: {str(e)}")
+        
+        return [
+            OCRWord.from_quad(text, confidence, box)
+            for box, text, confidence in detections
+            if confidence > self.MIN_CONFIDENCE
+        ]
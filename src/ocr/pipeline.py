@@ -0,0 +1,205 @@
+"""Page-by-page OCR pipeline shared by the GUI and the command line."""
+
+import logging
+import time
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+from .results import PageResult, words_to_text
+from .supervisor import PageFailedError
+from src.utils.file_handler import FileHandler
+from src.utils.page import Page
+from src.utils.phash import verification_thumbnail
+
+logger = logging.getLogger(__name__)
+
+
+class OCRPipeline:
+    """
+    Streams pages from files through an OCR engine.
+    
+    Pages are loaded lazily and results are yielded one page at a time,
+    so memory use does not grow with the size of the batch. Each page is
+    recognized once at word level; text, layout (hOCR/ALTO) and searchable
+    PDF output are all derived from that single pass.
+    """
+    
+    def __init__(
+        self,
+        engine,
+        language: str = 'Both',
+        preprocess: bool = True,
+        dpi: int = 300,
+        keep_images: bool = False,
+        dedup_index=None,
+        blank_detector=None,
+        adaptive: bool = True,
+        preprocess_options: Optional[dict] = None,
+        memory_governor=None,
+        grayscale_pdf: bool = False
+    ):
+        """
+        Initialize pipeline.
+        
+        Args:
+            engine: OCR engine (or wrapper) providing extract_words()
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess pages
+            dpi: DPI for PDF conversion
+            keep_images: Attach each page's pixels to its result, needed
+                for searchable PDF export
+            dedup_index: DuplicateIndex used to reuse the results of
+                near-identical pages instead of recognizing them again
+            blank_detector: BlankPageDetector used to skip blank pages
+                before preprocessing
+            adaptive: Analyze each page and run only the preprocessing
+                stages it needs, instead of all of them
+            preprocess_options: Stage flags for the preprocessor, e.g.
+                from a speed profile
+            memory_governor: MemoryGovernor that records memory per file
+                and holds back page loading when memory runs short
+            grayscale_pdf: Render PDF pages in grayscale, for engines that
+                do not use color
+        """
+        self.engine = engine
+        self.language = language
+        self.preprocess = preprocess
+        self.dpi = dpi
+        self.keep_images = keep_images
+        self.dedup_index = dedup_index
+        self.blank_detector = blank_detector
+        self.adaptive = adaptive
+        self.preprocess_options = preprocess_options or {}
+        self.memory_governor = memory_governor
+        self.grayscale_pdf = grayscale_pdf
+        
+        self.pages_recognized = 0
+        self.recognition_seconds = 0.0
+    
+    def process_page(self, page: Page, page_count: int = 1) -> PageResult:
+        """
+        Recognize a single page.
+        
+        Args:
+            page: Page to recognize
+            page_count: Total number of pages in the source file
+        
+        Returns:
+            PageResult object
+        """
+        result = PageResult(
+            page.source,
+            page.page_index,
+            '',
+            page_count=page_count,
+            width=page.width,
+            height=page.height,
+            dpi=page.dpi,
+            image=page if self.keep_images else None
+        )
+        
+        if self.blank_detector is not None and self.blank_detector.is_blank(page):
+            result.text = self.blank_detector.BLANK_MARKER
+            result.blank = True
+            return result
+        
+        use_dedup = self.dedup_index is not None and page.fingerprint is not None
+        if use_dedup:
+            thumbnail = verification_thumbnail(page.array)
+            duplicate = self.dedup_index.lookup(page.fingerprint, thumbnail, page.size)
+            if duplicate is not None:
+                return self.dedup_index.apply(duplicate, result)
+        
+        start = time.perf_counter()
+        try:
+            result.words = self.engine.extract_words(
+                page, self.language, preprocess=self.preprocess, adaptive=self.adaptive,
+                **self.preprocess_options
+            )
+        except PageFailedError as e:
+            # The engine worker crashed on this page, the rest of the file goes on
+            logger.error("Skipping page %d of %s: %s", page.page_index + 1, page.source, e)
+            result.error = str(e)
+            return result
+        result.text = words_to_text(result.words)
+        self.recognition_seconds += time.perf_counter() - start
+        self.pages_recognized += 1
+        
+        if use_dedup:
+            self.dedup_index.add(page.fingerprint, result, thumbnail)
+        return result
+    
+    def average_page_seconds(self) -> float:
+        """
+        Get the average time spent recognizing a page.
+        
+        Returns:
+            Seconds per recognized page (0 if none yet)
+        """
+        if not self.pages_recognized:
+            return 0.0
+        return self.recognition_seconds / self.pages_recognized
+    
+    def process_file(self, file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[PageResult]:
+        """
+        Recognize every page of a file.
+        
+        Args:
+            file_path: Path to image or PDF file
+            pages: Zero-based indices of the pages to recognize (None for all)
+        
+        Yields:
+            PageResult objects in page order
+        """
+        page_count = FileHandler.count_pages(file_path)
+        page_iter = FileHandler.iter_pages(file_path, self.dpi, pages, self.grayscale_pdf)
+        if self.memory_governor is None:
+            for page in page_iter:
+                yield self.process_page(page, page_count)
+            return
+        
+        self.memory_governor.start_document(file_path)
+        try:
+            # The next page is only rasterized once there is memory for it
+            for page in self.memory_governor.throttle(page_iter):
+                result = self.process_page(page, page_count)
+                # Release the page before waiting for memory for the next one
+                del page
+                yield result
+                # A kept page image lives on in the result
+                del result
+        finally:
+            document = self.memory_governor.end_document()
+            if document is not None:
+                logger.info("Memory: %s", document.summary())
+    
+    def process_files(
+        self,
+        file_paths: Iterable[str],
+        pages: Optional[Dict[str, Sequence[int]]] = None
+    ) -> Iterator[PageResult]:
+        """
+        Recognize every page of several files.
+        
+        A file that fails is reported as a single PageResult carrying the
+        error on the page that failed, and processing continues with the
+        next file.
+        
+        Args:
+            file_paths: Paths to image or PDF files
+            pages: Optional page selection per file path, files missing
+                from the mapping are processed completely
+        
+        Yields:
+            PageResult objects
+        """
+        for file_path in file_paths:
+            selected = sorted(pages[file_path]) if pages and file_path in pages else None
+            done = 0
+            try:
+                for result in self.process_file(file_path, selected):
+                    done += 1
+                    yield result
+            except Exception as e:
+                logger.error("Error processing %s: %s", file_path, e)
+                failed = selected[done] if selected and done < len(selected) else done
+                yield PageResult(file_path, failed, '', error=str(e))
@@ -1,9 +1,41 @@
 """Image preprocessing module for OCR optimization."""
 
+import logging
+import math
+from typing import Dict, Optional
+
 import cv2
 import numpy as np
-from PIL import Image
-from typing import Union
+
+from src.utils.page import ImageLike, as_array
+
+logger = logging.getLogger(__name__)
+
+
+class ImageQuality:
+    """
+    Result of the quality analysis of a page.
+    
+    Attributes:
+        noise: Estimated standard deviation of pixel noise (gray levels)
+        contrast: Spread between dark and light gray levels (5th to 95th percentile)
+        bilevel: True if the page only contains black and white pixels
+        color: True if the page has color channels
+        skew: Estimated skew angle in degrees (counter-clockwise)
+    """
+    
+    def __init__(self, noise: float, contrast: float, bilevel: bool, color: bool, skew: float):
+        self.noise = noise
+        self.contrast = contrast
+        self.bilevel = bilevel
+        self.color = color
+        self.skew = skew
+    
+    def __repr__(self) -> str:
+        return (
+            f"ImageQuality(noise={self.noise:.1f}, contrast={self.contrast:.0f}, "
+            f"bilevel={self.bilevel}, color={self.color}, skew={self.skew:.2f})"
+        )
 
 
 class ImagePreprocessor:
@@ -14,18 +46,17 @@ class ImagePreprocessor:
     """
     
     @staticmethod
-    def convert_to_grayscale(image: Union[Image.Image, np.ndarray]) -> np.ndarray:
+    def convert_to_grayscale(image: ImageLike) -> np.ndarray:
         """
         Convert image to grayscale.
         
         Args:
-            image: PIL Image or numpy array
+            image: Page, PIL Image or numpy array
             
         Returns:
             Grayscale image as numpy array
         """
-        if isinstance(image, Image.Image):
-            image = np.array(image)
+        image = as_array(image)
         
         if len(image.shape) == 3:
             return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
@@ -82,31 +113,33 @@ class ImagePreprocessor:
         )
     
     @staticmethod
-    def deskew(image: np.ndarray) -> np.ndarray:
+    def deskew(image: np.ndarray, angle: Optional[float] = None) -> np.ndarray:
         """
         Correct image skew.
         
         Args:
             image: Input image as numpy array
+            angle: Known skew angle in degrees, estimated from the image if None
             
         Returns:
             Deskewed image
         """
-        coords = np.column_stack(np.where(image > 0))
-        if len(coords) == 0:
-            return image
+        if angle is None:
+            coords = np.column_stack(np.where(image > 0))
+            if len(coords) == 0:
+                return image
             
-        angle = cv2.minAreaRect(coords)[-1]
-        
-        if angle < -45:
-            angle = -(90 + angle)
-        else:
-            angle = -angle
+            angle = cv2.minAreaRect(coords)[-1]
+            
+            if angle < -45:
+                angle = -(90 + angle)
+            else:
+                angle = -angle
         
         # Only rotate if angle is significant
         if abs(angle) < 0.5:
             return image
-            
+        
         (h, w) = image.shape[:2]
         center = (w // 2, h // 2)
         M = cv2.getRotationMatrix2D(center, angle, 1.0)
@@ -116,34 +149,181 @@ class ImagePreprocessor:
         
         return rotated
     
+    # Analysis thresholds
+    NOISE_THRESHOLD = 4.0      # noise sigma above which the median blur runs
+    CONTRAST_THRESHOLD = 140   # gray level spread below which contrast is enhanced
+    SKEW_THRESHOLD = 0.5       # degrees of skew worth correcting
+    MAX_SKEW = 10.0            # largest skew angle searched for
+    
+    @staticmethod
+    def estimate_noise(gray: np.ndarray) -> float:
+        """
+        Estimate the standard deviation of pixel noise.
+        
+        Uses Immerkaer's method: a Laplacian-difference kernel cancels
+        image structure, leaving mostly noise.
+        
+        Args:
+            gray: Grayscale image at full resolution
+        
+        Returns:
+            Noise sigma in gray levels
+        """
+        height, width = gray.shape
+        if height < 3 or width < 3:
+            return 0.0
+        kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+        response = cv2.filter2D(gray.astype(np.float32), -1, kernel)[1:-1, 1:-1]
+        return float(np.abs(response).sum() * math.sqrt(math.pi / 2) / (6 * (width - 2) * (height - 2)))
+    
+    @staticmethod
+    def estimate_skew(gray: np.ndarray, max_angle: float = MAX_SKEW) -> float:
+        """
+        Estimate the skew angle of text lines.
+        
+        Rotating the page to the right angle makes text lines horizontal,
+        which maximizes the variance of the row ink profile. Angles are
+        searched coarse to fine on a small image.
+        
+        Args:
+            gray: Downsampled grayscale image
+            max_angle: Largest angle searched, in degrees
+        
+        Returns:
+            Angle in degrees to rotate by to straighten the page
+        """
+        _, ink = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+        if not ink.any():
+            return 0.0
+        height, width = ink.shape
+        center = (width / 2, height / 2)
+        
+        def score(angle: float) -> float:
+            matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
+            rotated = cv2.warpAffine(ink, matrix, (width, height), flags=cv2.INTER_NEAREST)
+            return float(np.var(rotated.sum(axis=1, dtype=np.float64)))
+        
+        best = 0.0
+        for step, span in ((1.0, max_angle), (0.2, 1.0)):
+            candidates = np.arange(best - span, best + span + step / 2, step)
+            best = float(max(candidates, key=score))
+        # Adding 0.0 turns -0.0 into 0.0
+        return round(best, 1) + 0.0
+    
+    @staticmethod
+    def analyze_quality(image: ImageLike, sample_width: int = 800) -> ImageQuality:
+        """
+        Measure noise, contrast, bit depth and skew of a page.
+        
+        Noise is measured on a full-resolution center crop, since
+        downsampling averages noise away; everything else on a small
+        downsample, so the analysis costs a few tens of milliseconds.
+        
+        Args:
+            image: Page, PIL Image or numpy array
+            sample_width: Width of the downsample used for the analysis
+        
+        Returns:
+            ImageQuality object
+        """
+        array = as_array(image)
+        color = array.ndim == 3
+        
+        # Nearest-neighbour view keeps the original gray levels for the bit depth check
+        step = max(1, array.shape[1] // sample_width)
+        strided = ImagePreprocessor.convert_to_grayscale(np.ascontiguousarray(array[::step, ::step]))
+        extremes = np.count_nonzero((strided <= 16) | (strided >= 239))
+        bilevel = extremes >= 0.99 * strided.size
+        
+        low, high = np.percentile(strided, (5, 95))
+        
+        height, width = array.shape[:2]
+        crop_h, crop_w = min(height, 512), min(width, 512)
+        top, left = (height - crop_h) // 2, (width - crop_w) // 2
+        crop = ImagePreprocessor.convert_to_grayscale(np.ascontiguousarray(array[top:top + crop_h, left:left + crop_w]))
+        noise = 0.0 if bilevel else ImagePreprocessor.estimate_noise(crop)
+        
+        small_height = max(1, int(height * sample_width / max(width, 1)))
+        small = cv2.resize(strided, (sample_width, small_height), interpolation=cv2.INTER_AREA)
+        skew = ImagePreprocessor.estimate_skew(small)
+        
+        return ImageQuality(noise, float(high - low), bilevel, color, skew)
+    
+    @staticmethod
+    def choose_stages(quality: ImageQuality) -> Dict[str, bool]:
+        """
+        Choose the preprocessing stages a page needs.
+        
+        Bilevel pages (fax, already binarized scans) only get deskewed.
+        Clean, high-contrast pages such as born-digital renders skip
+        denoising, enhancement and binarization, which the engines handle
+        well on their own.
+        
+        Args:
+            quality: Result of analyze_quality()
+        
+        Returns:
+            Stage flags as keyword arguments for preprocess_image()
+        """
+        noisy = quality.noise > ImagePreprocessor.NOISE_THRESHOLD
+        low_contrast = quality.contrast < ImagePreprocessor.CONTRAST_THRESHOLD
+        return {
+            'grayscale': quality.color,
+            'denoise': noisy and not quality.bilevel,
+            'enhance': low_contrast and not quality.bilevel,
+            'deskew': abs(quality.skew) >= ImagePreprocessor.SKEW_THRESHOLD,
+            'binarize': (noisy or low_contrast) and not quality.bilevel
+        }
+    
     @staticmethod
     def preprocess_image(
-        image: Union[Image.Image, np.ndarray],
+        image: ImageLike,
         grayscale: bool = True,
         denoise: bool = True,
         enhance: bool = True,
         binarize: bool = True,
-        deskew: bool = True
+        deskew: bool = True,
+        adaptive: bool = False
     ) -> np.ndarray:
         """
         Apply full preprocessing pipeline to image.
         
+        Every stage returns a new array, so the input buffer is never
+        modified and is not copied up front.
+        
         Args:
-            image: Input image (PIL Image or numpy array)
+            image: Input image (Page, PIL Image or numpy array)
             grayscale: Convert to grayscale
             denoise: Apply noise reduction
             enhance: Enhance contrast
             binarize: Apply binarization
             deskew: Correct skew
+            adaptive: Analyze the page first and run only the enabled
+                stages it needs
             
         Returns:
             Preprocessed image as numpy array
         """
-        # Convert to numpy array if needed
-        if isinstance(image, Image.Image):
-            processed = np.array(image)
-        else:
-            processed = image.copy()
+        # Work on the page buffer directly, stages allocate their own output
+        processed = as_array(image)
+        
+        skew_angle = None
+        if adaptive:
+            quality = ImagePreprocessor.analyze_quality(processed)
+            chosen = ImagePreprocessor.choose_stages(quality)
+            grayscale = grayscale and chosen['grayscale']
+            denoise = denoise and chosen['denoise']
+            enhance = enhance and chosen['enhance']
+            binarize = binarize and chosen['binarize']
+            deskew = deskew and chosen['deskew']
+            skew_angle = quality.skew
+            logger.info(
+                "%s -> stages: %s", quality,
+                ', '.join(name for name, on in (
+                    ('grayscale', grayscale), ('denoise', denoise), ('enhance', enhance),
+                    ('deskew', deskew), ('binarize', binarize)
+                ) if on) or 'none'
+            )
         
         # Grayscale conversion
         if grayscale:
@@ -159,7 +339,7 @@ class ImagePreprocessor:
         
         # Deskewing
         if deskew:
-            processed = ImagePreprocessor.deskew(processed)
+            processed = ImagePreprocessor.deskew(processed, skew_angle)
         
         # Binarization
         if binarize:
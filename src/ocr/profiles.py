@@ -0,0 +1,158 @@
+"""Named speed profiles bundling the throughput settings of a run."""
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+class SpeedProfile:
+    """
+    A coherent set of speed/accuracy settings.
+    
+    Covers PDF rasterization DPI, the Tesseract engine and segmentation
+    modes and model variant, the confidence thresholds of the neural
+    engines, and preprocessing options.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        dpi: int,
+        tesseract_oem: int,
+        tesseract_psm: int,
+        tessdata: Optional[str],
+        min_confidence: Dict[str, float],
+        preprocess_options: Optional[Dict[str, bool]] = None
+    ):
+        """
+        Initialize profile.
+        
+        Args:
+            name: Profile name
+            dpi: DPI for PDF conversion
+            tesseract_oem: Tesseract OCR engine mode
+            tesseract_psm: Tesseract page segmentation mode
+            tessdata: Tesseract model variant ('fast', 'best', or None
+                for the installed default models)
+            min_confidence: Detection confidence threshold per neural
+                engine ('easyocr', 'paddleocr')
+            preprocess_options: Preprocessing stage flags passed to
+                ImagePreprocessor.preprocess_image()
+        """
+        self.name = name
+        self.dpi = dpi
+        self.tesseract_oem = tesseract_oem
+        self.tesseract_psm = tesseract_psm
+        self.tessdata = tessdata
+        self.min_confidence = min_confidence
+        self.preprocess_options = preprocess_options or {}
+    
+    def __repr__(self) -> str:
+        return f"SpeedProfile({self.name!r}, dpi={self.dpi}, tessdata={self.tessdata!r})"
+    
+    @property
+    def tesseract_config(self) -> str:
+        """Tesseract command-line configuration for this profile."""
+        config = f"--oem {self.tesseract_oem} --psm {self.tesseract_psm}"
+        tessdata_dir = find_tessdata(self.tessdata) if self.tessdata else None
+        if tessdata_dir:
+            config += f' --tessdata-dir "{tessdata_dir}"'
+        return config
+
+
+PROFILES = {
+    'fast': SpeedProfile(
+        'fast', dpi=200, tesseract_oem=1, tesseract_psm=3, tessdata='fast',
+        min_confidence={'easyocr': 0.4, 'paddleocr': 0.3},
+        preprocess_options={'deskew': False}
+    ),
+    'balanced': SpeedProfile(
+        'balanced', dpi=300, tesseract_oem=1, tesseract_psm=3, tessdata=None,
+        min_confidence={'easyocr': 0.3, 'paddleocr': 0.1}
+    ),
+    'accurate': SpeedProfile(
+        'accurate', dpi=400, tesseract_oem=1, tesseract_psm=3, tessdata='best',
+        min_confidence={'easyocr': 0.2, 'paddleocr': 0.05}
+    ),
+}
+
+DEFAULT_PROFILE = 'balanced'
+
+
+def get_profile(name: str) -> SpeedProfile:
+    """
+    Get a speed profile by name.
+    
+    Args:
+        name: 'fast', 'balanced' or 'accurate'
+    
+    Returns:
+        SpeedProfile object
+    
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if name not in PROFILES:
+        raise ValueError(f"Unknown speed profile: {name}. Use one of {', '.join(PROFILES)}")
+    return PROFILES[name]
+
+
+def find_tessdata(variant: str) -> Optional[str]:
+    """
+    Locate a local directory of tessdata_fast or tessdata_best models.
+    
+    Looks at the OCR_TESSDATA_FAST / OCR_TESSDATA_BEST environment
+    variable first, then for a tessdata_fast / tessdata_best directory in
+    the project root.
+    
+    Args:
+        variant: 'fast' or 'best'
+    
+    Returns:
+        Directory path, or None if not found (the installed models are used)
+    """
+    candidates = [
+        os.environ.get(f"OCR_TESSDATA_{variant.upper()}"),
+        str(PROJECT_ROOT / f"tessdata_{variant}")
+    ]
+    for path in candidates:
+        if path and os.path.isdir(path):
+            return path
+    return None
+
+
+def apply_profile(engine, profile: SpeedProfile):
+    """
+    Configure an engine, and the engines it wraps, for a profile.
+    
+    Engines are shared through the registry, so the settings are applied
+    at the start of every run.
+    
+    Args:
+        engine: OCR engine or wrapper (TiledRecognizer, CascadeEngine)
+        profile: Speed profile
+    """
+    if engine is None:
+        return
+    if hasattr(engine, 'set_profile'):
+        # Engines in worker processes apply the profile on their side
+        engine.set_profile(profile)
+        return
+    for attribute in ('engine', 'primary', 'fallback'):
+        apply_profile(getattr(engine, attribute, None), profile)
+    
+    name = getattr(engine, 'NAME', None)
+    if name == 'tesseract':
+        if profile.tessdata and not find_tessdata(profile.tessdata):
+            logger.warning(
+                "tessdata_%s models not found (set OCR_TESSDATA_%s), using the installed models",
+                profile.tessdata, profile.tessdata.upper()
+            )
+        engine.TESSERACT_CONFIG = profile.tesseract_config
+    elif name in profile.min_confidence:
+        engine.MIN_CONFIDENCE = profile.min_confidence[name]
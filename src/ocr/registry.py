@@ -0,0 +1,248 @@
+"""Shared OCR engine registry with optional background warm-up."""
+
+import logging
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from PIL import Image, ImageDraw
+
+logger = logging.getLogger(__name__)
+
+
+class EngineRegistry:
+    """
+    Process-wide cache of initialized OCR engines.
+    
+    Constructing the neural engines (model loading, GPU probing, first
+    inference graph setup) takes tens of seconds, so every engine type is
+    built once and shared by all jobs. Engines can be warmed up ahead of
+    time in a background thread so the first real job starts immediately.
+    """
+    
+    ENGINE_TYPES = ('tesseract', 'easyocr', 'paddleocr', 'cascade-easyocr', 'cascade-paddleocr')
+    
+    DISPLAY_NAMES = {
+        'tesseract': 'Tesseract',
+        'easyocr': 'EasyOCR',
+        'paddleocr': 'PaddleOCR',
+        'cascade-easyocr': 'Tesseract + EasyOCR',
+        'cascade-paddleocr': 'Tesseract + PaddleOCR'
+    }
+    
+    # Prefix of cascade engines, followed by the fallback engine type
+    CASCADE_PREFIX = 'cascade-'
+    
+    # Engines that only look at luminance, so PDFs can be rendered in grayscale for them
+    GRAYSCALE_ENGINES = ('tesseract',)
+    
+    # Inference backend of the neural engines ('native', 'onnx' or 'onnx-int8')
+    backend = os.environ.get('OCR_BACKEND', 'native')
+    
+    _engines: Dict[str, object] = {}
+    _warm = set()
+    _lock = threading.Lock()
+    _type_locks: Dict[str, threading.Lock] = {}
+    
+    @classmethod
+    def _type_lock(cls, engine_type: str) -> threading.Lock:
+        """Get the lock guarding construction of one engine type."""
+        with cls._lock:
+            if engine_type not in cls._type_locks:
+                cls._type_locks[engine_type] = threading.Lock()
+            return cls._type_locks[engine_type]
+    
+    @staticmethod
+    def create_engine(engine_type: str):
+        """
+        Create a new engine instance.
+        
+        Args:
+            engine_type: Engine type ('tesseract', 'easyocr', 'paddleocr'
+                or a cascade such as 'cascade-easyocr')
+        
+        Returns:
+            Engine instance
+        
+        Raises:
+            ValueError: If engine type is unknown
+            RuntimeError: If the engine fails to load
+        """
+        if engine_type == 'tesseract':
+            from .engine import OCREngine
+            return OCREngine()
+        
+        if engine_type.startswith(EngineRegistry.CASCADE_PREFIX):
+            fallback_type = engine_type[len(EngineRegistry.CASCADE_PREFIX):]
+            if fallback_type not in ('easyocr', 'paddleocr'):
+                raise ValueError(f"Unknown engine type: {engine_type}")
+            from .cascade import CascadeEngine
+            # Cascades share the cached base engines instead of loading models twice
+            return CascadeEngine(
+                EngineRegistry.get_engine('tesseract'),
+                EngineRegistry.get_engine(fallback_type)
+            )
+        
+        if engine_type not in ('easyocr', 'paddleocr'):
+            raise ValueError(f"Unknown engine type: {engine_type}")
+        
+        name = EngineRegistry.DISPLAY_NAMES[engine_type]
+        try:
+            os.environ.setdefault('KMP_DUPLICATE_LIB_OK', 'TRUE')
+            if engine_type == 'easyocr':
+                from .easyocr_engine import EasyOCREngine
+                return EasyOCREngine(backend=EngineRegistry.backend)
+            from .paddleocr_engine import PaddleOCREngine
+            return PaddleOCREngine(backend=EngineRegistry.backend)
+        except Exception as e:
+            error_msg = str(e)
+            if 'DLL' in error_msg or 'WinError' in error_msg:
+                raise RuntimeError(f"Failed to load {name} engine due to Windows DLL issue. Please install Microsoft Visual C++ Redistributable: https://aka.ms/vs/17/release/vc_redist.x64.exe")
+            raise RuntimeError(f"Failed to load {name} engine: {str(e)}")
+    
+    @classmethod
+    def set_backend(cls, backend: str):
+        """
+        Select the inference backend of the neural engines.
+        
+        Cached neural engines built with another backend are dropped so
+        they are rebuilt on next use.
+        
+        Args:
+            backend: 'native', 'onnx' or 'onnx-int8'
+        
+        Raises:
+            ValueError: If the backend is unknown
+            RuntimeError: If ONNX Runtime is required but not installed
+        """
+        from .onnx_backend import check_backend
+        check_backend(backend)
+        if backend == cls.backend:
+            return
+        
+        with cls._lock:
+            cls.backend = backend
+            for engine_type in list(cls._engines):
+                if engine_type != 'tesseract':
+                    cls._engines.pop(engine_type)
+                    cls._warm.discard(engine_type)
+    
+    @classmethod
+    def get_engine(cls, engine_type: str):
+        """
+        Get the shared engine instance, creating it on first use.
+        
+        If the engine is currently being built or warmed up by a warm-up
+        thread, this waits for it instead of building a second instance or
+        running it concurrently with the dummy inference.
+        
+        Args:
+            engine_type: Engine type ('tesseract', 'easyocr' or 'paddleocr')
+        
+        Returns:
+            Engine instance
+        """
+        with cls._type_lock(engine_type):
+            return cls._cached(engine_type)
+    
+    @classmethod
+    def _cached(cls, engine_type: str):
+        """Get or create the shared engine, the type lock must be held."""
+        if engine_type not in cls._engines:
+            cls._engines[engine_type] = cls.create_engine(engine_type)
+        return cls._engines[engine_type]
+    
+    @classmethod
+    def is_ready(cls, engine_type: str) -> bool:
+        """
+        Check whether an engine has been warmed up.
+        
+        Args:
+            engine_type: Engine type
+        
+        Returns:
+            True if the engine is loaded and has run a warm-up inference
+        """
+        return engine_type in cls._warm
+    
+    @staticmethod
+    def _dummy_image() -> Image.Image:
+        """Create a tiny image with some text for warm-up inference."""
+        image = Image.new('RGB', (160, 48), 'white')
+        ImageDraw.Draw(image).text((8, 16), "OCR 123", fill='black')
+        return image
+    
+    @classmethod
+    def warm_up(cls, engine_type: str, language: str = 'Both'):
+        """
+        Load an engine and run a tiny dummy inference.
+        
+        This builds the models for the given language and triggers first
+        inference setup, so later jobs reuse a fully initialized engine.
+        
+        Args:
+            engine_type: Engine type
+            language: Language the models should be loaded for
+        """
+        with cls._type_lock(engine_type):
+            engine = cls._cached(engine_type)
+            engine.extract_text(cls._dummy_image(), language, preprocess=False)
+            cls._warm.add(engine_type)
+        logger.info("%s engine warmed up", cls.DISPLAY_NAMES.get(engine_type, engine_type))
+    
+    @classmethod
+    def start_warmup(
+        cls,
+        engine_types: Iterable[str],
+        language: str = 'Both',
+        callback: Optional[Callable[[str, Optional[str]], None]] = None
+    ) -> threading.Thread:
+        """
+        Warm up engines in a background daemon thread.
+        
+        Engines that are already warm are skipped.
+        
+        Args:
+            engine_types: Engine types to warm up, in order
+            language: Language the models should be loaded for
+            callback: Called with (engine_type, error message or None)
+                after each engine finishes
+        
+        Returns:
+            The started thread
+        """
+        engine_types = list(engine_types)
+        
+        def run():
+            for engine_type in engine_types:
+                try:
+                    if not cls.is_ready(engine_type):
+                        cls.warm_up(engine_type, language)
+                    error = None
+                except Exception as e:
+                    logger.warning("Warm-up of %s failed: %s", engine_type, e)
+                    error = str(e)
+                if callback:
+                    callback(engine_type, error)
+        
+        thread = threading.Thread(target=run, name='ocr-warmup', daemon=True)
+        thread.start()
+        return thread
+    
+    @staticmethod
+    def parse_engine_list(value: Optional[str]) -> list:
+        """
+        Parse a comma-separated list of engine types.
+        
+        Args:
+            value: String such as 'easyocr,paddleocr' (or 'all')
+        
+        Returns:
+            List of valid engine types, unknown names are ignored
+        """
+        if not value:
+            return []
+        names = [name.strip().lower() for name in value.split(',') if name.strip()]
+        if 'all' in names:
+            return list(EngineRegistry.ENGINE_TYPES)
+        return [name for name in names if name in EngineRegistry.ENGINE_TYPES]
@@ -0,0 +1,279 @@
+"""Structured OCR results shared by all engines."""
+
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .layout import reading_order
+
+
+class OCRWord:
+    """
+    A recognized word or text fragment with its position on the page.
+    
+    Confidence is normalized to 0..1 for every engine and the bounding box
+    is axis-aligned, in pixel coordinates of the recognized image.
+    """
+    
+    def __init__(
+        self,
+        text: str,
+        confidence: float,
+        bbox: Tuple[float, float, float, float],
+        line_key: Optional[Hashable] = None
+    ):
+        """
+        Initialize word.
+        
+        Args:
+            text: Recognized text
+            confidence: Confidence score between 0 and 1
+            bbox: Bounding box as (x0, y0, x1, y1)
+            line_key: Engine-provided line identifier, if the engine
+                groups words into lines itself (e.g. Tesseract)
+        """
+        self.text = text
+        self.confidence = confidence
+        self.bbox = tuple(float(v) for v in bbox)
+        self.line_key = line_key
+    
+    def __repr__(self) -> str:
+        return f"OCRWord({self.text!r}, {self.confidence:.2f}, {self.bbox})"
+    
+    @property
+    def width(self) -> float:
+        """Box width."""
+        return self.bbox[2] - self.bbox[0]
+    
+    @property
+    def height(self) -> float:
+        """Box height."""
+        return self.bbox[3] - self.bbox[1]
+    
+    @property
+    def center(self) -> Tuple[float, float]:
+        """Box center as (x, y)."""
+        return (self.bbox[0] + self.bbox[2]) / 2, (self.bbox[1] + self.bbox[3]) / 2
+    
+    def translate(self, dx: float, dy: float) -> 'OCRWord':
+        """
+        Get a copy of the word moved by an offset.
+        
+        The line key is dropped since it is only meaningful within the
+        image the word was recognized in.
+        
+        Args:
+            dx: Horizontal offset
+            dy: Vertical offset
+        
+        Returns:
+            New OCRWord object
+        """
+        x0, y0, x1, y1 = self.bbox
+        return OCRWord(self.text, self.confidence, (x0 + dx, y0 + dy, x1 + dx, y1 + dy))
+    
+    @staticmethod
+    def from_quad(text: str, confidence: float, quad: Sequence[Sequence[float]]) -> 'OCRWord':
+        """
+        Create a word from a four-point polygon as returned by the neural engines.
+        
+        Args:
+            text: Recognized text
+            confidence: Confidence score between 0 and 1
+            quad: Four (x, y) corner points
+        
+        Returns:
+            OCRWord object
+        """
+        xs = [point[0] for point in quad]
+        ys = [point[1] for point in quad]
+        return OCRWord(text, float(confidence), (min(xs), min(ys), max(xs), max(ys)))
+
+
+def box_iou(a: Tuple[float, ...], b: Tuple[float, ...]) -> float:
+    """
+    Compute intersection over union of two boxes.
+    
+    Args:
+        a: First box as (x0, y0, x1, y1)
+        b: Second box as (x0, y0, x1, y1)
+    
+    Returns:
+        IoU between 0 and 1
+    """
+    ix = max(0.0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0.0, min(a[3], b[3]) - max(a[1], b[1]))
+    intersection = ix * iy
+    if intersection <= 0:
+        return 0.0
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+def group_lines(words: List[OCRWord]) -> List[List[OCRWord]]:
+    """
+    Group recognized words into text lines in reading order.
+    
+    Words carrying engine line keys are grouped by key in the order the
+    engine returned them. Otherwise words are clustered into lines by
+    vertical overlap and each line is ordered right to left or left to
+    right depending on its script (see layout.reading_order()).
+    
+    Args:
+        words: Recognized words
+        
+    Returns:
+        List of lines, each a list of words
+    """
+    if not words:
+        return []
+    
+    if all(word.line_key is not None for word in words):
+        lines = {}
+        for word in words:
+            lines.setdefault(word.line_key, []).append(word)
+        return list(lines.values())
+    
+    boxes = np.array([word.bbox for word in words], dtype=np.float64)
+    return [[words[i] for i in line] for line in reading_order(boxes, [word.text for word in words])]
+
+
+def words_to_text(words: List[OCRWord]) -> str:
+    """
+    Assemble recognized words into text.
+    
+    Lines are separated by newlines. With Tesseract line keys
+    (block, paragraph, line), paragraphs are separated by a blank line.
+    
+    Args:
+        words: Recognized words
+        
+    Returns:
+        Text with one line per detected text line
+    """
+    parts = []
+    previous_paragraph = None
+    for line in group_lines(words):
+        key = line[0].line_key
+        paragraph = key[:-1] if isinstance(key, tuple) else None
+        if parts and paragraph is not None and paragraph != previous_paragraph:
+            parts.append('')
+        previous_paragraph = paragraph
+        parts.append(' '.join(word.text for word in line))
+    return '\n'.join(parts).strip()
+
+
+class PageResult:
+    """
+    OCR result for a single page of a source document.
+    
+    Page results are produced one at a time by the pipeline and consumed
+    by the streaming exporters, so a batch never has to be held in memory.
+    """
+    
+    def __init__(
+        self,
+        source: str,
+        page_index: int,
+        text: str,
+        page_count: int = 1,
+        words: Optional[List[OCRWord]] = None,
+        error: Optional[str] = None,
+        width: int = 0,
+        height: int = 0,
+        dpi: Optional[int] = None,
+        image=None
+    ):
+        """
+        Initialize page result.
+        
+        Args:
+            source: Path of the source file
+            page_index: Zero-based page index within the source file
+            text: Recognized text
+            page_count: Total number of pages in the source file
+            words: Recognized words with boxes, if available
+            error: Error message if the page could not be processed
+            width: Width in pixels of the image the boxes refer to
+            height: Height in pixels of the image the boxes refer to
+            dpi: Resolution of the page, if known
+            image: The recognized Page, kept only when an exporter needs
+                the pixels (searchable PDF)
+        """
+        self.source = source
+        self.page_index = page_index
+        self.text = text
+        self.page_count = page_count
+        self.words = words or []
+        self.error = error
+        self.width = width
+        self.height = height
+        self.dpi = dpi
+        self.image = image
+        # "source#page" of the earlier page this result was reused from
+        self.duplicate_of: Optional[str] = None
+        # True if the page was classified blank and not recognized
+        self.blank = False
+    
+    @property
+    def ok(self) -> bool:
+        """True if the page was processed successfully."""
+        return self.error is None
+    
+    def to_dict(self) -> dict:
+        """
+        Convert to a JSON-serializable dictionary.
+        
+        Words are stored compactly as [text, confidence, x0, y0, x1, y1].
+        
+        Returns:
+            Dictionary with source, page (1-based), page count, text, layout and error
+        """
+        data = {
+            'source': self.source,
+            'page': self.page_index + 1,
+            'page_count': self.page_count,
+            'text': self.text
+        }
+        if self.width and self.height:
+            data['size'] = [self.width, self.height]
+            data['dpi'] = self.dpi
+        if self.words:
+            data['words'] = [
+                [word.text, round(word.confidence, 3)] + [round(v, 1) for v in word.bbox]
+                for word in self.words
+            ]
+        if self.duplicate_of is not None:
+            data['duplicate_of'] = self.duplicate_of
+        if self.blank:
+            data['blank'] = True
+        if self.error is not None:
+            data['error'] = self.error
+        return data
+    
+    @staticmethod
+    def from_dict(data: dict) -> 'PageResult':
+        """
+        Create a page result from a dictionary produced by to_dict().
+        
+        Args:
+            data: Dictionary
+            
+        Returns:
+            PageResult object
+        """
+        width, height = data.get('size', (0, 0))
+        result = PageResult(
+            data['source'],
+            data['page'] - 1,
+            data.get('text', ''),
+            page_count=data.get('page_count', 1),
+            words=[OCRWord(text, conf, bbox) for text, conf, *bbox in data.get('words', [])],
+            error=data.get('error'),
+            width=width,
+            height=height,
+            dpi=data.get('dpi')
+        )
+        result.duplicate_of = data.get('duplicate_of')
+        result.blank = data.get('blank', False)
+        return result
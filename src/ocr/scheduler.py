@@ -0,0 +1,152 @@
+"""Size-aware ordering of batch jobs."""
+
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from PIL import Image
+
+from .results import PageResult
+from src.utils.file_handler import FileHandler
+
+
+class JobScheduler:
+    """
+    Orders the files of a batch by estimated processing cost.
+    
+    Cost is estimated without decoding any pixels: PDFs from their page
+    count (PDF metadata), images from their pixel count (image header),
+    in units of an A4 page at 300 DPI.
+    
+    Policies:
+        fifo: keep the order given
+        sjf: shortest job first, minimizes mean time until a document is
+            done, so small invoices are not stuck behind a large PDF
+        lpt: longest processing time first, minimizes the makespan when
+            several workers take files from the same queue
+    """
+    
+    POLICIES = ('fifo', 'sjf', 'lpt')
+    
+    # A4 at 300 DPI
+    REFERENCE_PIXELS = 2480 * 3508
+    
+    def __init__(self, policy: str = 'fifo'):
+        """
+        Initialize scheduler.
+        
+        Args:
+            policy: 'fifo', 'sjf' or 'lpt'
+        
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown scheduling policy: {policy}. Use one of {', '.join(self.POLICIES)}")
+        self.policy = policy
+        self.costs: Dict[str, float] = {}
+    
+    @classmethod
+    def estimate_cost(cls, file_path: str) -> float:
+        """
+        Estimate the processing cost of a file.
+        
+        Args:
+            file_path: Path to image or PDF file
+        
+        Returns:
+            Estimated cost in reference pages (1.0 for unreadable files)
+        """
+        try:
+            if FileHandler.is_pdf_file(file_path):
+                return float(FileHandler.count_pages(file_path))
+            # Opening reads only the header, pixels are not decoded
+            with Image.open(file_path) as image:
+                frames = getattr(image, 'n_frames', 1)
+                return frames * image.width * image.height / cls.REFERENCE_PIXELS
+        except Exception:
+            return 1.0
+    
+    def order(self, files: Iterable[str]) -> List[str]:
+        """
+        Order files according to the policy.
+        
+        Ties keep their original order.
+        
+        Args:
+            files: File paths in submission order
+        
+        Returns:
+            File paths in processing order
+        """
+        files = list(files)
+        if self.policy == 'fifo':
+            return files
+        for file_path in files:
+            if file_path not in self.costs:
+                self.costs[file_path] = self.estimate_cost(file_path)
+        return sorted(files, key=self.costs.get, reverse=self.policy == 'lpt')
+
+
+class ScheduleStats:
+    """
+    Measures when each document of a batch is completed.
+    
+    Reports the makespan (time until the whole batch is done) and the mean
+    completion time (average time a document waits until its results are
+    complete), the two quantities the scheduling policies trade off.
+    """
+    
+    def __init__(self):
+        """Initialize stats, starting the clock."""
+        self.start = time.perf_counter()
+        self.completions: Dict[str, float] = {}
+    
+    def file_done(self, file_path: str):
+        """Record that all pages of a file are done."""
+        self.completions[file_path] = time.perf_counter() - self.start
+    
+    def track(self, results: Iterable[PageResult]) -> Iterator[PageResult]:
+        """
+        Pass page results through, recording when each file is complete.
+        
+        A file is complete when results move on to the next file or the
+        stream ends.
+        
+        Args:
+            results: Page results in processing order
+        
+        Yields:
+            The same page results
+        """
+        current: Optional[str] = None
+        for result in results:
+            if current is not None and result.source != current:
+                self.file_done(current)
+            current = result.source
+            yield result
+        if current is not None:
+            self.file_done(current)
+    
+    @property
+    def makespan(self) -> float:
+        """Seconds until the last document was done."""
+        return max(self.completions.values(), default=0.0)
+    
+    @property
+    def mean_completion(self) -> float:
+        """Average seconds until a document was done."""
+        if not self.completions:
+            return 0.0
+        return sum(self.completions.values()) / len(self.completions)
+    
+    def report(self) -> str:
+        """
+        Summarize the schedule.
+        
+        Returns:
+            Human-readable summary
+        """
+        return (
+            f"{len(self.completions)} document(s), makespan {self.makespan:.1f}s, "
+            f"mean completion {self.mean_completion:.1f}s"
+        )
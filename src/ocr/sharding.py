@@ -0,0 +1,208 @@
+"""Deterministic partitioning of batch work across machines."""
+
+import hashlib
+import heapq
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from .results import PageResult
+from src.utils.file_handler import FileHandler
+
+
+MANIFEST_SUFFIX = '.manifest.json'
+MISSING_PAGE_ERROR = "Page missing from shard outputs"
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification such as '2/8'.
+    
+    Args:
+        value: 'index/count' with a 1-based index
+    
+    Returns:
+        Tuple of (index, count)
+    
+    Raises:
+        ValueError: If the specification is malformed or out of range
+    """
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected INDEX/COUNT such as 1/4")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"Invalid shard '{value}', index must be between 1 and {max(count, 1)}")
+    return index, count
+
+
+def unit_key(file_path: str, page_index: int) -> str:
+    """Stable identifier of one page, independent of the operating system."""
+    return f"{os.path.normpath(file_path).replace(os.sep, '/')}#{page_index}"
+
+
+def shard_of(file_path: str, page_index: int, shard_count: int) -> int:
+    """
+    Get the shard a page belongs to.
+    
+    The assignment only depends on the file path and page index, so every
+    machine computes the same partition without coordination, and pages
+    of a large document are spread over all shards.
+    
+    Args:
+        file_path: Path of the document, as passed on the command line
+        page_index: Zero-based page index
+        shard_count: Number of shards
+    
+    Returns:
+        1-based shard index
+    """
+    digest = hashlib.sha1(unit_key(file_path, page_index).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shard_count + 1
+
+
+def shard_name(index: int, count: int) -> str:
+    """Base file name of a shard's outputs."""
+    return f"shard-{index:04d}-of-{count:04d}"
+
+
+def plan_shard(files: Sequence[str], index: int, count: int) -> Tuple[List[Tuple[str, int]], Dict[str, List[int]]]:
+    """
+    Select the pages of the batch that belong to one shard.
+    
+    Args:
+        files: All input files of the batch, in batch order
+        index: 1-based shard index
+        count: Number of shards
+    
+    Returns:
+        Tuple of (page count of every file in batch order, selected page
+        indices per file for this shard)
+    """
+    page_counts = []
+    selection = {}
+    for file_path in files:
+        try:
+            page_count = FileHandler.count_pages(file_path)
+        except Exception:
+            # Unreadable files are owned by the shard of their first page,
+            # which reports the error
+            page_count = 1
+        page_counts.append((file_path, page_count))
+        pages = [page for page in range(page_count) if shard_of(file_path, page, count) == index]
+        if pages:
+            selection[file_path] = pages
+    return page_counts, selection
+
+
+def write_manifest(path: str, index: int, count: int, page_counts: List[Tuple[str, int]], results: Dict[str, int]):
+    """
+    Write the manifest marking a shard as complete.
+    
+    Args:
+        path: Manifest file path
+        index: 1-based shard index
+        count: Number of shards
+        page_counts: Page count of every file in batch order
+        results: Counters of the shard run (pages, errors)
+    """
+    manifest = {
+        'shard': index,
+        'shards': count,
+        'completed': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'files': [[file_path, page_count] for file_path, page_count in page_counts],
+        'results': results
+    }
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def read_manifests(directory: str) -> List[dict]:
+    """
+    Read and check the shard manifests in a directory.
+    
+    Args:
+        directory: Directory holding the shard outputs
+    
+    Returns:
+        Manifests ordered by shard index
+    
+    Raises:
+        ValueError: If shards are missing or were run on different batches
+    """
+    manifests = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(MANIFEST_SUFFIX):
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                manifests.append(json.load(f))
+    if not manifests:
+        raise ValueError(f"No shard manifests found in {directory}")
+    
+    count = manifests[0]['shards']
+    found = {manifest['shard'] for manifest in manifests}
+    missing = [index for index in range(1, count + 1) if index not in found]
+    if missing:
+        raise ValueError(f"Shard(s) not complete: {', '.join(shard_name(i, count) for i in missing)}")
+    if any(m['shards'] != count or m['files'] != manifests[0]['files'] for m in manifests):
+        raise ValueError("Shard manifests belong to different batches")
+    return sorted(manifests, key=lambda m: m['shard'])
+
+
+def _read_shard(path: str, file_order: Dict[str, int]) -> Iterator[Tuple[int, int, str]]:
+    """Yield (file position, page index, JSON line) from a shard output in batch order."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                data = json.loads(line)
+                yield file_order[data['source']], data['page'] - 1, line
+
+
+def merge_shards(directory: str) -> Iterator[PageResult]:
+    """
+    Merge the outputs of all shards into ordered per-document results.
+    
+    Every shard writes its pages in batch order, so the outputs are
+    combined with a streaming k-way merge instead of being loaded into
+    memory. Pages missing from all shards (for example after a failure
+    part way through a document) are reported as error results, so the
+    merged output always lists every page of every document.
+    
+    Args:
+        directory: Directory holding the shard outputs and manifests
+    
+    Yields:
+        PageResult objects, documents in batch order and pages in page order
+    
+    Raises:
+        ValueError: If shards are missing or inconsistent
+    """
+    manifests = read_manifests(directory)
+    files = manifests[0]['files']
+    count = manifests[0]['shards']
+    file_order = {file_path: position for position, (file_path, _) in enumerate(files)}
+    
+    streams = [
+        _read_shard(os.path.join(directory, shard_name(m['shard'], count) + '.jsonl'), file_order)
+        for m in manifests
+    ]
+    merged = heapq.merge(*streams, key=lambda item: item[:2])
+    
+    def expected() -> Iterable[Tuple[int, int]]:
+        for position, (_, page_count) in enumerate(files):
+            for page in range(page_count):
+                yield position, page
+    
+    pending = next(merged, None)
+    for position, page in expected():
+        file_path, page_count = files[position]
+        # Skip records of the same page written by more than one shard
+        while pending is not None and pending[:2] < (position, page):
+            pending = next(merged, None)
+        if pending is not None and pending[:2] == (position, page):
+            result = PageResult.from_dict(json.loads(pending[2]))
+            pending = next(merged, None)
+        else:
+            result = PageResult(file_path, page, '', page_count=page_count, error=MISSING_PAGE_ERROR)
+        yield result
@@ -0,0 +1,329 @@
+"""Crash-isolated OCR engine running in a supervised child process."""
+
+import logging
+import multiprocessing
+import threading
+import time
+from typing import List, Optional
+
+from .results import OCRWord, words_to_text
+from src.utils.page import ImageLike, as_array
+from src.utils.shm_transport import PageDescriptor, SharedPagePool, SharedPageReader, pack_page
+
+logger = logging.getLogger(__name__)
+
+
+class PageFailedError(RuntimeError):
+    """A page crashed or hung the engine worker on every attempt."""
+
+
+def _worker_main(conn, engine_type: str, backend: str, options: dict):
+    """
+    Child process loop: build the engine, then recognize pages on request.
+    
+    Requests are (page, language, preprocess, kwargs, profile) tuples and
+    None to exit, where page is an array or a PageDescriptor of a shared
+    memory buffer. Replies are ('ok', words) or ('error', message).
+    """
+    try:
+        from .registry import EngineRegistry
+        from .profiles import apply_profile
+        
+        EngineRegistry.set_backend(backend)
+        engine = EngineRegistry.get_engine(engine_type)
+        for name, value in options.items():
+            setattr(engine, name, value)
+    except Exception as e:
+        conn.send(('error', str(e)))
+        return
+    conn.send(('ready', None))
+    
+    reader = SharedPageReader()
+    profile_name = None
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            reader.close()
+            return
+        
+        page, language, preprocess, kwargs, page_profile = request
+        array = reader.view(page) if isinstance(page, PageDescriptor) else page
+        try:
+            if page_profile is not None and page_profile.name != profile_name:
+                apply_profile(engine, page_profile)
+                profile_name = page_profile.name
+            words = engine.extract_words(array, language, preprocess=preprocess, **kwargs)
+            conn.send(('ok', words))
+        except Exception as e:
+            conn.send(('error', str(e)))
+        # The shared buffer is reused for another page once we have replied
+        page = array = None
+
+
+class SupervisedEngine:
+    """
+    Engine wrapper that runs the real engine in a child process.
+    
+    A segfault, abort or hang inside Tesseract, torch, Paddle or OpenCV
+    only kills the child: the supervisor notices the dead process (or a
+    page exceeding its timeout), starts a fresh worker and retries the
+    page. A page that still fails is skipped with a PageFailedError the
+    pipeline records on that page, or, with the 'fail' policy, fails its
+    file. Errors the engine raises normally are passed through unchanged
+    and do not restart the worker.
+    
+    The worker keeps its models loaded between pages and runs, so the
+    load cost is paid once per worker start. Large pages are passed
+    through a pool of shared memory buffers rather than pickled through
+    the pipe.
+    """
+    
+    # Pages are sent to a single worker one at a time
+    PARALLEL_SAFE = False
+    
+    POLICIES = ('skip', 'fail')
+    
+    def __init__(
+        self,
+        engine_type: str,
+        backend: str = 'native',
+        page_timeout: float = 120.0,
+        retries: int = 1,
+        on_failure: str = 'skip',
+        start_timeout: float = 600.0,
+        options: Optional[dict] = None,
+        shared_memory: bool = True
+    ):
+        """
+        Initialize supervised engine.
+        
+        Args:
+            engine_type: Engine type to run in the worker (see EngineRegistry)
+            backend: Inference backend of the neural engines
+            page_timeout: Seconds a page may take before the worker is
+                considered hung and restarted
+            retries: Attempts on a fresh worker after a crash or timeout
+            on_failure: 'skip' to record the failed page and continue the
+                file, 'fail' to fail the rest of the file
+            start_timeout: Seconds allowed for the worker to load its models
+            options: Engine attributes set in the worker, e.g. a cascade
+                threshold
+            shared_memory: Pass large pages through shared memory instead
+                of pickling them
+        
+        Raises:
+            ValueError: If the failure policy is unknown
+        """
+        if on_failure not in self.POLICIES:
+            raise ValueError(f"Unknown failure policy: {on_failure}. Use one of {', '.join(self.POLICIES)}")
+        
+        self.engine_type = engine_type
+        self.backend = backend
+        self.page_timeout = page_timeout
+        self.retries = retries
+        self.on_failure = on_failure
+        self.start_timeout = start_timeout
+        self.options = options or {}
+        self.profile = None
+        
+        self.pages = 0
+        self.crashes = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.retried = 0
+        self.skipped = 0
+        self.start_seconds = 0.0
+        
+        self.pool = SharedPagePool() if shared_memory else None
+        self._context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+    
+    def set_profile(self, profile):
+        """Apply a speed profile in the worker from the next page on."""
+        self.profile = profile
+    
+    @property
+    def alive(self) -> bool:
+        """True if a worker process is running."""
+        return self._process is not None and self._process.is_alive()
+    
+    def start(self):
+        """
+        Start the worker process and wait for its engine to load.
+        
+        Raises:
+            RuntimeError: If the engine fails to load in the worker
+        """
+        start = time.perf_counter()
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.engine_type, self.backend, self.options),
+            name=f"ocr-{self.engine_type}",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        
+        try:
+            if not parent_conn.poll(self.start_timeout):
+                raise RuntimeError(f"{self.engine_type} worker did not start within {self.start_timeout:.0f} s")
+            status, message = parent_conn.recv()
+        except (EOFError, OSError):
+            status, message = 'error', f"worker exited with code {process.exitcode}"
+        except RuntimeError:
+            process.kill()
+            process.join()
+            raise
+        if status != 'ready':
+            process.join(5)
+            raise RuntimeError(f"Failed to start {self.engine_type} worker: {message}")
+        
+        self._process = process
+        self._conn = parent_conn
+        self.start_seconds += time.perf_counter() - start
+    
+    def _stop_worker(self):
+        """Kill the worker process, e.g. after a hang."""
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+    
+    def close(self):
+        """Ask the worker to exit and wait for it."""
+        with self._lock:
+            if self.alive:
+                try:
+                    self._conn.send(None)
+                    self._process.join(5)
+                except (OSError, BrokenPipeError):
+                    pass
+            self._stop_worker()
+            if self.pool is not None:
+                self.pool.close()
+    
+    def _attempt(self, request) -> Optional[tuple]:
+        """
+        Send a page to the worker and wait for the reply.
+        
+        Returns:
+            The worker's reply, or None if the worker crashed or timed out
+        """
+        if not self.alive:
+            if self._process is not None:
+                self.restarts += 1
+            self._stop_worker()
+            self.start()
+        
+        try:
+            self._conn.send(request)
+            if self._conn.poll(self.page_timeout):
+                return self._conn.recv()
+            self.timeouts += 1
+            logger.warning("%s worker hung for %.0f s, restarting it", self.engine_type, self.page_timeout)
+        except (EOFError, OSError):
+            self.crashes += 1
+            self._process.join(5)
+            logger.warning("%s worker crashed (exit code %s), restarting it", self.engine_type, self._process.exitcode)
+        
+        self._stop_worker()
+        self.restarts += 1
+        return None
+    
+    def extract_words(
+        self,
+        image: ImageLike,
+        language: str = 'Both',
+        preprocess: bool = True,
+        **kwargs
+    ) -> List[OCRWord]:
+        """
+        Recognize a page in the worker process.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess the image
+            **kwargs: Preprocessing options passed to the engine
+        
+        Returns:
+            List of OCRWord objects
+        
+        Raises:
+            PageFailedError: If the page crashed or hung every worker it
+                was sent to (policy 'skip')
+            RuntimeError: If the engine raised an error, or the page
+                failed with policy 'fail'
+        """
+        with self._lock:
+            array = as_array(image)
+            page = pack_page(self.pool, array) if self.pool is not None else array
+            request = (page, language, preprocess, kwargs, self.profile)
+            self.pages += 1
+            try:
+                for attempt in range(self.retries + 1):
+                    if attempt:
+                        self.retried += 1
+                    reply = self._attempt(request)
+                    if reply is not None:
+                        status, value = reply
+                        if status == 'ok':
+                            return value
+                        raise RuntimeError(value)
+            finally:
+                if page is not array:
+                    self.pool.release(page)
+            
+            self.skipped += 1
+        
+        message = f"{self.engine_type} worker crashed or hung on this page {self.retries + 1} time(s)"
+        if self.on_failure == 'skip':
+            raise PageFailedError(message)
+        raise RuntimeError(message)
+    
+    def extract_text(
+        self,
+        image: ImageLike,
+        language: str = 'Both',
+        preprocess: bool = True,
+        **kwargs
+    ) -> str:
+        """
+        Recognize a page in the worker process and return its text.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess the image
+            **kwargs: Preprocessing options passed to the engine
+        
+        Returns:
+            Extracted text as string
+        """
+        return words_to_text(self.extract_words(image, language, preprocess, **kwargs))
+    
+    def report(self) -> str:
+        """
+        Summarize worker health for the run.
+        
+        Returns:
+            Human-readable summary
+        """
+        summary = (
+            f"{self.pages} page(s), {self.crashes} crash(es), {self.timeouts} timeout(s), "
+            f"{self.restarts} restart(s), {self.retried} retried, {self.skipped} skipped, "
+            f"{self.start_seconds:.1f} s starting workers"
+        )
+        if self.pool is not None:
+            summary += f", {self.pool.report()}"
+        return summary
@@ -0,0 +1,273 @@
+"""Tiled OCR for oversized scans."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .results import OCRWord, box_iou, words_to_text
+from src.utils.page import ImageLike, as_array
+
+
+Tile = Tuple[int, int, int, int]
+
+
+class TiledRecognizer:
+    """
+    Wrapper that splits oversized images into overlapping tiles.
+    
+    Large-format scans are cut into tiles that are preprocessed and
+    recognized in parallel, then the words are mapped back to page
+    coordinates and de-duplicated in the overlap zones. Images below the
+    size threshold go straight to the wrapped engine.
+    
+    The threshold applies at REFERENCE_DPI and grows with the square of
+    higher page resolutions, so an ordinary page rendered at 400 DPI by
+    the accurate profile still gets whole-page layout analysis.
+    """
+    
+    DEFAULT_MAX_PIXELS = 12_000_000  # a bit above A4 at 300 DPI
+    REFERENCE_DPI = 300
+    DEFAULT_TILE_SIZE = 2048
+    DEFAULT_OVERLAP = 160
+    
+    # Cell size of the grid that limits duplicate checks to nearby boxes
+    MERGE_CELL = 256
+    
+    def __init__(
+        self,
+        engine,
+        max_pixels: int = DEFAULT_MAX_PIXELS,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        overlap: int = DEFAULT_OVERLAP,
+        max_workers: Optional[int] = None,
+        memory_governor=None
+    ):
+        """
+        Initialize tiled recognizer.
+        
+        Args:
+            engine: OCR engine providing extract_text() and extract_words()
+            max_pixels: Images with more pixels than this at
+                REFERENCE_DPI are tiled
+            tile_size: Tile edge length in pixels
+            overlap: Overlap between neighbouring tiles in pixels, should
+                exceed the width of the widest expected word
+            max_workers: Number of tiles recognized in parallel, defaults
+                to the CPU count for engines that are safe to call from
+                several threads and 1 otherwise
+            memory_governor: MemoryGovernor that lowers the number of
+                parallel tiles when memory runs short
+        """
+        if overlap >= tile_size:
+            raise ValueError("Tile overlap must be smaller than tile size")
+        
+        self.engine = engine
+        self.max_pixels = max_pixels
+        self.tile_size = tile_size
+        self.overlap = overlap
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 1) if getattr(engine, 'PARALLEL_SAFE', False) else 1
+        self.max_workers = max_workers
+        self.memory_governor = memory_governor
+    
+    def should_tile(self, image: ImageLike) -> bool:
+        """
+        Check whether an image is large enough to be tiled.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+        
+        Returns:
+            True if the image exceeds the pixel threshold for its resolution
+        """
+        array = as_array(image)
+        limit = self.max_pixels
+        # Pages without a resolution, or with a low one from unreliable
+        # metadata, keep the plain pixel limit
+        dpi = getattr(image, 'dpi', None)
+        if dpi and dpi > self.REFERENCE_DPI:
+            limit *= (dpi / self.REFERENCE_DPI) ** 2
+        return array.shape[0] * array.shape[1] > limit
+    
+    @staticmethod
+    def split_tiles(width: int, height: int, tile_size: int, overlap: int) -> List[Tile]:
+        """
+        Compute overlapping tile rectangles covering an image.
+        
+        Args:
+            width: Image width
+            height: Image height
+            tile_size: Tile edge length
+            overlap: Overlap between neighbouring tiles
+        
+        Returns:
+            List of tiles as (x0, y0, x1, y1)
+        """
+        def starts(length: int) -> List[int]:
+            if length <= tile_size:
+                return [0]
+            step = tile_size - overlap
+            positions = list(range(0, length - tile_size, step))
+            positions.append(length - tile_size)
+            return positions
+        
+        return [
+            (x, y, min(x + tile_size, width), min(y + tile_size, height))
+            for y in starts(height)
+            for x in starts(width)
+        ]
+    
+    @staticmethod
+    def core_region(tile: Tile, tiles: List[Tile]) -> Tile:
+        """
+        Get the part of a tile that owns the words recognized in it.
+        
+        On each edge shared with a neighbouring tile the core stops in the
+        middle of the overlap, so every point of the page belongs to
+        exactly one core.
+        
+        Args:
+            tile: Tile as (x0, y0, x1, y1)
+            tiles: All tiles of the image
+        
+        Returns:
+            Core region as (x0, y0, x1, y1)
+        """
+        x0, y0, x1, y1 = tile
+        core = [float(x0), float(y0), float(x1), float(y1)]
+        for ox0, oy0, ox1, oy1 in tiles:
+            same_row = oy0 < y1 and oy1 > y0
+            same_col = ox0 < x1 and ox1 > x0
+            if same_row and x0 < ox0 < x1:
+                core[2] = min(core[2], (ox0 + x1) / 2)
+            if same_row and x0 < ox1 < x1:
+                core[0] = max(core[0], (x0 + ox1) / 2)
+            if same_col and y0 < oy0 < y1:
+                core[3] = min(core[3], (oy0 + y1) / 2)
+            if same_col and y0 < oy1 < y1:
+                core[1] = max(core[1], (y0 + oy1) / 2)
+        return tuple(core)
+    
+    @staticmethod
+    def merge_tile_words(tiles: List[Tile], tile_words: List[List[OCRWord]]) -> List[OCRWord]:
+        """
+        Merge per-tile words (in page coordinates) into one list.
+        
+        A word is kept only by the tile whose core contains its center,
+        which drops words cut off at a tile edge in favour of the complete
+        copy in the neighbouring tile. Remaining near-identical boxes from
+        different tiles are collapsed, keeping the most confident one.
+        
+        Args:
+            tiles: Tiles as (x0, y0, x1, y1)
+            tile_words: Words recognized in each tile, in page coordinates
+        
+        Returns:
+            Merged words
+        """
+        kept = []
+        for tile, words in zip(tiles, tile_words):
+            cx0, cy0, cx1, cy1 = TiledRecognizer.core_region(tile, tiles)
+            for word in words:
+                x, y = word.center
+                if cx0 <= x < cx1 and cy0 <= y < cy1:
+                    kept.append(word)
+        
+        # Boxes are bucketed by grid cell, so each word is only compared
+        # with the kept words it can overlap
+        cell = TiledRecognizer.MERGE_CELL
+        grid = {}
+        merged = []
+        for word in sorted(kept, key=lambda w: -w.confidence):
+            x0, y0, x1, y1 = word.bbox
+            cells = [
+                (cx, cy)
+                for cx in range(int(x0 // cell), int(x1 // cell) + 1)
+                for cy in range(int(y0 // cell), int(y1 // cell) + 1)
+            ]
+            if any(
+                box_iou(word.bbox, other.bbox) >= 0.5
+                for key in cells for other in grid.get(key, ())
+            ):
+                continue
+            merged.append(word)
+            for key in cells:
+                grid.setdefault(key, []).append(word)
+        return merged
+    
+    def _recognize_tile(self, array: np.ndarray, tile: Tile, language: str, preprocess: bool, preprocess_kwargs: dict) -> List[OCRWord]:
+        """Recognize one tile, returning words in page coordinates."""
+        x0, y0, x1, y1 = tile
+        crop = np.ascontiguousarray(array[y0:y1, x0:x1])
+        # The engine preprocesses the tile as it would a whole page (EasyOCR
+        # and PaddleOCR not at all); rotating a single tile would misalign
+        # its boxes with the page
+        options = dict(preprocess_kwargs, deskew=False)
+        words = self.engine.extract_words(crop, language, preprocess=preprocess, **options)
+        return [word.translate(x0, y0) for word in words]
+    
+    def extract_words(
+        self,
+        image: ImageLike,
+        language: str = 'Both',
+        preprocess: bool = True,
+        **preprocess_kwargs
+    ) -> List[OCRWord]:
+        """
+        Extract words from image, tiling it if it is oversized.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess the image
+            **preprocess_kwargs: Additional preprocessing options
+        
+        Returns:
+            List of OCRWord objects in page coordinates
+        """
+        if not self.should_tile(image):
+            return self.engine.extract_words(image, language, preprocess=preprocess, **preprocess_kwargs)
+        
+        array = as_array(image)
+        tiles = self.split_tiles(array.shape[1], array.shape[0], self.tile_size, self.overlap)
+        
+        def run(tile):
+            return self._recognize_tile(array, tile, language, preprocess, preprocess_kwargs)
+        
+        workers = self.max_workers
+        if self.memory_governor is not None:
+            # Every tile in flight holds its own preprocessed copy
+            workers = self.memory_governor.workers(workers)
+        
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(tiles))) as pool:
+                tile_words = list(pool.map(run, tiles))
+        else:
+            tile_words = [run(tile) for tile in tiles]
+        
+        return self.merge_tile_words(tiles, tile_words)
+    
+    def extract_text(
+        self,
+        image: ImageLike,
+        language: str = 'Both',
+        preprocess: bool = True,
+        **preprocess_kwargs
+    ) -> str:
+        """
+        Extract text from image, tiling it if it is oversized.
+        
+        Args:
+            image: Page, numpy array or PIL Image
+            language: Language for OCR ('Arabic', 'French', or 'Both')
+            preprocess: Whether to preprocess the image
+            **preprocess_kwargs: Additional preprocessing options
+        
+        Returns:
+            Extracted text as string
+        """
+        if not self.should_tile(image):
+            return self.engine.extract_text(image, language, preprocess=preprocess, **preprocess_kwargs)
+        return words_to_text(self.extract_words(image, language, preprocess, **preprocess_kwargs))
@@ -1,18 +1,57 @@
 """Export utilities for saving OCR results."""
 
+import json
 import os
-from typing import Optional
-from docx import Document
-from PyQt5.QtWidgets import QApplication
+from typing import Iterable, Iterator, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from .docx_writer import DocxStreamWriter
+from .pdf_writer import SearchablePdfWriter
+from .script import is_rtl_text
 
 
 class ExportHandler:
     """
     Handler for exporting OCR results to various formats.
     
-    Supports text files, Word documents, and clipboard.
+    Supports text files, Word documents, JSON Lines, hOCR, ALTO,
+    searchable PDF and clipboard. The stream_* methods consume page
+    results one at a time, so export time is linear and memory use
+    constant in the size of the batch. Layout formats are built from the
+    word boxes of the original recognition pass, no second OCR run is needed.
     """
     
+    SEPARATOR = '=' * 50
+    
+    # Formats that place words by their boxes over the page
+    LAYOUT_FORMATS = ('hocr', 'html', 'alto', 'xml', 'pdf')
+    
+    HOCR_HEADER = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" '
+        '"http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xml:lang="ar" lang="ar">\n'
+        '<head>\n'
+        '<title></title>\n'
+        '<meta http-equiv="Content-Type" content="text/html;charset=utf-8"/>\n'
+        '<meta name="ocr-system" content="arabic-french-ocr-tool"/>\n'
+        '<meta name="ocr-capabilities" content="ocr_page ocr_line ocrx_word"/>\n'
+        '</head>\n'
+        '<body>\n'
+    )
+    
+    ALTO_HEADER = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<alto xmlns="http://www.loc.gov/standards/alto/ns-v4#" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+        'xsi:schemaLocation="http://www.loc.gov/standards/alto/ns-v4# '
+        'http://www.loc.gov/alto/v4/alto-4-2.xsd">\n'
+        '<Description>\n'
+        '<MeasurementUnit>pixel</MeasurementUnit>\n'
+        '</Description>\n'
+        '<Layout>\n'
+    )
+    
     @staticmethod
     def export_to_txt(text: str, file_path: str) -> bool:
         """
@@ -46,13 +85,127 @@ class ExportHandler:
             True if successful
         """
         try:
-            doc = Document()
+            with DocxStreamWriter(file_path) as writer:
+                for line in text.split('\n'):
+                    writer.add_paragraph(line)
+            return True
+        except Exception as e:
+            print(f"Failed to export to DOCX: {str(e)}")
+            return False
+    
+    @staticmethod
+    def _iter_blocks(results: Iterable) -> Iterator[Tuple[str, str]]:
+        """
+        Lay out page results as a sequence of blocks.
+        
+        Yields ('file', name) when a new source file starts, ('page', label)
+        before each page of a multi-page file and ('text', text) for the
+        page content. Failed pages are skipped.
+        """
+        previous_source = None
+        for result in results:
+            if not result.ok:
+                continue
+            if result.source != previous_source:
+                yield 'file', os.path.basename(result.source)
+                previous_source = result.source
+            if result.page_count > 1:
+                yield 'page', f"--- Page {result.page_index + 1} ---"
+            yield 'text', result.text
+    
+    @staticmethod
+    def stream_to_txt(results: Iterable, file_path: str) -> bool:
+        """
+        Stream page results to a .txt file.
+        
+        Args:
+            results: Iterable of PageResult objects
+            file_path: Output file path
             
-            # Add text with proper paragraph handling
-            for line in text.split('\n'):
-                doc.add_paragraph(line)
+        Returns:
+            True if successful
+        """
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                in_file = False
+                wrote_page = False
+                after_label = False
+                for kind, value in ExportHandler._iter_blocks(results):
+                    if kind == 'file':
+                        if in_file:
+                            f.write('\n\n')
+                        f.write(f"{ExportHandler.SEPARATOR}\n{value}\n{ExportHandler.SEPARATOR}\n\n")
+                        in_file = True
+                        wrote_page = False
+                    elif kind == 'page':
+                        if wrote_page:
+                            f.write('\n\n')
+                        f.write(f"{value}\n")
+                        wrote_page = True
+                    else:
+                        if wrote_page and not after_label:
+                            f.write('\n\n')
+                        f.write(value)
+                        wrote_page = True
+                    after_label = kind == 'page'
+            return True
+        except Exception as e:
+            print(f"Failed to export to TXT: {str(e)}")
+            return False
+    
+    @staticmethod
+    def stream_to_jsonl(results: Iterable, file_path: str) -> bool:
+        """
+        Stream page results to a JSON Lines file, one page per line.
+        
+        Failed pages are kept with their error message.
+        
+        Args:
+            results: Iterable of PageResult objects
+            file_path: Output file path
             
-            doc.save(file_path)
+        Returns:
+            True if successful
+        """
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                for result in results:
+                    f.write(json.dumps(result.to_dict(), ensure_ascii=False))
+                    f.write('\n')
+            return True
+        except Exception as e:
+            print(f"Failed to export to JSONL: {str(e)}")
+            return False
+    
+    @staticmethod
+    def stream_to_docx(results: Iterable, file_path: str) -> bool:
+        """
+        Stream page results to a .docx file.
+        
+        Each source file starts on a new page with its name as a bold
+        heading, and every text line becomes a paragraph.
+        
+        Args:
+            results: Iterable of PageResult objects
+            file_path: Output file path
+            
+        Returns:
+            True if successful
+        """
+        try:
+            with DocxStreamWriter(file_path) as writer:
+                first = True
+                for kind, value in ExportHandler._iter_blocks(results):
+                    if kind == 'file':
+                        if not first:
+                            writer.add_page_break()
+                        writer.add_paragraph(value, bold=True, rtl=False)
+                    elif kind == 'page':
+                        writer.add_paragraph(value, bold=True, rtl=False)
+                    else:
+                        for line in value.split('\n'):
+                            writer.add_paragraph(line)
+                    first = False
             return True
         except Exception as e:
             print(f"Failed to export to DOCX: {str(e)}")
@@ -70,6 +223,8 @@ class ExportHandler:
             True if successful
         """
         try:
+            # Imported here so headless batch exports don't need Qt
+            from PyQt5.QtWidgets import QApplication
             clipboard = QApplication.clipboard()
             clipboard.setText(text)
             return True
@@ -101,3 +256,204 @@ class ExportHandler:
         else:
             print(f"Unsupported export format: {format_type}")
             return False
+    
+    @staticmethod
+    def _bbox(bbox) -> str:
+        """Format a box as integer 'x0 y0 x1 y1'."""
+        return ' '.join(str(int(round(v))) for v in bbox)
+    
+    @staticmethod
+    def _line_bbox(line) -> Tuple[float, float, float, float]:
+        """Get the box enclosing a line of words."""
+        return (
+            min(word.bbox[0] for word in line),
+            min(word.bbox[1] for word in line),
+            max(word.bbox[2] for word in line),
+            max(word.bbox[3] for word in line)
+        )
+    
+    @staticmethod
+    def stream_to_hocr(results: Iterable, file_path: str) -> bool:
+        """
+        Stream page results to an hOCR (XHTML) file.
+        
+        Args:
+            results: Iterable of PageResult objects with word boxes
+            file_path: Output file path
+            
+        Returns:
+            True if successful
+        """
+        from src.ocr.results import group_lines
+        
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(ExportHandler.HOCR_HEADER)
+                page_no = 0
+                for result in results:
+                    if not result.ok:
+                        continue
+                    page_no += 1
+                    image_name = f"{os.path.basename(result.source)}[{result.page_index}]"
+                    title = f'image "{image_name}"; bbox 0 0 {result.width} {result.height}; ppageno {page_no - 1}'
+                    f.write(f'<div class="ocr_page" id="page_{page_no}" title={quoteattr(title)}>\n')
+                    for line_no, line in enumerate(group_lines(result.words), 1):
+                        line_id = f"line_{page_no}_{line_no}"
+                        line_text = ' '.join(word.text for word in line)
+                        direction = ' dir="rtl"' if is_rtl_text(line_text) else ''
+                        f.write(
+                            f'<span class="ocr_line" id="{line_id}" '
+                            f'title="bbox {ExportHandler._bbox(ExportHandler._line_bbox(line))}"{direction}>'
+                        )
+                        for word_no, word in enumerate(line, 1):
+                            word_title = f"bbox {ExportHandler._bbox(word.bbox)}; x_wconf {int(round(word.confidence * 100))}"
+                            f.write(
+                                f'<span class="ocrx_word" id="word_{page_no}_{line_no}_{word_no}" '
+                                f'title="{word_title}">{escape(word.text)}</span> '
+                            )
+                        f.write('</span>\n')
+                    f.write('</div>\n')
+                f.write('</body>\n</html>\n')
+            return True
+        except Exception as e:
+            print(f"Failed to export to hOCR: {str(e)}")
+            return False
+    
+    @staticmethod
+    def stream_to_alto(results: Iterable, file_path: str) -> bool:
+        """
+        Stream page results to an ALTO v4 XML file.
+        
+        Args:
+            results: Iterable of PageResult objects with word boxes
+            file_path: Output file path
+            
+        Returns:
+            True if successful
+        """
+        from src.ocr.results import group_lines
+        
+        def geometry(bbox) -> str:
+            x0, y0, x1, y1 = (int(round(v)) for v in bbox)
+            return f'HPOS="{x0}" VPOS="{y0}" WIDTH="{x1 - x0}" HEIGHT="{y1 - y0}"'
+        
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(ExportHandler.ALTO_HEADER)
+                page_no = 0
+                for result in results:
+                    if not result.ok:
+                        continue
+                    page_no += 1
+                    full_page = (0, 0, result.width, result.height)
+                    f.write(
+                        f'<Page ID="page_{page_no}" PHYSICAL_IMG_NR="{page_no}" '
+                        f'WIDTH="{result.width}" HEIGHT="{result.height}">\n'
+                        f'<PrintSpace {geometry(full_page)}>\n'
+                    )
+                    lines = group_lines(result.words)
+                    if lines:
+                        block_bbox = ExportHandler._line_bbox([word for line in lines for word in line])
+                        f.write(f'<TextBlock ID="block_{page_no}" {geometry(block_bbox)}>\n')
+                        for line_no, line in enumerate(lines, 1):
+                            f.write(
+                                f'<TextLine ID="line_{page_no}_{line_no}" '
+                                f'{geometry(ExportHandler._line_bbox(line))}>'
+                            )
+                            for word_no, word in enumerate(line, 1):
+                                if word_no > 1:
+                                    f.write('<SP/>')
+                                f.write(
+                                    f'<String ID="string_{page_no}_{line_no}_{word_no}" '
+                                    f'CONTENT={quoteattr(word.text)} {geometry(word.bbox)} '
+                                    f'WC="{word.confidence:.2f}"/>'
+                                )
+                            f.write('</TextLine>\n')
+                        f.write('</TextBlock>\n')
+                    f.write('</PrintSpace>\n</Page>\n')
+                f.write('</Layout>\n</alto>\n')
+            return True
+        except Exception as e:
+            print(f"Failed to export to ALTO: {str(e)}")
+            return False
+    
+    @staticmethod
+    def stream_to_pdf(results: Iterable, file_path: str) -> bool:
+        """
+        Stream page results to a searchable (sandwich) PDF.
+        
+        Each page shows the original page image with the recognized words
+        as an invisible, selectable text layer. Results must carry their
+        page image (see OCRPipeline keep_images).
+        
+        Args:
+            results: Iterable of PageResult objects with images and word boxes
+            file_path: Output file path
+            
+        Returns:
+            True if successful
+        """
+        try:
+            with SearchablePdfWriter(file_path) as writer:
+                for result in results:
+                    if not result.ok:
+                        continue
+                    if result.image is None:
+                        raise ValueError(f"No page image for {os.path.basename(result.source)} page {result.page_index + 1}")
+                    writer.add_page(result.image, result.words, dpi=result.dpi, size=(result.width, result.height))
+                    # Release the pixels as soon as the page is written
+                    result.image = None
+            return True
+        except Exception as e:
+            print(f"Failed to export to PDF: {str(e)}")
+            return False
+    
+    @staticmethod
+    def stream_export(results: Iterable, file_path: str, format_type: Optional[str] = None) -> bool:
+        """
+        Stream page results to file with automatic format detection.
+        
+        Args:
+            results: Iterable of PageResult objects
+            file_path: Output file path
+            format_type: Format type ('txt', 'jsonl', 'docx', 'hocr', 'alto'
+                or 'pdf'), auto-detected if None
+            
+        Returns:
+            True if successful
+        """
+        if format_type is None:
+            format_type = ExportHandler.detect_format(file_path)
+        
+        if format_type == 'txt':
+            return ExportHandler.stream_to_txt(results, file_path)
+        elif format_type in ('hocr', 'html'):
+            return ExportHandler.stream_to_hocr(results, file_path)
+        elif format_type in ('alto', 'xml'):
+            return ExportHandler.stream_to_alto(results, file_path)
+        elif format_type == 'pdf':
+            return ExportHandler.stream_to_pdf(results, file_path)
+        elif format_type in ('jsonl', 'json'):
+            return ExportHandler.stream_to_jsonl(results, file_path)
+        elif format_type in ('docx', 'doc'):
+            return ExportHandler.stream_to_docx(results, file_path)
+        else:
+            print(f"Unsupported export format: {format_type}")
+            return False
+    
+    @staticmethod
+    def detect_format(file_path: str) -> str:
+        """
+        Detect export format from a file name.
+        
+        Args:
+            file_path: Output file path
+            
+        Returns:
+            Format type, e.g. 'txt', 'docx', 'hocr', 'alto' or 'pdf'
+        """
+        name = file_path.lower()
+        if name.endswith('.alto.xml'):
+            return 'alto'
+        _, ext = os.path.splitext(name)
+        return ext.lstrip('.')
@@ -1,11 +1,16 @@
 """File handling utilities for OCR application."""
 
+import hashlib
 import os
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Sequence, Tuple
 from PIL import Image
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 import tempfile
 
+from .page import Page
+from .pdf_raster import PdfRasterizer, default_threads
+from .phash import dhash
+
 
 class FileHandler:
     """
@@ -15,6 +20,7 @@ class FileHandler:
     """
     
     SUPPORTED_IMAGE_FORMATS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
+    MULTI_FRAME_FORMATS = {'.tiff', '.tif'}
     SUPPORTED_FORMATS = SUPPORTED_IMAGE_FORMATS | {'.pdf'}
     
     @staticmethod
@@ -59,11 +65,62 @@ class FileHandler:
         _, ext = os.path.splitext(file_path.lower())
         return ext == '.pdf'
     
+    @staticmethod
+    def is_multi_frame_file(file_path: str) -> bool:
+        """
+        Check if file format can hold several pages (multi-page TIFF).
+        
+        Args:
+            file_path: Path to file
+            
+        Returns:
+            True if file may contain several frames
+        """
+        _, ext = os.path.splitext(file_path.lower())
+        return ext in FileHandler.MULTI_FRAME_FORMATS
+    
+    @staticmethod
+    def count_pages(file_path: str) -> int:
+        """
+        Count pages without decoding any pixel data.
+        
+        PDFs are counted from their metadata and TIFFs by walking the
+        frame directory, so this is cheap even for very large files.
+        
+        Args:
+            file_path: Path to file
+            
+        Returns:
+            Number of pages
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If file format is not supported or can't be read
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        try:
+            if FileHandler.is_pdf_file(file_path):
+                return int(pdfinfo_from_path(file_path)['Pages'])
+            if FileHandler.is_multi_frame_file(file_path):
+                with Image.open(file_path) as image:
+                    return getattr(image, 'n_frames', 1)
+        except Exception as e:
+            raise ValueError(f"Failed to read page count: {str(e)}")
+        
+        if FileHandler.is_image_file(file_path):
+            return 1
+        raise ValueError(f"Unsupported file format: {file_path}")
+    
     @staticmethod
     def load_image(file_path: str) -> Image.Image:
         """
         Load image from file.
         
+        For multi-page TIFFs only the first frame is returned, use
+        iter_pages() to get every frame.
+        
         Args:
             file_path: Path to image file
             
@@ -112,7 +169,7 @@ class FileHandler:
             raise ValueError(f"Not a PDF file: {file_path}")
         
         try:
-            images = convert_from_path(file_path, dpi=dpi)
+            images = convert_from_path(file_path, dpi=dpi, thread_count=default_threads())
             return images
         except Exception as e:
             raise ValueError(f"Failed to load PDF: {str(e)}")
@@ -131,11 +188,171 @@ class FileHandler:
         """
         if FileHandler.is_pdf_file(file_path):
             return FileHandler.load_pdf(file_path, dpi)
+        elif FileHandler.is_multi_frame_file(file_path):
+            return [page.to_pil() for page in FileHandler.iter_pages(file_path, dpi)]
         elif FileHandler.is_image_file(file_path):
             return [FileHandler.load_image(file_path)]
         else:
             raise ValueError(f"Unsupported file format: {file_path}")
     
+    @staticmethod
+    def iter_tiff_frames(file_path: str, pages: Optional[Sequence[int]] = None) -> Iterator[Page]:
+        """
+        Lazily iterate over the frames of a (multi-page) TIFF.
+        
+        Frames are decoded one at a time on demand, so only the current
+        frame is held in memory.
+        
+        Args:
+            file_path: Path to TIFF file
+            pages: Zero-based frame indices to decode (None for all)
+            
+        Yields:
+            Page objects, one per frame
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If a frame can't be decoded
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        try:
+            image = Image.open(file_path)
+        except Exception as e:
+            raise ValueError(f"Failed to load image: {str(e)}")
+        
+        with image:
+            frames = range(getattr(image, 'n_frames', 1))
+            if pages is not None:
+                frames = [frame for frame in sorted(pages) if frame < len(frames)]
+            for frame in frames:
+                # Yielded without a local, so the suspended generator does
+                # not hold the frame while the consumer waits for memory
+                yield FileHandler._decode_frame(image, frame, file_path)
+    
+    @staticmethod
+    def _decode_frame(image: Image.Image, frame: int, file_path: str) -> Page:
+        """Decode one frame of an open multi-frame image."""
+        try:
+            image.seek(frame)
+            return Page.from_pil(image, page_index=frame, source=file_path)
+        except Exception as e:
+            raise ValueError(f"Failed to load frame {frame + 1}: {str(e)}")
+    
+    @staticmethod
+    def iter_pdf_pages(
+        file_path: str,
+        dpi: int = 300,
+        pages: Optional[Sequence[int]] = None,
+        grayscale: bool = False
+    ) -> Iterator[Page]:
+        """
+        Rasterize a PDF ahead of the consumer, yielding one page at a time.
+        
+        Pages are rendered by several pdftoppm processes into a temporary
+        directory and mapped back from there (see PdfRasterizer), so only
+        the pages being worked on are held in memory.
+        
+        Args:
+            file_path: Path to PDF file
+            dpi: DPI for conversion
+            pages: Zero-based page indices to rasterize (None for all)
+            grayscale: Render single-channel pages
+            
+        Yields:
+            Page objects, one per PDF page
+            
+        Raises:
+            ValueError: If conversion fails
+        """
+        rasterizer = PdfRasterizer(grayscale=grayscale)
+        yield from rasterizer.iter_pages(file_path, FileHandler.count_pages(file_path), dpi, pages)
+    
+    @staticmethod
+    def iter_pages(
+        file_path: str,
+        dpi: int = 300,
+        pages: Optional[Sequence[int]] = None,
+        grayscale_pdf: bool = False
+    ) -> Iterator[Page]:
+        """
+        Lazily iterate over the pages of any supported file.
+        
+        PDFs and multi-page TIFFs share this pipeline: pages are decoded
+        on demand and can be released as soon as they are processed. Each
+        page carries a perceptual fingerprint for duplicate detection.
+        
+        Args:
+            file_path: Path to file
+            dpi: DPI for PDF conversion
+            pages: Zero-based page indices to decode (None for all),
+                other pages are skipped without being decoded
+            grayscale_pdf: Render PDF pages in grayscale
+            
+        Yields:
+            Page objects
+        """
+        if FileHandler.is_pdf_file(file_path):
+            decoded = FileHandler.iter_pdf_pages(file_path, dpi, pages, grayscale_pdf)
+        elif FileHandler.is_multi_frame_file(file_path):
+            decoded = FileHandler.iter_tiff_frames(file_path, pages)
+        elif FileHandler.is_image_file(file_path):
+            if pages is not None and 0 not in pages:
+                return
+            decoded = iter([Page.from_pil(FileHandler.load_image(file_path), source=file_path)])
+        else:
+            raise ValueError(f"Unsupported file format: {file_path}")
+        
+        # map() keeps no reference to the page last yielded
+        yield from map(FileHandler._fingerprint, decoded)
+    
+    @staticmethod
+    def _fingerprint(page: Page) -> Page:
+        """Attach the perceptual hash used for deduplication."""
+        page.fingerprint = dhash(page.array)
+        return page
+    
+    @staticmethod
+    def load_pages(file_path: str, dpi: int = 300) -> List[Page]:
+        """
+        Load file (image or PDF) as page buffers for the OCR pipeline.
+        
+        Each page is converted to a contiguous numpy array exactly once;
+        preprocessing and recognition then work on that buffer directly.
+        
+        Args:
+            file_path: Path to file
+            dpi: DPI for PDF conversion
+            
+        Returns:
+            List of Page objects
+        """
+        if FileHandler.is_pdf_file(file_path):
+            return [
+                Page.from_pil(image, dpi=dpi, page_index=idx, source=file_path)
+                for idx, image in enumerate(FileHandler.load_pdf(file_path, dpi))
+            ]
+        return list(FileHandler.iter_pages(file_path, dpi))
+    
+    @staticmethod
+    def file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+        """
+        Compute the SHA-256 hash of a file's content.
+        
+        Args:
+            file_path: Path to file
+            chunk_size: Read size in bytes
+            
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
     @staticmethod
     def validate_files(file_paths: List[str]) -> Tuple[List[str], List[str]]:
         """
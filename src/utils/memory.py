@@ -0,0 +1,367 @@
+"""Process memory tracking and memory-based backpressure for the page pipeline."""
+
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+MB = 1024 * 1024
+
+
+def current_rss() -> Optional[int]:
+    """
+    Get the resident memory of the current process.
+    
+    Uses psutil when installed and /proc on Linux otherwise.
+    
+    Returns:
+        Resident set size in bytes, or None if it cannot be measured
+    """
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss() -> Optional[int]:
+    """
+    Get the peak resident memory of the current process.
+    
+    The peak covers the whole process lifetime unless it was cleared with
+    reset_peak_rss().
+    
+    Returns:
+        Peak resident set size in bytes, or None if it cannot be measured
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if PSUTIL_AVAILABLE:
+        peak = getattr(psutil.Process().memory_info(), 'peak_wset', None)  # Windows
+        if peak is not None:
+            return peak
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def reset_peak_rss() -> bool:
+    """
+    Clear the peak resident memory counter (Linux only).
+    
+    Returns:
+        True if the counter was reset
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def release_free_memory():
+    """Run the garbage collector and return freed heap memory to the OS."""
+    gc.collect()
+    if sys.platform.startswith('linux'):
+        try:
+            import ctypes
+            # glibc keeps freed page buffers in its arenas otherwise
+            ctypes.CDLL('libc.so.6').malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+
+
+class DocumentMemory:
+    """Memory statistics of one processed document."""
+    
+    def __init__(self, source: str):
+        """
+        Initialize statistics.
+        
+        Args:
+            source: Path of the document
+        """
+        self.source = source
+        self.start_rss = 0
+        self.peak_rss = 0
+        # Python allocations, only measured with allocation tracing
+        self.traced_peak = 0
+        self.top_allocations: List[Tuple[str, int]] = []
+    
+    def summary(self) -> str:
+        """
+        Describe the document's memory use.
+        
+        Returns:
+            Human-readable summary
+        """
+        text = (
+            f"{os.path.basename(self.source)}: peak {self.peak_rss / MB:.0f} MB "
+            f"(+{max(self.peak_rss - self.start_rss, 0) / MB:.0f} MB)"
+        )
+        if self.top_allocations:
+            sites = ", ".join(f"{site} {size / MB:.1f} MB" for site, size in self.top_allocations)
+            text += f", traced peak {self.traced_peak / MB:.0f} MB, largest allocation growth: {sites}"
+        return text
+
+
+class MemoryGovernor:
+    """
+    Tracks memory per document and applies backpressure near a budget.
+    
+    Before a page is rasterized the governor checks the resident memory
+    of the process. Above the high-water mark it frees what it can and
+    pauses the producer until memory drops back (e.g. once other threads
+    have released their pages), and it lowers the number of parallel
+    workers it hands out. After max_wait seconds it lets the page through
+    anyway and stops pausing until memory has dropped below the mark
+    again, so a budget that is simply too small does not stall the batch.
+    
+    Peak resident memory is recorded per document. With allocation
+    tracing enabled, tracemalloc additionally reports the traced peak and
+    the Python and NumPy allocation sites that grew most per document;
+    native buffers of Tesseract, torch or Paddle only show up in the
+    resident size.
+    """
+    
+    def __init__(
+        self,
+        budget_bytes: Optional[int] = None,
+        high_water: float = 0.85,
+        max_wait: float = 5.0,
+        poll_interval: float = 0.05,
+        trace_allocations: bool = False,
+        top_allocations: int = 5
+    ):
+        """
+        Initialize memory governor.
+        
+        Args:
+            budget_bytes: Resident memory the process should stay below
+                (None for tracking only)
+            high_water: Fraction of the budget above which backpressure starts
+            max_wait: Longest pause before a page is let through anyway
+            poll_interval: Seconds between memory checks while paused
+            trace_allocations: Record allocation sites with tracemalloc
+                (slows Python code down noticeably)
+            top_allocations: Number of allocation sites reported per document
+        """
+        self.budget_bytes = budget_bytes
+        self.high_water = high_water
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.trace_allocations = trace_allocations
+        self.top_allocations = top_allocations
+        
+        self.documents: Dict[str, DocumentMemory] = {}
+        self.pauses = 0
+        self.paused_seconds = 0.0
+        self.overruns = 0
+        
+        self._current: Optional[DocumentMemory] = None
+        self._snapshot = None
+        self._peak_reset = False
+        # Set after a pause timed out, waiting again would not free anything
+        self._over_budget = False
+        self._lock = threading.Lock()
+    
+    def _sample(self) -> Optional[int]:
+        """Measure resident memory and update the current document's peak."""
+        rss = current_rss()
+        document = self._current
+        if rss is not None and document is not None:
+            document.peak_rss = max(document.peak_rss, rss)
+        return rss
+    
+    def pressure(self) -> float:
+        """
+        Get memory use relative to the budget.
+        
+        Returns:
+            Resident memory divided by the budget (0 without a budget)
+        """
+        rss = self._sample()
+        if not self.budget_bytes or rss is None:
+            return 0.0
+        return rss / self.budget_bytes
+    
+    def wait_for_room(self):
+        """Block until memory is below the high-water mark, or max_wait has passed."""
+        if self.pressure() < self.high_water:
+            self._over_budget = False
+            return
+        
+        release_free_memory()
+        if self.pressure() < self.high_water:
+            self._over_budget = False
+            return
+        if self._over_budget:
+            with self._lock:
+                self.overruns += 1
+            return
+        
+        with self._lock:
+            self.pauses += 1
+        start = time.perf_counter()
+        logger.info("Memory at %.0f%% of budget, pausing page loading", self.pressure() * 100)
+        while self.pressure() >= self.high_water:
+            if time.perf_counter() - start >= self.max_wait:
+                with self._lock:
+                    self.overruns += 1
+                self._over_budget = True
+                logger.warning(
+                    "Memory still at %.0f%% of budget after %.0f s, continuing",
+                    self.pressure() * 100, self.max_wait
+                )
+                break
+            time.sleep(self.poll_interval)
+        with self._lock:
+            self.paused_seconds += time.perf_counter() - start
+    
+    def throttle(self, items: Iterable[T]) -> Iterator[T]:
+        """
+        Pass items through, waiting for memory before each one is produced.
+        
+        Wrapping a lazy page iterator delays the rasterization of the next
+        page, not just its processing.
+        
+        Args:
+            items: Lazy iterator, e.g. of pages
+        
+        Yields:
+            The same items
+        """
+        iterator = iter(items)
+        while True:
+            self.wait_for_room()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            yield item
+            # Drop the reference before waiting, or the previous item stays
+            # alive while memory is awaited for the next one
+            item = None
+    
+    def workers(self, requested: int) -> int:
+        """
+        Get the number of parallel workers to use under the current memory pressure.
+        
+        Parallelism is reduced linearly from half the budget to the
+        high-water mark, where a single worker remains.
+        
+        Args:
+            requested: Workers wanted without memory pressure
+        
+        Returns:
+            Number of workers, at least 1
+        """
+        pressure = self.pressure()
+        if requested <= 1 or pressure <= 0.5:
+            return max(requested, 1)
+        if pressure >= self.high_water:
+            return 1
+        share = (self.high_water - pressure) / (self.high_water - 0.5)
+        return max(1, int(requested * share))
+    
+    def start_document(self, source: str):
+        """
+        Start recording memory for a document.
+        
+        Args:
+            source: Path of the document
+        """
+        document = DocumentMemory(source)
+        document.start_rss = current_rss() or 0
+        document.peak_rss = document.start_rss
+        self._current = document
+        self.documents[source] = document
+        self._peak_reset = reset_peak_rss()
+        
+        if self.trace_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._snapshot = tracemalloc.take_snapshot()
+    
+    def end_document(self) -> Optional[DocumentMemory]:
+        """
+        Finish recording the current document.
+        
+        Returns:
+            The document's statistics, or None if no document was started
+        """
+        document = self._current
+        if document is None:
+            return None
+        self._sample()
+        if self._peak_reset:
+            # The kernel's counter also sees peaks between two samples
+            document.peak_rss = max(document.peak_rss, peak_rss() or 0)
+        
+        if self.trace_allocations and self._snapshot is not None:
+            document.traced_peak = tracemalloc.get_traced_memory()[1]
+            # Leave out the tracing machinery itself
+            ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+            stats = tracemalloc.take_snapshot().filter_traces(ignore).compare_to(
+                self._snapshot.filter_traces(ignore), 'lineno'
+            )
+            document.top_allocations = [
+                (f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", stat.size_diff)
+                for stat in sorted(stats, key=lambda s: -s.size_diff)[:self.top_allocations]
+                if stat.size_diff > 0
+            ]
+            self._snapshot = None
+        
+        self._current = None
+        return document
+    
+    def stop(self):
+        """Stop allocation tracing."""
+        if self.trace_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+    
+    def report(self) -> str:
+        """
+        Summarize memory use and backpressure for the run.
+        
+        Returns:
+            Human-readable summary
+        """
+        if not self.documents:
+            return "no documents"
+        largest = max(self.documents.values(), key=lambda d: d.peak_rss)
+        text = f"peak {largest.peak_rss / MB:.0f} MB ({os.path.basename(largest.source)})"
+        if self.budget_bytes:
+            text += f" of {self.budget_bytes / MB:.0f} MB budget"
+        if self.pauses:
+            text += f", paused {self.pauses} time(s) for {self.paused_seconds:.1f} s"
+        if self.overruns:
+            text += f", {self.overruns} page(s) loaded over budget"
+        return text
@@ -0,0 +1,132 @@
+"""Page buffer shared by the loader, preprocessor and OCR engines."""
+
+from typing import Optional, Tuple, Union
+import numpy as np
+from PIL import Image
+
+
+class Page:
+    """
+    A single document page held as a contiguous uint8 numpy array.
+    
+    Pages are produced once by FileHandler and passed by reference through
+    preprocessing and recognition, so no stage needs to convert between
+    PIL and numpy or copy the pixels again.
+    """
+    
+    def __init__(
+        self,
+        array: np.ndarray,
+        dpi: Optional[int] = None,
+        page_index: int = 0,
+        source: Optional[str] = None
+    ):
+        """
+        Initialize page.
+        
+        Args:
+            array: Pixel data, HxW (grayscale) or HxWx3 (RGB)
+            dpi: Resolution of the page, if known
+            page_index: Zero-based index of the page in its source file
+            source: Path of the file the page was loaded from
+        
+        Raises:
+            ValueError: If the array shape is not grayscale or RGB
+        """
+        if array.ndim not in (2, 3) or (array.ndim == 3 and array.shape[2] != 3):
+            raise ValueError(f"Unsupported page shape: {array.shape}")
+        
+        # No-op when the array is already contiguous uint8
+        self.array = np.ascontiguousarray(array, dtype=np.uint8)
+        self.dpi = dpi
+        self.page_index = page_index
+        self.source = source
+        # Perceptual hash, filled in by FileHandler for duplicate detection
+        self.fingerprint: Optional[int] = None
+    
+    @property
+    def mode(self) -> str:
+        """Color mode of the page ('L' or 'RGB')."""
+        return 'L' if self.array.ndim == 2 else 'RGB'
+    
+    @property
+    def width(self) -> int:
+        """Page width in pixels."""
+        return self.array.shape[1]
+    
+    @property
+    def height(self) -> int:
+        """Page height in pixels."""
+        return self.array.shape[0]
+    
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Page size as (width, height), like PIL."""
+        return self.width, self.height
+    
+    @property
+    def nbytes(self) -> int:
+        """Size of the pixel buffer in bytes."""
+        return self.array.nbytes
+    
+    @classmethod
+    def from_pil(
+        cls,
+        image: Image.Image,
+        dpi: Optional[int] = None,
+        page_index: int = 0,
+        source: Optional[str] = None
+    ) -> 'Page':
+        """
+        Create a page from a PIL image.
+        
+        Bilevel and grayscale images stay single-channel, everything else
+        is converted to RGB.
+        
+        Args:
+            image: PIL Image object
+            dpi: Resolution override, read from the image if None
+            page_index: Zero-based index of the page in its source file
+            source: Path of the file the page was loaded from
+        
+        Returns:
+            Page object
+        """
+        if image.mode == '1':
+            image = image.convert('L')
+        elif image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        
+        if dpi is None and 'dpi' in image.info:
+            dpi = int(round(image.info['dpi'][0]))
+        
+        return cls(np.asarray(image), dpi=dpi, page_index=page_index, source=source)
+    
+    def to_pil(self) -> Image.Image:
+        """
+        Convert page to a PIL image.
+        
+        Returns:
+            PIL Image object
+        """
+        return Image.fromarray(self.array)
+
+
+ImageLike = Union[Image.Image, np.ndarray, Page]
+
+
+def as_array(image: ImageLike) -> np.ndarray:
+    """
+    Get the pixel array of an image without copying when possible.
+    
+    Args:
+        image: Page, numpy array or PIL Image
+    
+    Returns:
+        Image as numpy array
+    """
+    if isinstance(image, Page):
+        return image.array
+    if isinstance(image, Image.Image):
+        return np.asarray(image)
+    return image
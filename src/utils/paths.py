@@ -0,0 +1,58 @@
+"""Application cache and data directory helpers."""
+
+import os
+import sys
+from typing import Optional
+
+
+APP_DIR_NAME = 'arabic-french-ocr'
+
+
+def _base_dir(env_var: str, windows_var: str, posix_default: str) -> str:
+    """Resolve a per-user base directory, honouring an override variable."""
+    override = os.environ.get(env_var)
+    if override:
+        return override
+    if sys.platform == 'win32':
+        root = os.environ.get(windows_var) or os.path.expanduser('~')
+        return os.path.join(root, APP_DIR_NAME)
+    return os.path.join(os.path.expanduser(posix_default), APP_DIR_NAME)
+
+
+def get_cache_dir(subdir: Optional[str] = None) -> str:
+    """
+    Get (and create) the per-user cache directory.
+    
+    Cached data can be deleted at any time and is regenerated on demand.
+    Override the location with the OCR_CACHE_DIR environment variable.
+    
+    Args:
+        subdir: Optional subdirectory inside the cache directory
+        
+    Returns:
+        Absolute path of the directory
+    """
+    path = _base_dir('OCR_CACHE_DIR', 'LOCALAPPDATA', os.environ.get('XDG_CACHE_HOME', '~/.cache'))
+    if subdir:
+        path = os.path.join(path, subdir)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_data_dir(subdir: Optional[str] = None) -> str:
+    """
+    Get (and create) the per-user data directory for persistent state.
+    
+    Override the location with the OCR_DATA_DIR environment variable.
+    
+    Args:
+        subdir: Optional subdirectory inside the data directory
+        
+    Returns:
+        Absolute path of the directory
+    """
+    path = _base_dir('OCR_DATA_DIR', 'APPDATA', os.environ.get('XDG_DATA_HOME', '~/.local/share'))
+    if subdir:
+        path = os.path.join(path, subdir)
+    os.makedirs(path, exist_ok=True)
+    return path
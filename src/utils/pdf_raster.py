@@ -0,0 +1,246 @@
+"""Parallel PDF rasterization spilling pages to disk."""
+
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pdf2image import convert_from_path
+
+from .page import Page
+
+
+# Pages rendered by each pdftoppm process per chunk; each process parses
+# the PDF again, so very small chunks waste time on large documents
+PAGES_PER_PROCESS = 4
+
+# Rendered pages are memory-mapped where a mapped file can still be
+# deleted; on Windows they are read into memory instead
+MEMMAP_PAGES = os.name != 'nt'
+
+
+def default_threads() -> int:
+    """
+    Get the number of pdftoppm processes per document.
+    
+    Returns:
+        OCR_PDF_THREADS if set, otherwise up to 4 depending on the CPU count
+    """
+    value = os.environ.get('OCR_PDF_THREADS', '').strip()
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            pass
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def read_pnm(path: str) -> np.ndarray:
+    """
+    Map a binary PGM (P5) or PPM (P6) file as a numpy array.
+    
+    Args:
+        path: Path to the file written by pdftoppm
+    
+    Returns:
+        HxW (PGM) or HxWx3 (PPM) uint8 array backed by the file
+    
+    Raises:
+        ValueError: If the file is not an 8-bit binary PGM/PPM
+    """
+    with open(path, 'rb') as f:
+        head = f.read(64)
+    
+    fields = []
+    offset = 0
+    while len(fields) < 4:
+        while offset < len(head) and head[offset:offset + 1].isspace():
+            offset += 1
+        end = offset
+        while end < len(head) and not head[end:end + 1].isspace():
+            end += 1
+        if end >= len(head):
+            raise ValueError(f"Invalid PNM header: {path}")
+        fields.append(head[offset:end])
+        offset = end
+    # A single whitespace character separates the header from the pixels
+    offset += 1
+    
+    magic, width, height, maxval = fields
+    if magic not in (b'P5', b'P6') or int(maxval) > 255:
+        raise ValueError(f"Unsupported PNM file (expected 8-bit P5/P6): {path}")
+    shape = (int(height), int(width)) if magic == b'P5' else (int(height), int(width), 3)
+    
+    if MEMMAP_PAGES:
+        # Copy-on-write, so a stage writing into the page never touches the file
+        return np.memmap(path, dtype=np.uint8, mode='c', offset=offset, shape=shape)
+    return np.fromfile(path, dtype=np.uint8, count=int(np.prod(shape)), offset=offset).reshape(shape)
+
+
+def plan_chunks(indices: Sequence[int], chunk_size: int) -> List[List[Tuple[int, int]]]:
+    """
+    Split page indices into chunks of contiguous runs.
+    
+    Args:
+        indices: Sorted zero-based page indices
+        chunk_size: Maximum number of pages per chunk
+    
+    Returns:
+        One list of (first, last) index runs per chunk
+    """
+    chunks = []
+    current = []
+    size = 0
+    for index in indices:
+        if size == chunk_size:
+            chunks.append(current)
+            current = []
+            size = 0
+        if current and current[-1][1] == index - 1:
+            current[-1] = (current[-1][0], index)
+        else:
+            current.append((index, index))
+        size += 1
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class PdfRasterizer:
+    """
+    Renders PDF pages with several poppler processes ahead of recognition.
+    
+    Pages are rendered chunk by chunk into a temporary directory, each
+    chunk split across `threads` pdftoppm processes, and mapped back from
+    the PPM/PGM files instead of being decoded into PIL images. A
+    background thread renders the next chunk while the current one is
+    recognized. Pages waiting on disk do not count against process
+    memory, so rendering ahead does not defeat the memory governor.
+    
+    Grayscale rendering gives a third of the data to write and map; use
+    it when the pages are converted to grayscale downstream anyway.
+    """
+    
+    def __init__(
+        self,
+        threads: Optional[int] = None,
+        grayscale: bool = False,
+        prefetch: int = 1,
+        spill_dir: Optional[str] = None
+    ):
+        """
+        Initialize rasterizer.
+        
+        Args:
+            threads: pdftoppm processes per chunk (default: default_threads())
+            grayscale: Render single-channel pages
+            prefetch: Chunks rendered ahead in the background (0 to render
+                on demand in the calling thread)
+            spill_dir: Directory for the temporary page files (default:
+                the system temporary directory)
+        """
+        self.threads = threads or default_threads()
+        self.grayscale = grayscale
+        self.prefetch = prefetch
+        self.spill_dir = spill_dir
+    
+    def _render(self, file_path: str, dpi: int, runs: List[Tuple[int, int]], folder: str) -> List[Tuple[int, str]]:
+        """Render runs of pages into folder and return (index, path) pairs."""
+        rendered = []
+        for first, last in runs:
+            try:
+                paths = convert_from_path(
+                    file_path, dpi=dpi, first_page=first + 1, last_page=last + 1,
+                    thread_count=min(self.threads, last - first + 1), grayscale=self.grayscale,
+                    output_folder=folder, paths_only=True, fmt='ppm'
+                )
+            except Exception as e:
+                raise ValueError(f"Failed to load PDF page {first + 1}: {str(e)}")
+            if len(paths) != last - first + 1:
+                raise ValueError(f"Failed to load PDF page {first + 1 + len(paths)}: no output from pdftoppm")
+            rendered.extend(zip(range(first, last + 1), paths))
+        return rendered
+    
+    @staticmethod
+    def _load(path: str, index: int, dpi: int, file_path: str) -> Page:
+        """Load a rendered page and remove its file."""
+        try:
+            array = read_pnm(path)
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Failed to load PDF page {index + 1}: {str(e)}")
+        # A mapping keeps the pixels readable after the file is removed
+        os.remove(path)
+        return Page(array, dpi=dpi, page_index=index, source=file_path)
+    
+    def _produce(self, file_path: str, dpi: int, chunks, folder: str, ready: queue.Queue, stop: threading.Event):
+        """Background thread: render chunks and queue them, then None or the error."""
+        def offer(item):
+            # Give up once the consumer has stopped reading
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+        
+        try:
+            for runs in chunks:
+                if stop.is_set():
+                    return
+                offer(self._render(file_path, dpi, runs, folder))
+        except Exception as e:
+            offer(e)
+            return
+        offer(None)
+    
+    def iter_pages(self, file_path: str, page_count: int, dpi: int = 300, pages: Optional[Sequence[int]] = None) -> Iterator[Page]:
+        """
+        Rasterize a PDF, yielding pages in order.
+        
+        Args:
+            file_path: Path to PDF file
+            page_count: Number of pages in the PDF
+            dpi: DPI for conversion
+            pages: Zero-based page indices to rasterize (None for all)
+        
+        Yields:
+            Page objects backed by the rendered files
+        
+        Raises:
+            ValueError: If conversion fails
+        """
+        indices = range(page_count)
+        if pages is not None:
+            indices = [idx for idx in sorted(pages) if idx < page_count]
+        chunks = plan_chunks(indices, self.threads * PAGES_PER_PROCESS)
+        if not chunks:
+            return
+        
+        folder = tempfile.mkdtemp(prefix='ocr-pdf-', dir=self.spill_dir)
+        stop = threading.Event()
+        producer = None
+        try:
+            if self.prefetch > 0:
+                ready = queue.Queue(maxsize=self.prefetch)
+                producer = threading.Thread(
+                    target=self._produce, args=(file_path, dpi, chunks, folder, ready, stop),
+                    name='pdf-raster', daemon=True
+                )
+                producer.start()
+                rendered_chunks = iter(ready.get, None)
+            else:
+                rendered_chunks = (self._render(file_path, dpi, runs, folder) for runs in chunks)
+            
+            for rendered in rendered_chunks:
+                if isinstance(rendered, Exception):
+                    raise rendered
+                for index, path in rendered:
+                    yield self._load(path, index, dpi, file_path)
+        finally:
+            stop.set()
+            if producer is not None:
+                producer.join()
+            shutil.rmtree(folder, ignore_errors=True)
@@ -0,0 +1,335 @@
+"""Streaming writer for searchable (sandwich) PDFs."""
+
+import io
+import struct
+import zlib
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from .script import is_rtl_text
+
+
+def _to_unicode_cmap() -> bytes:
+    """Build a ToUnicode CMap mapping each 2-byte CID to the same BMP code point."""
+    ranges = [
+        f"<{high:02X}00> <{high:02X}FF> <{high:02X}00>"
+        for high in range(256)
+        if not 0xD8 <= high <= 0xDF  # surrogates are not characters
+    ]
+    blocks = []
+    for start in range(0, len(ranges), 100):
+        chunk = ranges[start:start + 100]
+        blocks.append(f"{len(chunk)} beginbfrange\n" + "\n".join(chunk) + "\nendbfrange")
+    return (
+        "/CIDInit /ProcSet findresource begin\n"
+        "12 dict begin\n"
+        "begincmap\n"
+        "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def\n"
+        "/CMapName /Adobe-Identity-UCS def\n"
+        "/CMapType 2 def\n"
+        "1 begincodespacerange\n<0000> <FFFF>\nendcodespacerange\n"
+        + "\n".join(blocks) +
+        "\nendcmap\n"
+        "CMapName currentdict /CMap defineresource pop\n"
+        "end\nend\n"
+    ).encode('ascii')
+
+
+def _glyphless_font(units_per_em: int = 1000, advance: int = 500) -> bytes:
+    """
+    Build a minimal TrueType font with one empty glyph.
+    
+    Embedded as the FontFile2 of the text layer font; every CID maps to
+    glyph 1, which draws nothing and is `advance` units wide.
+    
+    Args:
+        units_per_em: Font design units per em
+        advance: Advance width of both glyphs
+    
+    Returns:
+        The font file
+    """
+    def name_table() -> bytes:
+        strings = [(1, 'GlyphLessFont'), (2, 'Regular'), (4, 'GlyphLessFont'), (6, 'GlyphLessFont')]
+        records = b''
+        data = b''
+        for name_id, value in strings:
+            encoded = value.encode('utf-16-be')
+            records += struct.pack('>6H', 3, 1, 0x409, name_id, len(encoded), len(data))
+            data += encoded
+        return struct.pack('>3H', 0, len(strings), 6 + len(records)) + records + data
+    
+    tables = {
+        b'cmap': (
+            # Format 4 with only the closing segment: no character maps to a glyph
+            struct.pack('>2H', 0, 1) + struct.pack('>2HI', 3, 1, 12)
+            + struct.pack('>7H', 4, 24, 0, 2, 2, 0, 0) + struct.pack('>5H', 0xFFFF, 0, 0xFFFF, 1, 0)
+        ),
+        b'glyf': b'\0' * 4,
+        b'head': struct.pack(
+            '>3IIHHqq4h2Hh2h', 0x00010000, 0x00010000, 0, 0x5F0F3CF5, 0x000B, units_per_em,
+            0, 0, 0, 0, advance, units_per_em, 0, 3, 2, 0, 0
+        ),
+        b'hhea': struct.pack(
+            '>I3hH3h3h4hhH', 0x00010000, units_per_em, 0, 0, advance,
+            0, 0, advance, 1, 0, 0, 0, 0, 0, 0, 0, 2
+        ),
+        b'hmtx': struct.pack('>HhHh', advance, 0, advance, 0),
+        b'loca': struct.pack('>3H', 0, 0, 0),
+        b'maxp': struct.pack('>IH13H', 0x00010000, 2, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0),
+        b'name': name_table(),
+        b'post': struct.pack('>IihhIIIII', 0x00030000, 0, -100, 50, 0, 0, 0, 0, 0),
+    }
+    
+    def checksum(data: bytes) -> int:
+        data += b'\0' * (-len(data) % 4)
+        return sum(struct.unpack(f'>{len(data) // 4}I', data)) & 0xFFFFFFFF
+    
+    count = len(tables)
+    power = 1 << (count.bit_length() - 1)
+    header = struct.pack('>I4H', 0x00010000, count, power * 16, power.bit_length() - 1, (count - power) * 16)
+    directory = b''
+    body = b''
+    offset = len(header) + 16 * count
+    for tag in sorted(tables):
+        data = tables[tag]
+        directory += struct.pack('>4s3I', tag, checksum(data), offset + len(body), len(data))
+        body += data + b'\0' * (-len(data) % 4)
+    font = bytearray(header + directory + body)
+    
+    # head.checkSumAdjustment makes the whole file sum to a fixed value
+    head_offset = len(header) + 16 * count + sum(
+        len(tables[tag]) + -len(tables[tag]) % 4 for tag in sorted(tables) if tag < b'head'
+    )
+    adjustment = (0xB1B0AFBA - checksum(bytes(font))) & 0xFFFFFFFF
+    struct.pack_into('>I', font, head_offset + 8, adjustment)
+    return bytes(font)
+
+
+class SearchablePdfWriter:
+    """
+    Writes page images with an invisible text layer, one page at a time.
+    
+    Each page is drawn as a JPEG image with the recognized words placed
+    over it in invisible text render mode, positioned and horizontally
+    scaled to the word boxes from the original recognition pass. The text
+    uses an embedded glyph-less CID font whose character codes are Unicode
+    code points, so copy/paste and search work for Arabic and French
+    alike. Right-to-left words are written in visual order, as word
+    processors write them, so each character lies over its glyph in the
+    image and viewers restore the reading order when extracting.
+    Objects are written as soon as a page is added, keeping memory use
+    constant for long documents.
+    
+    Usage:
+        with SearchablePdfWriter('out.pdf') as writer:
+            writer.add_page(image, words, dpi=300)
+    """
+    
+    FONT_NAME = 'GlyphLessFont'
+    # Every glyph is half an em wide (/DW 500)
+    GLYPH_WIDTH = 0.5
+    
+    def __init__(self, file_path: str, jpeg_quality: int = 75):
+        """
+        Open a new PDF file for writing.
+        
+        Args:
+            file_path: Output file path
+            jpeg_quality: JPEG quality of the page images
+        """
+        self._file = open(file_path, 'wb')
+        self._offsets: Dict[int, int] = {}
+        self._page_ids: List[int] = []
+        self._next_id = 1
+        self.jpeg_quality = jpeg_quality
+        
+        self._file.write(b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n")
+        self._catalog_id = self._reserve()
+        self._pages_id = self._reserve()
+        self._font_id = self._write_font()
+    
+    def __enter__(self) -> 'SearchablePdfWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _reserve(self) -> int:
+        """Allocate an object number."""
+        obj_id = self._next_id
+        self._next_id += 1
+        return obj_id
+    
+    def _write_object(self, obj_id: int, body: bytes, stream: Optional[bytes] = None):
+        """Write an indirect object, optionally followed by a stream."""
+        self._offsets[obj_id] = self._file.tell()
+        self._file.write(f"{obj_id} 0 obj\n".encode('ascii'))
+        self._file.write(body)
+        if stream is not None:
+            self._file.write(b"\nstream\n")
+            self._file.write(stream)
+            self._file.write(b"\nendstream")
+        self._file.write(b"\nendobj\n")
+    
+    def _write_font(self) -> int:
+        """Write the glyph-less Type0 font and return its object number."""
+        font_id = self._reserve()
+        cid_font_id = self._reserve()
+        descriptor_id = self._reserve()
+        cmap_id = self._reserve()
+        gid_map_id = self._reserve()
+        font_file_id = self._reserve()
+        
+        self._write_object(font_id, (
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /{self.FONT_NAME} "
+            f"/Encoding /Identity-H /DescendantFonts [{cid_font_id} 0 R] "
+            f"/ToUnicode {cmap_id} 0 R >>"
+        ).encode('ascii'))
+        self._write_object(cid_font_id, (
+            f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{self.FONT_NAME} "
+            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+            f"/FontDescriptor {descriptor_id} 0 R /DW {int(self.GLYPH_WIDTH * 1000)} "
+            f"/CIDToGIDMap {gid_map_id} 0 R >>"
+        ).encode('ascii'))
+        self._write_object(descriptor_id, (
+            f"<< /Type /FontDescriptor /FontName /{self.FONT_NAME} /Flags 5 "
+            f"/FontBBox [0 0 {int(self.GLYPH_WIDTH * 1000)} 1000] /ItalicAngle 0 "
+            f"/Ascent 1000 /Descent 0 /CapHeight 1000 /StemV 80 "
+            f"/FontFile2 {font_file_id} 0 R >>"
+        ).encode('ascii'))
+        cmap = zlib.compress(_to_unicode_cmap())
+        self._write_object(
+            cmap_id,
+            f"<< /Length {len(cmap)} /Filter /FlateDecode >>".encode('ascii'),
+            cmap
+        )
+        # Every CID is drawn with the font's single empty glyph
+        gid_map = zlib.compress(b'\x00\x01' * 0x10000)
+        self._write_object(
+            gid_map_id,
+            f"<< /Length {len(gid_map)} /Filter /FlateDecode >>".encode('ascii'),
+            gid_map
+        )
+        font_file = _glyphless_font(advance=int(self.GLYPH_WIDTH * 1000))
+        self._write_object(
+            font_file_id,
+            f"<< /Length {len(font_file)} /Length1 {len(font_file)} >>".encode('ascii'),
+            font_file
+        )
+        return font_id
+    
+    @staticmethod
+    def _encode_text(text: str) -> str:
+        """Encode text as 2-byte CIDs (BMP code points) in hex."""
+        return ''.join(f"{ord(ch):04X}" if ord(ch) <= 0xFFFF else 'FFFD' for ch in text)
+    
+    def _text_layer(self, words, scale: float, page_height: float) -> bytes:
+        """Build the invisible text content for one page."""
+        ops = ["BT", "3 Tr"]
+        for word in words:
+            text = word.text.strip()
+            if not text:
+                continue
+            x0, y0, x1, y1 = (v * scale for v in word.bbox)
+            font_size = max(y1 - y0, 1.0)
+            natural_width = len(text) * self.GLYPH_WIDTH * font_size
+            h_scale = 100.0 * max(x1 - x0, 1.0) / natural_width
+            # Right-to-left words are stored left to right like their glyphs;
+            # the trailing space separates words in extracted text
+            if is_rtl_text(text):
+                text = text[::-1]
+            ops.append(
+                f"/F1 {font_size:.2f} Tf {h_scale:.2f} Tz "
+                f"1 0 0 1 {x0:.2f} {page_height - y1:.2f} Tm "
+                f"<{self._encode_text(text + ' ')}> Tj"
+            )
+        ops.append("ET")
+        return "\n".join(ops).encode('ascii')
+    
+    def add_page(self, image, words, dpi: Optional[int] = None, size=None):
+        """
+        Append a page.
+        
+        Args:
+            image: Page, numpy array or PIL Image shown on the page
+            words: OCRWord objects with boxes in pixel coordinates
+            dpi: Resolution used to convert pixels to points (default 300)
+            size: (width, height) in pixels the word boxes refer to,
+                defaults to the image size
+        """
+        if hasattr(image, 'to_pil'):
+            image = image.to_pil()
+        elif isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        
+        dpi = dpi or 300
+        width_px, height_px = size if size and all(size) else image.size
+        scale = 72.0 / dpi
+        page_width = width_px * scale
+        page_height = height_px * scale
+        
+        jpeg = io.BytesIO()
+        image.save(jpeg, format='JPEG', quality=self.jpeg_quality)
+        jpeg = jpeg.getvalue()
+        color_space = '/DeviceGray' if image.mode == 'L' else '/DeviceRGB'
+        
+        image_id = self._reserve()
+        self._write_object(image_id, (
+            f"<< /Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+            f"/ColorSpace {color_space} /BitsPerComponent 8 /Filter /DCTDecode "
+            f"/Length {len(jpeg)} >>"
+        ).encode('ascii'), jpeg)
+        
+        content = (
+            f"q {page_width:.2f} 0 0 {page_height:.2f} 0 0 cm /Im0 Do Q\n".encode('ascii')
+            + self._text_layer(words, scale, page_height)
+        )
+        content = zlib.compress(content)
+        content_id = self._reserve()
+        self._write_object(
+            content_id,
+            f"<< /Length {len(content)} /Filter /FlateDecode >>".encode('ascii'),
+            content
+        )
+        
+        page_id = self._reserve()
+        self._write_object(page_id, (
+            f"<< /Type /Page /Parent {self._pages_id} 0 R "
+            f"/MediaBox [0 0 {page_width:.2f} {page_height:.2f}] "
+            f"/Resources << /XObject << /Im0 {image_id} 0 R >> /Font << /F1 {self._font_id} 0 R >> >> "
+            f"/Contents {content_id} 0 R >>"
+        ).encode('ascii'))
+        self._page_ids.append(page_id)
+    
+    def close(self):
+        """Write the page tree, cross-reference table and trailer, and close the file."""
+        if self._file is None:
+            return
+        
+        kids = ' '.join(f"{page_id} 0 R" for page_id in self._page_ids)
+        self._write_object(
+            self._pages_id,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode('ascii')
+        )
+        self._write_object(
+            self._catalog_id,
+            f"<< /Type /Catalog /Pages {self._pages_id} 0 R >>".encode('ascii')
+        )
+        
+        xref_offset = self._file.tell()
+        count = self._next_id
+        lines = [f"xref\n0 {count}\n", "0000000000 65535 f \n"]
+        for obj_id in range(1, count):
+            lines.append(f"{self._offsets.get(obj_id, 0):010d} 00000 n \n")
+        self._file.write(''.join(lines).encode('ascii'))
+        self._file.write((
+            f"trailer\n<< /Size {count} /Root {self._catalog_id} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        ).encode('ascii'))
+        self._file.close()
+        self._file = None
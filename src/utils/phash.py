@@ -0,0 +1,83 @@
+"""Perceptual page fingerprints for duplicate detection."""
+
+import cv2
+import numpy as np
+
+
+# 16x16 difference hash: 256 bits, fine enough to tell most layouts apart
+HASH_SIZE = 16
+
+# Side of the grayscale thumbnails that confirm a hash match; pages built
+# from one template (invoices) share a hash and differ only in small text
+VERIFY_SIZE = 256
+
+
+def dhash(image: np.ndarray, hash_size: int = HASH_SIZE) -> int:
+    """
+    Compute a difference hash (dHash) of an image.
+    
+    The image is reduced to a (hash_size + 1) x hash_size grayscale
+    thumbnail and each bit records whether a pixel is brighter than its
+    right neighbour. Near-identical pages (rescans, recompressed copies)
+    produce hashes with a small Hamming distance.
+    
+    Args:
+        image: Image as numpy array (grayscale or RGB)
+        hash_size: Grid size, the hash has hash_size ** 2 bits
+    
+    Returns:
+        Hash as an integer
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    small = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def verification_thumbnail(image: np.ndarray, size: int = VERIFY_SIZE) -> np.ndarray:
+    """
+    Reduce a page to a square grayscale thumbnail for pixel comparison.
+    
+    Args:
+        image: Image as numpy array (grayscale or RGB)
+        size: Thumbnail side in pixels
+    
+    Returns:
+        size x size uint8 array
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+    return cv2.resize(image, (size, size), interpolation=cv2.INTER_AREA)
+
+
+def thumbnail_difference(a: np.ndarray, b: np.ndarray) -> int:
+    """
+    Largest gray level difference between two verification thumbnails.
+    
+    Each thumbnail pixel averages a block of the page, so scanner noise
+    and recompression stay small while a changed number or word changes
+    the blocks it covers by far more.
+    
+    Args:
+        a: First thumbnail
+        b: Second thumbnail
+    
+    Returns:
+        Maximum absolute difference (0-255)
+    """
+    return int(np.abs(a.astype(np.int16) - b.astype(np.int16)).max())
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Count differing bits between two hashes.
+    
+    Args:
+        a: First hash
+        b: Second hash
+    
+    Returns:
+        Number of differing bits
+    """
+    return bin(a ^ b).count('1')
@@ -0,0 +1,384 @@
+"""Run profiler writing flame graph files for a batch."""
+
+import cProfile
+import json
+import linecache
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (function name, file, first line) identifying a frame in a stack
+Frame = Tuple[str, str, int]
+
+# Packages that hand their work to native code, mapped to the library
+# the time is reported under
+NATIVE_PACKAGES = {
+    'pytesseract': 'tesseract',
+    'pdf2image': 'poppler',
+    'cv2': 'opencv',
+    'torch': 'torch',
+    'torchvision': 'torch',
+    'easyocr': 'torch',
+    'paddle': 'paddle',
+    'paddleocr': 'paddle',
+    'onnxruntime': 'onnxruntime',
+    'numpy': 'numpy',
+}
+
+# Calls on a source line (sampling) or in a built-in's name (cProfile)
+# that identify the native library directly
+NATIVE_CALLS = (
+    ('cv2.', 'opencv'),
+    ('np.', 'numpy'),
+    ('numpy', 'numpy'),
+    ('torch', 'torch'),
+)
+
+# Frames where an idle worker thread waits for work
+IDLE_FRAMES = {('threading.py', 'wait'), ('queue.py', 'get'), ('thread.py', '_worker')}
+
+# Built-ins (as named by cProfile) that block on other threads
+IDLE_BUILTINS = ("of '_thread.lock' objects", "of '_thread.RLock' objects")
+
+
+@lru_cache(maxsize=4096)
+def _package(filename: str) -> Optional[str]:
+    """Get the top-level installed package a source file belongs to."""
+    parts = filename.replace('\\', '/').split('/')
+    for marker in ('site-packages', 'dist-packages'):
+        if marker in parts:
+            index = parts.index(marker)
+            if index + 1 < len(parts):
+                return os.path.splitext(parts[index + 1])[0]
+    return None
+
+
+def _call_library(text: str) -> Optional[str]:
+    """Find the native library named by a call in a line of code or a built-in's name."""
+    for prefix, library in NATIVE_CALLS:
+        if prefix in text:
+            return library
+    return None
+
+
+def _builtin_library(name: str) -> Optional[str]:
+    """Get the native library of a built-in function as named by cProfile."""
+    library = _call_library(name)
+    if library is None and name.startswith('<') and ' ' not in name:
+        # OpenCV functions are reported by bare name, e.g. '<GaussianBlur>'
+        cv2 = sys.modules.get('cv2')
+        if cv2 is not None and hasattr(cv2, name[1:-1]):
+            library = 'opencv'
+    return library
+
+
+def _frame_library(frame: Frame) -> Optional[str]:
+    """Get the native library a Python frame belongs to, if any."""
+    return NATIVE_PACKAGES.get(_package(frame[1]))
+
+
+class RunProfiler:
+    """
+    Profiles a batch and writes speedscope and collapsed-stack files.
+    
+    Two modes are available:
+    
+    - 'sample': a background thread records the stacks of the profiled
+      threads every few milliseconds. Overhead is low and threads started
+      during the run (e.g. tile workers) are included.
+    - 'cprofile': deterministic profiling of the calling thread with
+      cProfile, which also sees individual built-in calls (every OpenCV
+      and NumPy function) at a higher overhead. Stacks are reconstructed
+      from the caller/callee graph, so they are approximate.
+    
+    Time is split into Python and native libraries (Tesseract, Poppler,
+    OpenCV, torch, Paddle, ONNX Runtime, NumPy). A stack is attributed to
+    the outermost library it enters, so OpenCV calls made by EasyOCR count
+    as torch time. Tesseract and Poppler run as subprocesses and are
+    measured as the time spent waiting for them.
+    """
+    
+    MODES = ('sample', 'cprofile')
+    
+    def __init__(self, mode: str = 'sample', interval: float = 0.005):
+        """
+        Initialize profiler.
+        
+        Args:
+            mode: 'sample' or 'cprofile'
+            interval: Seconds between stack samples in 'sample' mode
+        
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profiler mode: {mode}. Use one of {', '.join(self.MODES)}")
+        
+        self.mode = mode
+        self.interval = interval
+        self.elapsed = 0.0
+        self.idle_seconds = 0.0
+        # Seconds per (thread name, stack from root to leaf)
+        self.stacks: Dict[Tuple[str, Tuple[Frame, ...]], float] = defaultdict(float)
+        
+        self._profile = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._ignored = set()
+        self._start_time = 0.0
+        self._thread_name = 'main'
+    
+    def __enter__(self) -> 'RunProfiler':
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+    
+    def start(self):
+        """Start profiling the calling thread (and, when sampling, threads it starts)."""
+        self._start_time = time.perf_counter()
+        self._thread_name = threading.current_thread().name
+        if self.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            return
+        
+        # Threads that already exist (GUI event loop, warm-up workers) are
+        # not part of the run
+        self._ignored = set(sys._current_frames()) - {threading.get_ident()}
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name='profiler', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop profiling and collect the stacks."""
+        if self.mode == 'cprofile':
+            if self._profile is not None:
+                self._profile.disable()
+                self._collect_cprofile()
+        elif self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.elapsed = time.perf_counter() - self._start_time
+    
+    def _sample_loop(self):
+        """Record the stacks of the profiled threads until stopped."""
+        own = threading.get_ident()
+        names = {}
+        previous = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            # Weight by the measured gap, which grows while the GIL is busy
+            weight = now - previous
+            previous = now
+            for ident, frame in sys._current_frames().items():
+                if ident == own or ident in self._ignored:
+                    continue
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                self._record(names.get(ident, str(ident)), frame, weight)
+    
+    def _record(self, thread_name: str, frame, weight: float):
+        """Add one sampled stack."""
+        leaf = frame
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        stack.reverse()
+        
+        if (os.path.basename(stack[-1][1]), stack[-1][0]) in IDLE_FRAMES:
+            self.idle_seconds += weight
+            return
+        
+        library = next((lib for lib in map(_frame_library, stack) if lib), None)
+        if library is None:
+            # A C call made from our own code shows up as the calling line
+            library = _call_library(linecache.getline(leaf.f_code.co_filename, leaf.f_lineno))
+        if library is not None:
+            stack.append((f"[{library}]", '', 0))
+        self.stacks[(thread_name, tuple(stack))] += weight
+    
+    def _collect_cprofile(self):
+        """Rebuild weighted stacks from the cProfile call graph."""
+        stats = pstats.Stats(self._profile).stats
+        # Entry points are called from frames that were already running when
+        # profiling started (or from nowhere); their share is the time spent
+        # under those outside calls
+        roots = {}
+        for function, (_, _, _, cumulative, callers) in stats.items():
+            if not callers:
+                roots[function] = 1.0
+                continue
+            outside = sum(edge[3] for caller, edge in callers.items() if caller not in stats)
+            if outside and cumulative:
+                roots[function] = min(outside / cumulative, 1.0)
+        # Paths carrying a negligible share of the run are cut off, the call
+        # graph of a long run has too many of them to enumerate
+        min_seconds = max(sum(stats[root][3] * share for root, share in roots.items()) * 1e-4, 1e-6)
+        children = defaultdict(list)
+        for function, (_, _, _, _, callers) in stats.items():
+            for caller, (_, _, _, cumulative) in callers.items():
+                children[caller].append((function, cumulative))
+        
+        def frame_of(function) -> Frame:
+            filename, line, name = function
+            return name, '' if filename == '~' else filename, line
+        
+        def walk(function, share: float, path: Tuple[Frame, ...], library: Optional[str], depth: int):
+            _, _, own_time, cumulative, _ = stats[function]
+            if function[0] == '~':
+                library = library or _builtin_library(function[2])
+            else:
+                library = library or _frame_library(frame_of(function))
+            path = path + (frame_of(function),)
+            
+            self_time = own_time * share
+            if function[0] == '~' and any(idle in function[2] for idle in IDLE_BUILTINS):
+                self.idle_seconds += self_time
+            elif self_time > 0:
+                leaf = path + ((f"[{library}]", '', 0),) if library else path
+                self.stacks[(self._thread_name, leaf)] += self_time
+            if depth >= 64 or not cumulative:
+                return
+            for child, edge_time in children.get(function, ()):
+                if frame_of(child) in path:
+                    continue
+                # A callee's time is split between its callers by the time
+                # spent under each call site
+                child_share = share * edge_time / cumulative
+                if child_share * stats[child][3] >= min_seconds:
+                    walk(child, child_share, path, library, depth + 1)
+        
+        for root, share in roots.items():
+            walk(root, share, (), None, 0)
+    
+    def breakdown(self) -> Dict[str, float]:
+        """
+        Split the profiled time between Python and native libraries.
+        
+        Returns:
+            Seconds per library, with 'python' for interpreted code
+        """
+        totals = defaultdict(float)
+        for (_, stack), seconds in self.stacks.items():
+            leaf = stack[-1][0]
+            library = leaf[1:-1] if leaf.startswith('[') else 'python'
+            totals[library] += seconds
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+    
+    def report(self) -> str:
+        """
+        Summarize where the run spent its time.
+        
+        Returns:
+            Human-readable summary
+        """
+        totals = self.breakdown()
+        profiled = sum(totals.values())
+        if not profiled:
+            return f"{self.elapsed:.2f} s, no samples"
+        parts = ", ".join(f"{library} {seconds / profiled:.0%}" for library, seconds in totals.items())
+        return f"{self.elapsed:.2f} s wall, {profiled:.2f} s profiled ({parts})"
+    
+    @staticmethod
+    def _label(frame: Frame) -> str:
+        """Flame graph label of a frame."""
+        name, filename, line = frame
+        if not filename:
+            return name
+        return f"{name} ({os.path.basename(filename)}:{line})"
+    
+    def write_collapsed(self, path: str):
+        """
+        Write stacks in collapsed format ("frame;frame;frame count").
+        
+        Counts are microseconds, readable by flamegraph.pl, speedscope and
+        most other flame graph viewers.
+        
+        Args:
+            path: Output file path
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            for (thread_name, stack), seconds in sorted(self.stacks.items()):
+                micros = int(round(seconds * 1e6))
+                if micros:
+                    labels = [thread_name] + [self._label(frame).replace(';', ':') for frame in stack]
+                    f.write(f"{';'.join(labels)} {micros}\n")
+    
+    def write_speedscope(self, path: str, name: str = 'OCR run'):
+        """
+        Write a speedscope profile with one sampled profile per thread.
+        
+        Args:
+            path: Output file path
+            name: Profile name shown in speedscope
+        """
+        frames = []
+        index = {}
+        profiles = {}
+        for (thread_name, stack), seconds in sorted(self.stacks.items()):
+            sample = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    entry = {'name': frame[0]}
+                    if frame[1]:
+                        entry.update(file=frame[1], line=frame[2])
+                    frames.append(entry)
+                sample.append(index[frame])
+            profile = profiles.setdefault(thread_name, {
+                'type': 'sampled', 'name': thread_name, 'unit': 'seconds',
+                'startValue': 0, 'endValue': 0, 'samples': [], 'weights': []
+            })
+            profile['samples'].append(sample)
+            profile['weights'].append(seconds)
+            profile['endValue'] += seconds
+        
+        data = {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'arabic-french-ocr',
+            'shared': {'frames': frames},
+            'profiles': list(profiles.values())
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    
+    def write(self, directory: str, name: Optional[str] = None) -> List[str]:
+        """
+        Write all profile files of the run into a directory.
+        
+        Files are named <name>.speedscope.json and <name>.collapsed.txt, plus
+        <name>.prof (pstats, e.g. for snakeviz) in 'cprofile' mode.
+        
+        Args:
+            directory: Output directory, created if needed
+            name: Base file name (default: profile-<timestamp>-<mode>)
+        
+        Returns:
+            Paths of the written files
+        """
+        os.makedirs(directory, exist_ok=True)
+        name = name or time.strftime('profile-%Y%m%d-%H%M%S-') + self.mode
+        base = os.path.join(directory, name)
+        
+        paths = [base + '.speedscope.json', base + '.collapsed.txt']
+        self.write_speedscope(paths[0], name)
+        self.write_collapsed(paths[1])
+        if self._profile is not None:
+            paths.append(base + '.prof')
+            self._profile.dump_stats(paths[2])
+        logger.info("Profile written to %s", ', '.join(paths))
+        return paths
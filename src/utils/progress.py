@@ -0,0 +1,86 @@
+"""Throughput measurement and ETA estimation for batch progress."""
+
+import time
+from collections import deque
+from typing import Optional
+
+
+class ThroughputMeter:
+    """
+    Rolling pages-per-second estimate.
+    
+    The rate is computed over the most recent pages only, so the ETA
+    follows changes in page complexity (e.g. from scanned invoices to a
+    dense text PDF) instead of averaging over the whole batch.
+    """
+    
+    def __init__(self, window: int = 20):
+        """
+        Initialize meter.
+        
+        Args:
+            window: Number of recent pages the rate is computed over
+        """
+        self.start = time.perf_counter()
+        self._times = deque([self.start], maxlen=window + 1)
+        self.done = 0
+    
+    def update(self, pages: int = 1):
+        """
+        Record completed pages.
+        
+        Args:
+            pages: Number of pages completed since the last update
+        """
+        now = time.perf_counter()
+        for _ in range(pages):
+            self._times.append(now)
+        self.done += pages
+    
+    def rate(self) -> float:
+        """
+        Get the recent throughput.
+        
+        Returns:
+            Pages per second (0 until a page is done)
+        """
+        pages = len(self._times) - 1
+        elapsed = self._times[-1] - self._times[0]
+        if pages <= 0 or elapsed <= 0:
+            return 0.0
+        return pages / elapsed
+    
+    def eta(self, remaining: int) -> Optional[float]:
+        """
+        Estimate the time until the remaining pages are done.
+        
+        Args:
+            remaining: Number of pages still to process
+        
+        Returns:
+            Seconds, or None if no estimate is available yet
+        """
+        rate = self.rate()
+        if rate <= 0:
+            return None
+        return remaining / rate
+    
+    @staticmethod
+    def format_eta(seconds: Optional[float]) -> str:
+        """
+        Format an ETA for display.
+        
+        Args:
+            seconds: Seconds remaining, or None
+        
+        Returns:
+            String such as '0:42', '12:05' or '1:02:10' ('--:--' if unknown)
+        """
+        if seconds is None:
+            return '--:--'
+        seconds = int(round(seconds))
+        hours, rest = divmod(seconds, 3600)
+        minutes, seconds = divmod(rest, 60)
+        if hours:
+            return f"{hours}:{minutes:02d}:{seconds:02d}"
+        return f"{minutes}:{seconds:02d}"
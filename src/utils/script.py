@@ -0,0 +1,94 @@
+"""Script detection helpers for mixed Arabic/Latin text."""
+
+import re
+
+import cv2
+import numpy as np
+
+
+ARABIC_CHARS = re.compile('[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]')
+LATIN_CHARS = re.compile('[A-Za-z\u00C0-\u024F]')
+
+
+def arabic_ratio(text: str) -> float:
+    """
+    Get the share of Arabic letters among Arabic and Latin letters.
+    
+    Args:
+        text: Text to inspect
+    
+    Returns:
+        Ratio between 0 and 1 (0 if the text has no letters)
+    """
+    arabic = len(ARABIC_CHARS.findall(text))
+    latin = len(LATIN_CHARS.findall(text))
+    total = arabic + latin
+    return arabic / total if total else 0.0
+
+
+def is_rtl_text(text: str) -> bool:
+    """
+    Check whether text is predominantly right-to-left (Arabic).
+    
+    Args:
+        text: Text to inspect
+    
+    Returns:
+        True if most letters are Arabic
+    """
+    return arabic_ratio(text) > 0.5
+
+
+# Image-level Latin line test: printed Latin letters are separate
+# components of similar size, Arabic letters join into wide components
+# along a dense baseline. Lines that fail any test are treated as Arabic.
+LATIN_MAX_WIDE_SHARE = 0.1
+LATIN_MAX_BASELINE_PEAK = 2.8
+LATIN_MIN_DENSITY = 0.8
+
+
+def looks_latin(line: np.ndarray) -> bool:
+    """
+    Guess from the pixels whether a text line is set in Latin script.
+    
+    Used to pick a recognizer before recognition. The test only passes
+    on clear evidence: letters as separate components (no more than
+    LATIN_MAX_WIDE_SHARE of the letter-sized components wider than 1.5
+    letter heights), at least LATIN_MIN_DENSITY such components per
+    letter height of line width, and no dominant baseline row (peak of
+    the row ink profile below LATIN_MAX_BASELINE_PEAK times its mean).
+    
+    Args:
+        line: Cropped text line (grayscale, RGB or BGR)
+    
+    Returns:
+        True if the line is most likely Latin text
+    """
+    gray = cv2.cvtColor(line, cv2.COLOR_BGR2GRAY) if line.ndim == 3 else line
+    _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+    if count < 3:
+        return False
+    
+    stats = stats[1:]
+    heights = stats[:, cv2.CC_STAT_HEIGHT]
+    widths = stats[:, cv2.CC_STAT_WIDTH]
+    letter_height = max(float(np.percentile(heights, 90)), 1.0)
+    letters = heights >= 0.4 * letter_height
+    if letters.sum() < 2:
+        return False
+    
+    span = (stats[:, cv2.CC_STAT_LEFT] + widths).max() - stats[:, cv2.CC_STAT_LEFT].min()
+    density = letters.sum() * letter_height / max(span, 1)
+    wide_share = (widths[letters] > 1.5 * letter_height).mean()
+    
+    rows = ink.sum(axis=1).astype(np.float64)
+    inked = np.flatnonzero(rows)
+    band = rows[inked[0]:inked[-1] + 1]
+    baseline_peak = band.max() / band.mean()
+    
+    return (
+        wide_share <= LATIN_MAX_WIDE_SHARE
+        and density >= LATIN_MIN_DENSITY
+        and baseline_peak < LATIN_MAX_BASELINE_PEAK
+    )
@@ -0,0 +1,299 @@
+"""Persistent full-text search index over OCR results."""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional
+
+from .file_handler import FileHandler
+from .paths import get_data_dir
+
+
+# Characters folded after decomposition: alef wasla, alef maksura and
+# Persian ya, ligatures, and Arabic-Indic digits (invoice numbers are
+# written with either digit set)
+_FOLD = str.maketrans({
+    'ٱ': 'ا',
+    'ى': 'ي',
+    'ی': 'ي',
+    'œ': 'oe',
+    'æ': 'ae',
+    **{chr(0x0660 + i): str(i) for i in range(10)},
+    **{chr(0x06F0 + i): str(i) for i in range(10)},
+})
+
+TATWEEL = 'ـ'
+
+# Word characters, matching how SQLite's unicode61 tokenizer splits text
+_TOKEN = re.compile(r'\w+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for indexing and searching.
+    
+    Compatibility decomposition splits presentation forms into base
+    letters and separates marks from their letters, so dropping marks
+    removes both Arabic diacritics (harakat, shadda, hamza above/below
+    alef, madda) and French accents. Tatweel is removed, alef and ya
+    variants are folded, and the text is case-folded.
+    
+    Args:
+        text: Original text
+    
+    Returns:
+        Normalized text
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(
+        char for char in decomposed
+        if char != TATWEEL and not unicodedata.combining(char)
+    )
+    return stripped.casefold().translate(_FOLD)
+
+
+def build_query(query: str, prefix: bool = False) -> str:
+    """
+    Turn user input into an FTS5 query.
+    
+    Each whitespace-separated term becomes a quoted phrase, so a term like
+    "FAC-2023-0042" matches its parts in sequence and user input never
+    reaches the FTS5 query syntax. All terms must match.
+    
+    Args:
+        query: Search text as typed by the user
+        prefix: Let the last term match as a prefix (search as you type)
+    
+    Returns:
+        FTS5 MATCH expression (empty if the query has no words)
+    """
+    terms = [term for term in normalize_text(query).split() if _TOKEN.search(term)]
+    phrases = ['"' + term.replace('"', '""') + '"' for term in terms]
+    if phrases and prefix:
+        phrases[-1] += '*'
+    return ' '.join(phrases)
+
+
+class SearchHit:
+    """A page matching a search."""
+    
+    def __init__(self, file_hash: str, path: str, page_index: int, page_count: int, snippet: str):
+        """
+        Initialize search hit.
+        
+        Args:
+            file_hash: SHA-256 of the source file
+            path: Path of the source file when it was indexed
+            page_index: Zero-based page index
+            page_count: Total number of pages in the source file
+            snippet: Matching line of the original text
+        """
+        self.file_hash = file_hash
+        self.path = path
+        self.page_index = page_index
+        self.page_count = page_count
+        self.snippet = snippet
+    
+    def __repr__(self) -> str:
+        return f"SearchHit({self.path!r}, page {self.page_index + 1}, {self.snippet!r})"
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index of recognized pages.
+    
+    Pages are keyed by the content hash of their file and the page index,
+    so a document that is processed again (even after being moved or
+    renamed) replaces its earlier entries. The normalized text is indexed
+    and the original text is kept for display.
+    
+    Writes are committed in batches; call commit() or close() to make them
+    visible to other connections. Each thread should use its own instance.
+    """
+    
+    COMMIT_EVERY = 200
+    
+    # Only the most recently indexed matches of a query are ranked, which
+    # keeps common words fast on very large indexes
+    RANK_WINDOW = 1000
+    
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Open (and create if needed) a search index.
+        
+        Args:
+            db_path: SQLite database path (default: search.sqlite in the
+                application data directory)
+        
+        Raises:
+            RuntimeError: If SQLite was built without FTS5
+        """
+        self.db_path = db_path or self.default_path()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        try:
+            self._db.executescript('''
+                CREATE TABLE IF NOT EXISTS documents (
+                    hash TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    page_count INTEGER NOT NULL,
+                    indexed_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS pages (
+                    id INTEGER PRIMARY KEY,
+                    hash TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    text TEXT NOT NULL,
+                    UNIQUE (hash, page)
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(content, tokenize='unicode61');
+            ''')
+        except sqlite3.OperationalError as e:
+            self._db.close()
+            raise RuntimeError(f"Search index needs SQLite with FTS5: {str(e)}")
+        
+        self._lock = threading.Lock()
+        self._hashes: Dict[str, str] = {}
+        self._pending = 0
+    
+    @staticmethod
+    def default_path() -> str:
+        """Get the path of the default index in the application data directory."""
+        return os.path.join(get_data_dir(), 'search.sqlite')
+    
+    def add_page(self, file_hash: str, path: str, page_index: int, page_count: int, text: str):
+        """
+        Index one page, replacing an earlier entry for the same page.
+        
+        Args:
+            file_hash: SHA-256 of the source file
+            path: Path of the source file
+            page_index: Zero-based page index
+            page_count: Total number of pages in the source file
+            text: Recognized text
+        """
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO documents (hash, path, page_count, indexed_at) VALUES (?, ?, ?, ?)',
+                (file_hash, os.path.abspath(path), page_count, time.time())
+            )
+            row = self._db.execute(
+                'SELECT id FROM pages WHERE hash = ? AND page = ?', (file_hash, page_index)
+            ).fetchone()
+            if row is not None:
+                self._db.execute('DELETE FROM pages_fts WHERE rowid = ?', row)
+                self._db.execute('DELETE FROM pages WHERE id = ?', row)
+            
+            cursor = self._db.execute(
+                'INSERT INTO pages (hash, page, text) VALUES (?, ?, ?)', (file_hash, page_index, text)
+            )
+            self._db.execute(
+                'INSERT INTO pages_fts (rowid, content) VALUES (?, ?)', (cursor.lastrowid, normalize_text(text))
+            )
+            
+            self._pending += 1
+            if self._pending >= self.COMMIT_EVERY:
+                self._db.commit()
+                self._pending = 0
+    
+    def add_result(self, result) -> bool:
+        """
+        Index a page result from the OCR pipeline.
+        
+        Failed and blank pages are skipped. The source file is hashed once
+        per instance.
+        
+        Args:
+            result: PageResult object
+        
+        Returns:
+            True if the page was indexed
+        """
+        if not result.ok or result.blank or not os.path.exists(result.source):
+            return False
+        file_hash = self._hashes.get(result.source)
+        if file_hash is None:
+            file_hash = self._hashes[result.source] = FileHandler.file_hash(result.source)
+        self.add_page(file_hash, result.source, result.page_index, result.page_count, result.text)
+        return True
+    
+    @staticmethod
+    def _snippet(text: str, tokens: List[str], width: int = 160) -> str:
+        """Pick the line of the original text containing the most search words."""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines:
+            return ''
+        line = max(lines, key=lambda line: sum(token in normalize_text(line) for token in tokens))
+        return line if len(line) <= width else line[:width - 1] + '…'
+    
+    def search(self, query: str, limit: int = 50, prefix: bool = False) -> List[SearchHit]:
+        """
+        Find pages matching all words of a query, best matches first.
+        
+        Matches are ranked with BM25 among the RANK_WINDOW most recently
+        indexed matching pages.
+        
+        Args:
+            query: Search text, e.g. an invoice number or a few words
+            limit: Maximum number of results
+            prefix: Let the last word match as a prefix
+        
+        Returns:
+            List of SearchHit objects
+        """
+        expression = build_query(query, prefix)
+        if not expression:
+            return []
+        
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT p.hash, d.path, p.page, d.page_count, p.text FROM ('
+                '    SELECT rowid, rank FROM pages_fts WHERE pages_fts MATCH ? ORDER BY rowid DESC LIMIT ?'
+                ') f JOIN pages p ON p.id = f.rowid JOIN documents d ON d.hash = p.hash '
+                'ORDER BY f.rank LIMIT ?',
+                (expression, max(self.RANK_WINDOW, limit), limit)
+            ).fetchall()
+        
+        tokens = _TOKEN.findall(normalize_text(query))
+        return [
+            SearchHit(file_hash, path, page, page_count, self._snippet(text, tokens))
+            for file_hash, path, page, page_count, text in rows
+        ]
+    
+    def page_text(self, file_hash: str, page_index: int) -> Optional[str]:
+        """
+        Get the stored text of an indexed page.
+        
+        Args:
+            file_hash: SHA-256 of the source file
+            page_index: Zero-based page index
+        
+        Returns:
+            Original recognized text, or None if the page is not indexed
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT text FROM pages WHERE hash = ? AND page = ?', (file_hash, page_index)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def page_total(self) -> int:
+        """Get the number of indexed pages."""
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+    
+    def commit(self):
+        """Make pending writes visible to other connections."""
+        with self._lock:
+            self._db.commit()
+            self._pending = 0
+    
+    def close(self):
+        """Commit pending writes and close the index."""
+        if self._db is not None:
+            self.commit()
+            self._db.close()
+            self._db = None
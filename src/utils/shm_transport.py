@@ -0,0 +1,200 @@
+"""Shared-memory transport of page images to worker processes."""
+
+import threading
+from multiprocessing import shared_memory
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+# Buffers are allocated in whole mebibytes so pages of similar size reuse them
+GRANULARITY = 1 << 20
+
+# Smaller arrays are cheaper to pickle than to copy into shared memory
+MIN_SHARED_BYTES = 256 * 1024
+
+
+class PageDescriptor(NamedTuple):
+    """Location of a page in a shared memory buffer, sent instead of the pixels."""
+    
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedPagePool:
+    """
+    Pool of reusable shared memory buffers for sending pages to workers.
+    
+    put() copies a page into a free buffer large enough to hold it and
+    returns a small descriptor to send through the pipe; the worker maps
+    the same memory with SharedPageReader. Buffers are returned with
+    release() once the worker has replied and are reused for later pages,
+    so a batch creates only a few segments instead of one per page. The
+    pool owns the segments and unlinks them on close().
+    """
+    
+    def __init__(self, max_free: int = 2):
+        """
+        Initialize pool.
+        
+        Args:
+            max_free: Number of free buffers kept for reuse; further
+                released buffers are freed, smallest first
+        """
+        self.max_free = max_free
+        self._free: List[shared_memory.SharedMemory] = []
+        self._in_use: Dict[str, shared_memory.SharedMemory] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+    
+    def _acquire(self, nbytes: int) -> shared_memory.SharedMemory:
+        """Take the smallest free buffer of at least nbytes, or create one."""
+        with self._lock:
+            fitting = [buffer for buffer in self._free if buffer.size >= nbytes]
+            if fitting:
+                buffer = min(fitting, key=lambda buffer: buffer.size)
+                self._free.remove(buffer)
+                self.reused += 1
+            else:
+                size = -(-max(nbytes, 1) // GRANULARITY) * GRANULARITY
+                buffer = shared_memory.SharedMemory(create=True, size=size)
+                self.created += 1
+            self._in_use[buffer.name] = buffer
+        return buffer
+    
+    def put(self, array: np.ndarray) -> PageDescriptor:
+        """
+        Copy a page into a shared buffer.
+        
+        Args:
+            array: Page pixels
+        
+        Returns:
+            Descriptor of the buffer, valid until release()
+        """
+        buffer = self._acquire(array.nbytes)
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=buffer.buf)
+        view[...] = array
+        del view
+        return PageDescriptor(buffer.name, array.shape, array.dtype.str)
+    
+    def release(self, descriptor: PageDescriptor):
+        """
+        Return a page's buffer to the pool.
+        
+        Args:
+            descriptor: Descriptor returned by put()
+        """
+        with self._lock:
+            buffer = self._in_use.pop(descriptor.name, None)
+            if buffer is None:
+                return
+            self._free.append(buffer)
+            if len(self._free) > self.max_free:
+                self._free.sort(key=lambda buffer: buffer.size)
+                self._destroy(self._free.pop(0))
+    
+    @staticmethod
+    def _destroy(buffer: shared_memory.SharedMemory):
+        """Close and unlink a buffer."""
+        buffer.close()
+        try:
+            buffer.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def close(self):
+        """Free all buffers, including ones not yet released."""
+        with self._lock:
+            for buffer in self._free + list(self._in_use.values()):
+                self._destroy(buffer)
+            self._free = []
+            self._in_use = {}
+    
+    def report(self) -> str:
+        """
+        Summarize buffer use.
+        
+        Returns:
+            Human-readable summary
+        """
+        return f"{self.created} shared buffer(s) created, {self.reused} reused"
+
+
+class SharedPageReader:
+    """
+    Worker-side access to pages in a SharedPagePool.
+    
+    Segments stay mapped between pages, so a recycled buffer is only
+    attached once per worker.
+    """
+    
+    def __init__(self, max_mapped: int = 4):
+        """
+        Initialize reader.
+        
+        Args:
+            max_mapped: Number of segments kept mapped; beyond it, segments
+                other than the current page's are unmapped (the pool may
+                have freed them)
+        """
+        self.max_mapped = max_mapped
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+    
+    def view(self, descriptor: PageDescriptor) -> np.ndarray:
+        """
+        Map a page without copying it.
+        
+        The array is only valid until the worker replies for the page;
+        the pool reuses the buffer afterwards.
+        
+        Args:
+            descriptor: Descriptor sent by the pool
+        
+        Returns:
+            Page pixels backed by shared memory
+        """
+        segment = self._segments.get(descriptor.name)
+        if segment is None:
+            segment = shared_memory.SharedMemory(name=descriptor.name)
+            self._segments[descriptor.name] = segment
+            if len(self._segments) > self.max_mapped:
+                self.forget(keep=(descriptor.name,))
+        return np.ndarray(descriptor.shape, dtype=np.dtype(descriptor.dtype), buffer=segment.buf)
+    
+    def forget(self, keep: Tuple[str, ...] = ()):
+        """
+        Unmap segments, e.g. ones the pool has freed.
+        
+        Args:
+            keep: Names of segments to keep mapped
+        """
+        for name in list(self._segments):
+            if name in keep:
+                continue
+            try:
+                self._segments.pop(name).close()
+            except BufferError:
+                # Still referenced by an array; unmapped when the worker exits
+                pass
+    
+    def close(self):
+        """Unmap all segments."""
+        self.forget()
+
+
+def pack_page(pool: SharedPagePool, array: np.ndarray):
+    """
+    Prepare a page for sending to a worker.
+    
+    Args:
+        pool: Pool to place large pages in
+        array: Page pixels
+    
+    Returns:
+        PageDescriptor for large pages, the array itself for small ones
+    """
+    if array.nbytes < MIN_SHARED_BYTES:
+        return array
+    return pool.put(np.ascontiguousarray(array))
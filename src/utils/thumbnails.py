@@ -0,0 +1,138 @@
+"""Cached thumbnail generation for the file list."""
+
+import hashlib
+import os
+import threading
+from typing import Dict, Optional, Tuple
+from PIL import Image
+from pdf2image import convert_from_path
+
+from .file_handler import FileHandler
+from .paths import get_cache_dir
+
+
+class ThumbnailCache:
+    """
+    On-disk cache of small preview images.
+    
+    Thumbnails are decoded at reduced resolution (JPEG draft mode, PIL
+    reduce for other images, low-DPI rasterization of the first PDF page)
+    and stored as PNG files keyed by the source file's content hash and
+    modification time, so previews are only generated once per file version.
+    """
+    
+    DEFAULT_SIZE = 128
+    PDF_DPI = 36
+    
+    def __init__(self, cache_dir: Optional[str] = None, size: int = DEFAULT_SIZE):
+        """
+        Initialize thumbnail cache.
+        
+        Args:
+            cache_dir: Directory for cached thumbnails (default: user cache)
+            size: Maximum thumbnail edge length in pixels
+        """
+        self.cache_dir = cache_dir or get_cache_dir('thumbnails')
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.size = size
+        # Avoid re-hashing unchanged files within one session
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+    
+    def cache_key(self, file_path: str) -> str:
+        """
+        Compute the cache key for a file.
+        
+        Args:
+            file_path: Path to source file
+            
+        Returns:
+            Hex digest combining content hash, mtime and thumbnail size
+        """
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            file_hash = self._hashes.get(memo_key)
+        if file_hash is None:
+            file_hash = FileHandler.file_hash(file_path)
+            with self._lock:
+                self._hashes[memo_key] = file_hash
+        
+        key = f"{file_hash}:{stat.st_mtime_ns}:{self.size}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+    
+    def _thumbnail_path(self, key: str) -> str:
+        """Get the cache file path for a key."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
+    
+    def cached_thumbnail(self, file_path: str) -> Optional[str]:
+        """
+        Look up a cached thumbnail without generating one.
+        
+        Args:
+            file_path: Path to source file
+            
+        Returns:
+            Path of the cached PNG, or None if not cached
+        """
+        path = self._thumbnail_path(self.cache_key(file_path))
+        return path if os.path.exists(path) else None
+    
+    def get_thumbnail(self, file_path: str) -> str:
+        """
+        Get the thumbnail for a file, generating and caching it if needed.
+        
+        Args:
+            file_path: Path to source file
+            
+        Returns:
+            Path of the cached PNG
+            
+        Raises:
+            ValueError: If the file can't be decoded
+        """
+        path = self._thumbnail_path(self.cache_key(file_path))
+        if os.path.exists(path):
+            return path
+        
+        thumbnail = self.render_thumbnail(file_path, self.size)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary name first so readers never see partial files
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        thumbnail.save(tmp_path, format='PNG')
+        os.replace(tmp_path, path)
+        return path
+    
+    @staticmethod
+    def render_thumbnail(file_path: str, size: int = DEFAULT_SIZE) -> Image.Image:
+        """
+        Render a size-bounded preview without decoding the full page.
+        
+        Args:
+            file_path: Path to image or PDF file
+            size: Maximum edge length in pixels
+            
+        Returns:
+            PIL Image no larger than size x size
+            
+        Raises:
+            ValueError: If the file can't be decoded
+        """
+        try:
+            if FileHandler.is_pdf_file(file_path):
+                image = convert_from_path(
+                    file_path, dpi=ThumbnailCache.PDF_DPI, first_page=1, last_page=1, size=size
+                )[0]
+            else:
+                image = Image.open(file_path)
+                # JPEG can be decoded directly at 1/2, 1/4 or 1/8 scale
+                if image.format == 'JPEG':
+                    image.draft('RGB', (size, size))
+            
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            # reducing_gap lets PIL use the cheap reduce() before resampling
+            image.thumbnail((size, size), reducing_gap=2.0)
+            return image
+        except Exception as e:
+            raise ValueError(f"Failed to create thumbnail: {str(e)}")
@@ -0,0 +1,7 @@
+"""Shared test setup."""
+
+import os
+import sys
+
+# Make the src package importable when pytest is run from any directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
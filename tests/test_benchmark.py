@@ -0,0 +1,51 @@
+"""Tests for the helpers of the benchmark script."""
+
+import pytest
+
+import benchmark
+
+
+@pytest.mark.parametrize('reference, hypothesis, expected', [
+    ("Facture 42", "Facture 42", 0.0),
+    ("Facture  42\n", "Facture 42", 0.0),
+    ("abcd", "abxd", 0.25),
+    ("", "", 0.0),
+    ("", "x", 1.0),
+])
+def test_character_error_rate(reference, hypothesis, expected):
+    assert benchmark.character_error_rate(reference, hypothesis) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('page_index, page_count, expected', [
+    (0, 1, 'scan.pdf'),
+    (0, 3, 'scan.pdf#1'),
+    (2, 3, 'scan.pdf#3'),
+])
+def test_page_name(page_index, page_count, expected):
+    assert benchmark.page_name('samples/scan.pdf', page_index, page_count) == expected
+
+
+def test_read_truth_per_page(tmp_path):
+    (tmp_path / 'scan.1.txt').write_text("page un", encoding='utf-8')
+    (tmp_path / 'letter.txt').write_text("lettre", encoding='utf-8')
+    assert benchmark.read_truth(str(tmp_path), 'scan.pdf#1') == "page un"
+    assert benchmark.read_truth(str(tmp_path), 'scan.pdf#2') is None
+    assert benchmark.read_truth(str(tmp_path), 'letter.png') == "lettre"
+    assert benchmark.read_truth(None, 'letter.png') is None
+
+
+def test_profiles_are_checked_while_parsing(capsys):
+    parser = benchmark.build_parser()
+    args = parser.parse_args(['profiles', 'samples', '--profiles', 'fast, accurate'])
+    assert args.profiles == ['fast', 'accurate']
+    with pytest.raises(SystemExit) as error:
+        parser.parse_args(['profiles', 'samples', '--profiles', 'fast,acurate'])
+    assert error.value.code == 2
+    assert "unknown profile(s): acurate" in capsys.readouterr().err
+
+
+def test_profiles_engine_choices():
+    parser = benchmark.build_parser()
+    assert parser.parse_args(['profiles', 'samples', '--engine', 'cascade-easyocr']).engine == 'cascade-easyocr'
+    with pytest.raises(SystemExit):
+        parser.parse_args(['profiles', 'samples', '--engine', 'tesseract4'])
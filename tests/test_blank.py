@@ -0,0 +1,50 @@
+"""Tests for blank page detection."""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.ocr.blank import BlankPageDetector
+
+# A4 at 300 DPI
+A4_SHAPE = (3508, 2480)
+
+
+def render_page(lines, background=255):
+    """Render text lines onto an A4 page."""
+    page = np.full(A4_SHAPE, background, dtype=np.uint8)
+    for text, origin in lines:
+        cv2.putText(page, text, origin, cv2.FONT_HERSHEY_SIMPLEX, 1.6, 0, 3)
+    return page
+
+
+def test_white_page_is_blank():
+    assert BlankPageDetector().is_blank(render_page([]))
+
+
+def test_scanner_noise_is_blank():
+    noise = np.random.RandomState(0).normal(235, 8, A4_SHAPE)
+    page = np.clip(noise, 0, 255).astype(np.uint8)
+    assert BlankPageDetector().is_blank(page)
+
+
+@pytest.mark.parametrize('lines', [
+    [("Total: 1 250,00 EUR", (1500, 3000))],
+    [("Page 2", (1150, 3300))],
+])
+def test_sparse_single_line_page_is_not_blank(lines):
+    detector = BlankPageDetector()
+    page = render_page(lines)
+    ink_ratio, std = detector.measure(page)
+    # Low deviation alone must not discard a page with ink on it
+    assert ink_ratio >= detector.ink_threshold
+    assert not detector.is_blank(page)
+
+
+def test_counters_and_report():
+    detector = BlankPageDetector()
+    detector.is_blank(render_page([]))
+    detector.is_blank(render_page([("Page 2", (1150, 3300))]))
+    assert detector.pages_checked == 2
+    assert detector.blank_pages == 1
+    assert detector.report().startswith("1 of 2 page(s) blank")
@@ -0,0 +1,85 @@
+"""Tests for the confidence cascade between a fast and a neural engine."""
+
+import numpy as np
+import pytest
+
+from src.ocr.cascade import CascadeEngine
+from src.ocr.results import OCRWord
+
+PAGE = np.full((300, 800), 255, dtype=np.uint8)
+
+
+class StubEngine:
+    """Engine returning fixed words and recording the images it was given."""
+
+    def __init__(self, words):
+        self.words = words
+        self.images = []
+
+    def extract_words(self, image, language='Both', preprocess=True, **kwargs):
+        self.images.append(image)
+        return list(self.words)
+
+
+def tesseract_words(second_line_confidence):
+    """Two lines with Tesseract line keys, the second one of given confidence."""
+    return [
+        OCRWord('Bonjour', 0.95, (100, 50, 250, 90), line_key=(1, 1, 1)),
+        OCRWord('madame', 0.9, (270, 50, 420, 90), line_key=(1, 1, 1)),
+        OCRWord('Tota1', second_line_confidence, (100, 150, 220, 190), line_key=(1, 1, 2)),
+        OCRWord('l2O', second_line_confidence, (240, 150, 330, 190), line_key=(1, 1, 2)),
+    ]
+
+
+def test_confident_page_skips_fallback():
+    fallback = StubEngine([OCRWord('x', 1.0, (0, 0, 10, 10))])
+    cascade = CascadeEngine(StubEngine(tesseract_words(0.9)), fallback)
+    text = cascade.extract_text(PAGE, preprocess=False)
+    assert text == "Bonjour madame\nTota1 l2O"
+    assert fallback.images == []
+    assert cascade.report() == "0 of 2 line(s) re-run, 0 replaced"
+
+
+def test_weak_line_is_replaced_by_more_confident_fallback():
+    # Fallback boxes are relative to the line crop
+    fallback = StubEngine([
+        OCRWord('120', 0.9, (150, 10, 240, 50)),
+        OCRWord('Total', 0.9, (10, 10, 130, 50)),
+    ])
+    cascade = CascadeEngine(StubEngine(tesseract_words(0.3)), fallback, padding=0.25)
+    words = cascade.extract_words(PAGE, preprocess=False)
+
+    # The crop covers the weak line plus a quarter of its height around it
+    assert fallback.images[0].shape == (61, 251)
+    replaced = words[2:]
+    assert [word.text for word in replaced] == ['Total', '120']
+    assert replaced[0].bbox == (100.0, 150.0, 220.0, 190.0)
+    assert all(word.line_key == (1, 1, 2) for word in replaced)
+    assert cascade.report() == "1 of 2 line(s) re-run, 1 replaced"
+
+
+def test_less_confident_fallback_keeps_primary_line():
+    fallback = StubEngine([OCRWord('Tot', 0.2, (10, 10, 100, 50))])
+    cascade = CascadeEngine(StubEngine(tesseract_words(0.3)), fallback)
+    words = cascade.extract_words(PAGE, preprocess=False)
+    assert [word.text for word in words] == ['Bonjour', 'madame', 'Tota1', 'l2O']
+    assert cascade.lines_rerun == 1 and cascade.lines_replaced == 0
+
+
+def test_arabic_fallback_words_are_ordered_right_to_left():
+    fallback = StubEngine([
+        OCRWord('مرحبا', 0.9, (10, 10, 100, 50)),
+        OCRWord('بكم', 0.9, (120, 10, 200, 50)),
+    ])
+    cascade = CascadeEngine(StubEngine(tesseract_words(0.3)), fallback)
+    words = cascade.extract_words(PAGE, preprocess=False)
+    assert [word.text for word in words[2:]] == ['بكم', 'مرحبا']
+
+
+@pytest.mark.parametrize('confidences, expected', [
+    ([], 0.0),
+    ([0.2, 0.4], 0.3),
+])
+def test_mean_confidence(confidences, expected):
+    words = [OCRWord('w', confidence, (0, 0, 1, 1)) for confidence in confidences]
+    assert CascadeEngine.mean_confidence(words) == pytest.approx(expected)
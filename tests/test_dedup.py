@@ -0,0 +1,131 @@
+"""Tests for perceptual hashing and the duplicate page index."""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.ocr.dedup import DuplicateIndex
+from src.ocr.results import OCRWord, PageResult
+from src.utils.phash import dhash, hamming_distance, verification_thumbnail
+
+# A4 at 150 DPI, enough detail for the hash and thumbnails
+PAGE_SHAPE = (1754, 1240)
+
+
+def render_invoice(amount):
+    """Render an invoice page from a fixed template with one varying amount."""
+    page = np.full(PAGE_SHAPE, 255, dtype=np.uint8)
+    cv2.rectangle(page, (80, 80), (1160, 300), 0, 6)
+    cv2.putText(page, "FACTURE", (120, 220), cv2.FONT_HERSHEY_SIMPLEX, 4, 0, 10)
+    for row in range(12):
+        y = 420 + row * 90
+        cv2.line(page, (80, y), (1160, y), 0, 2)
+        cv2.putText(page, f"Article {row + 1}", (120, y + 60), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 0, 3)
+    cv2.putText(page, f"Total: {amount}", (120, 1620), cv2.FONT_HERSHEY_SIMPLEX, 3, 0, 8)
+    return page
+
+
+def recompress(page, quality=70):
+    """Return a JPEG-recompressed copy of a page."""
+    _, encoded = cv2.imencode('.jpg', page, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return cv2.imdecode(encoded, cv2.IMREAD_GRAYSCALE)
+
+
+def downscale(page, factor=0.8):
+    """Return a copy of a page rendered at a lower resolution."""
+    height, width = page.shape
+    size = (int(width * factor), int(height * factor))
+    return cv2.resize(page, size, interpolation=cv2.INTER_AREA)
+
+
+def make_result(page, source='a.pdf', page_index=0):
+    height, width = page.shape
+    words = [OCRWord('Total', 0.9, (120, 1560, 400, 1640))]
+    return PageResult(source, page_index, 'FACTURE Total', words=words, width=width, height=height)
+
+
+def index_page(index, page, **kwargs):
+    index.add(dhash(page), make_result(page, **kwargs), verification_thumbnail(page))
+
+
+def lookup(index, page):
+    height, width = page.shape
+    return index.lookup(dhash(page), verification_thumbnail(page), (width, height))
+
+
+@pytest.mark.parametrize('copy', [recompress, downscale])
+def test_copies_hash_close(copy):
+    page = render_invoice("1 250,00")
+    assert hamming_distance(dhash(page), dhash(copy(page))) <= 4
+
+
+def test_rgb_and_grayscale_hash_alike():
+    page = render_invoice("1 250,00")
+    assert dhash(np.dstack([page] * 3)) == dhash(page)
+
+
+@pytest.mark.parametrize('copy', [recompress, downscale])
+def test_copy_reuses_result(copy):
+    page = render_invoice("1 250,00")
+    index = DuplicateIndex()
+    index_page(index, page)
+
+    data = lookup(index, copy(page))
+    assert data is not None
+    assert data['source'] == 'a.pdf' and data['page'] == 1
+    assert index.hits == 1 and index.lookups == 1
+
+
+def test_same_template_with_other_amount_is_rejected():
+    index = DuplicateIndex()
+    index_page(index, render_invoice("1 250,00"))
+
+    other = render_invoice("7 980,50")
+    assert lookup(index, other) is None
+    assert index.rejected == 1
+    assert "rejected by the pixel check" in index.report()
+
+
+def test_page_of_other_shape_is_rejected():
+    page = render_invoice("1 250,00")
+    index = DuplicateIndex()
+    index_page(index, page)
+
+    wide = cv2.resize(page, (PAGE_SHAPE[1] * 2, PAGE_SHAPE[0]), interpolation=cv2.INTER_AREA)
+    assert lookup(index, wide) is None
+
+
+def test_persistent_index_is_shared_across_batches_with_same_settings(tmp_path):
+    db_path = str(tmp_path / 'dedup.db')
+    page = render_invoice("1 250,00")
+    first = DuplicateIndex(db_path, settings_key='tesseract/Both')
+    index_page(first, page)
+    first.close()
+
+    same = DuplicateIndex(db_path, settings_key='tesseract/Both')
+    assert lookup(same, recompress(page))['text'] == 'FACTURE Total'
+    same.close()
+
+    other = DuplicateIndex(db_path, settings_key='easyocr/Both')
+    assert lookup(other, page) is None
+    other.close()
+
+
+def test_apply_scales_boxes_to_the_current_page():
+    page = render_invoice("1 250,00")
+    index = DuplicateIndex()
+    index_page(index, page, source='a.pdf', page_index=2)
+    data = lookup(index, page)
+
+    height, width = PAGE_SHAPE
+    result = PageResult('b.pdf', 0, '', width=width * 2, height=height * 2)
+    DuplicateIndex.apply(data, result)
+    assert result.text == 'FACTURE Total'
+    assert result.duplicate_of == 'a.pdf#3'
+    assert result.words[0].bbox == (240.0, 3120.0, 800.0, 3280.0)
+
+
+def test_max_distance_must_fit_the_bands():
+    DuplicateIndex(max_distance=DuplicateIndex.BANDS - 1)
+    with pytest.raises(ValueError):
+        DuplicateIndex(max_distance=DuplicateIndex.BANDS)
@@ -0,0 +1,137 @@
+"""Tests for the streaming exporters."""
+
+import json
+import zipfile
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from src.ocr.results import OCRWord, PageResult
+from src.utils.export import ExportHandler
+from src.utils.page import Page
+
+ALTO = '{http://www.loc.gov/standards/alto/ns-v4#}'
+XHTML = '{http://www.w3.org/1999/xhtml}'
+
+
+def sample_results():
+    """Two pages of a PDF, a failed page and a single image."""
+    words = [
+        OCRWord('Facture', 0.96, (20, 20, 120, 50), line_key=(1, 1, 1)),
+        OCRWord('N°42', 0.91, (130, 20, 200, 50), line_key=(1, 1, 1)),
+        OCRWord('فاتورة', 0.88, (150, 80, 260, 110), line_key=(1, 1, 2)),
+        OCRWord('<&>', 0.5, (20, 80, 60, 110), line_key=(1, 1, 2)),
+    ]
+    return [
+        PageResult('in/a.pdf', 0, "Facture N°42\nفاتورة <&>", page_count=2, words=words,
+                   width=300, height=150, dpi=150),
+        PageResult('in/a.pdf', 1, "Page deux", page_count=2,
+                   words=[OCRWord('Page', 0.9, (20, 20, 80, 50)), OCRWord('deux', 0.9, (90, 20, 150, 50))],
+                   width=300, height=150, dpi=150),
+        PageResult('in/broken.pdf', 0, '', error="Failed to open"),
+        PageResult('in/b.png', 0, "Bonjour", words=[OCRWord('Bonjour', 0.99, (10, 10, 90, 40))],
+                   width=300, height=150, dpi=150),
+    ]
+
+
+def test_stream_to_txt(tmp_path):
+    path = str(tmp_path / 'out.txt')
+    assert ExportHandler.stream_export(iter(sample_results()), path)
+    separator = ExportHandler.SEPARATOR
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == (
+            f"{separator}\na.pdf\n{separator}\n\n"
+            "--- Page 1 ---\nFacture N°42\nفاتورة <&>\n\n"
+            "--- Page 2 ---\nPage deux\n\n"
+            f"{separator}\nb.png\n{separator}\n\n"
+            "Bonjour"
+        )
+
+
+def test_stream_to_jsonl_round_trips(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+    assert ExportHandler.stream_export(iter(sample_results()), path)
+    with open(path, encoding='utf-8') as f:
+        restored = [PageResult.from_dict(json.loads(line)) for line in f]
+    assert [(r.source, r.page_index, r.text, r.error) for r in restored] == [
+        (r.source, r.page_index, r.text, r.error) for r in sample_results()
+    ]
+    assert restored[0].words[1].bbox == (130.0, 20.0, 200.0, 50.0)
+
+
+def test_stream_to_docx(tmp_path):
+    path = str(tmp_path / 'out.docx')
+    assert ExportHandler.stream_export(iter(sample_results()), path)
+    with zipfile.ZipFile(path) as docx:
+        document = docx.read('word/document.xml').decode('utf-8')
+    for text in ('a.pdf', '--- Page 2 ---', 'Facture N°42', 'فاتورة &lt;&amp;&gt;', 'Bonjour'):
+        assert text in document
+    assert 'broken.pdf' not in document
+
+
+def test_stream_to_hocr(tmp_path):
+    path = str(tmp_path / 'out.hocr')
+    assert ExportHandler.stream_export(iter(sample_results()), path, 'hocr')
+    root = ET.parse(path).getroot()
+    pages = root.iter(f'{XHTML}div')
+    first = next(pages)
+    assert first.get('title') == 'image "a.pdf[0]"; bbox 0 0 300 150; ppageno 0'
+    lines = [span for span in first.iter(f'{XHTML}span') if span.get('class') == 'ocr_line']
+    assert lines[0].get('title') == 'bbox 20 20 200 50'
+    assert lines[0].get('dir') is None
+    assert lines[1].get('dir') == 'rtl'
+    words = [span for span in first.iter(f'{XHTML}span') if span.get('class') == 'ocrx_word']
+    assert [word.text for word in words] == ['Facture', 'N°42', 'فاتورة', '<&>']
+    assert words[0].get('title') == 'bbox 20 20 120 50; x_wconf 96'
+    assert len(list(pages)) == 2
+
+
+def test_stream_to_alto(tmp_path):
+    path = str(tmp_path / 'out.alto.xml')
+    assert ExportHandler.detect_format(path) == 'alto'
+    assert ExportHandler.stream_export(iter(sample_results()), path)
+    root = ET.parse(path).getroot()
+    pages = root.findall(f'{ALTO}Layout/{ALTO}Page')
+    assert len(pages) == 3
+    strings = pages[0].iter(f'{ALTO}String')
+    first = next(strings)
+    assert (first.get('CONTENT'), first.get('HPOS'), first.get('VPOS'), first.get('WIDTH'), first.get('HEIGHT')) == (
+        'Facture', '20', '20', '100', '30'
+    )
+    assert first.get('WC') == '0.96'
+    assert [s.get('CONTENT') for s in strings] == ['N°42', 'فاتورة', '<&>']
+
+
+def test_stream_to_pdf_has_text_layer(tmp_path):
+    pypdf = pytest.importorskip('pypdf')
+    results = [r for r in sample_results() if r.ok]
+    for result in results:
+        result.image = Page(np.full((150, 300), 255, dtype=np.uint8), dpi=150)
+    path = str(tmp_path / 'out.pdf')
+    assert ExportHandler.stream_export(iter(results), path)
+    assert all(result.image is None for result in results)
+
+    reader = pypdf.PdfReader(path)
+    assert len(reader.pages) == 3
+    # 300 x 150 pixels at 150 DPI
+    assert [float(v) for v in reader.pages[0].mediabox[2:]] == [144.0, 72.0]
+    assert 'Facture' in reader.pages[0].extract_text()
+    assert 'deux' in reader.pages[1].extract_text()
+
+
+def test_stream_to_pdf_needs_page_images(tmp_path):
+    assert not ExportHandler.stream_export(iter(sample_results()), str(tmp_path / 'out.pdf'))
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('out.TXT', 'txt'),
+    ('out.jsonl', 'jsonl'),
+    ('out.docx', 'docx'),
+    ('out.hocr', 'hocr'),
+    ('out.xml', 'xml'),
+    ('scan.Alto.XML', 'alto'),
+    ('out', ''),
+])
+def test_detect_format(name, expected):
+    assert ExportHandler.detect_format(name) == expected
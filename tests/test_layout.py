@@ -0,0 +1,73 @@
+"""Tests for line clustering and reading order of loose word boxes."""
+
+import numpy as np
+
+from src.ocr.layout import cluster_lines, reading_order
+from src.ocr.results import OCRWord, group_lines, words_to_text
+
+
+def as_lists(lines):
+    return [line.tolist() for line in lines]
+
+
+def test_empty_input():
+    assert cluster_lines(np.zeros((0, 4))).tolist() == []
+    assert reading_order(np.zeros((0, 4)), []) == []
+
+
+def test_small_boxes_stay_on_their_line():
+    boxes = np.array([
+        [10, 100, 200, 140],   # word
+        [210, 125, 220, 140],  # comma on the baseline
+        [230, 102, 400, 141],  # word
+        [10, 160, 200, 200],   # next line
+    ], dtype=float)
+    assert cluster_lines(boxes).tolist() == [0, 0, 0, 1]
+
+
+def test_tight_lines_of_large_print_are_separated():
+    # 100 px tall lines with a 30 px overlap caused by ascenders and descenders
+    boxes = np.array([[0, 0, 300, 100], [0, 70, 300, 170], [0, 140, 300, 240]], dtype=float)
+    assert cluster_lines(boxes).tolist() == [0, 1, 2]
+
+
+def test_lines_read_in_their_script_direction():
+    boxes = np.array([
+        [500, 10, 600, 40],  # Arabic line, leftmost word read last
+        [700, 10, 800, 40],
+        [300, 10, 450, 40],
+        [10, 60, 100, 90],   # French line
+        [250, 60, 300, 90],
+        [120, 60, 230, 90],
+    ], dtype=float)
+    texts = ['بن', 'محمد', 'أحمد', 'Facture', '42', 'numéro']
+    assert as_lists(reading_order(boxes, texts)) == [[1, 0, 2], [3, 5, 4]]
+
+
+def test_line_direction_follows_majority_script():
+    # An Arabic line with an embedded Latin reference is still read right to left
+    boxes = np.array([[10, 10, 100, 40], [120, 10, 300, 40], [320, 10, 500, 40]], dtype=float)
+    texts = ['FAC-42', 'الفاتورة', 'رقم']
+    assert as_lists(reading_order(boxes, texts)) == [[2, 1, 0]]
+
+
+def test_words_to_text_uses_layout_for_loose_words():
+    words = [
+        OCRWord('monde', 0.9, (120, 12, 200, 40)),
+        OCRWord('مرحبا', 0.9, (300, 60, 400, 90)),
+        OCRWord('Bonjour', 0.9, (10, 10, 110, 40)),
+        OCRWord('بكم', 0.9, (150, 60, 280, 90)),
+    ]
+    assert [[word.text for word in line] for line in group_lines(words)] == [
+        ['Bonjour', 'monde'], ['مرحبا', 'بكم']
+    ]
+    assert words_to_text(words) == "Bonjour monde\nمرحبا بكم"
+
+
+def test_engine_line_keys_take_precedence():
+    words = [
+        OCRWord('b', 0.9, (0, 0, 10, 10), line_key=(1, 1, 1)),
+        OCRWord('c', 0.9, (0, 100, 10, 110), line_key=(1, 2, 1)),
+        OCRWord('a', 0.9, (50, 0, 60, 10), line_key=(1, 1, 1)),
+    ]
+    assert words_to_text(words) == "b a\n\nc"
@@ -0,0 +1,80 @@
+"""Tests for memory-based backpressure."""
+
+import pytest
+
+from src.utils import memory
+from src.utils.memory import MB, MemoryGovernor
+
+
+class FakeRss:
+    """Resident memory readings served from a list, repeating the last one."""
+
+    def __init__(self, *readings):
+        self.readings = list(readings)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if len(self.readings) > 1:
+            return self.readings.pop(0)
+        return self.readings[0]
+
+
+@pytest.fixture
+def rss(monkeypatch):
+    def install(*readings_mb):
+        fake = FakeRss(*(reading * MB for reading in readings_mb))
+        monkeypatch.setattr(memory, 'current_rss', fake)
+        monkeypatch.setattr(memory, 'release_free_memory', lambda: None)
+        monkeypatch.setattr(memory, 'reset_peak_rss', lambda: False)
+        return fake
+    return install
+
+
+def governor(max_wait=0.5):
+    return MemoryGovernor(budget_bytes=1000 * MB, max_wait=max_wait, poll_interval=0.001)
+
+
+@pytest.mark.parametrize('used_mb, expected', [(300, 8), (500, 8), (640, 4), (850, 1), (990, 1)])
+def test_workers_shrink_towards_the_high_water_mark(rss, used_mb, expected):
+    rss(used_mb)
+    assert governor().workers(8) == expected
+
+
+def test_no_budget_means_no_pressure(rss):
+    rss(5000)
+    assert MemoryGovernor().pressure() == 0.0
+    assert MemoryGovernor().workers(4) == 4
+
+
+def test_pause_until_memory_drops(rss):
+    readings = rss(900, 900, 900, 880, 700)
+    gov = governor()
+    gov.wait_for_room()
+    assert gov.pauses == 1 and gov.overruns == 0
+    assert readings.calls == 5
+
+
+def test_pause_gives_up_and_stops_pausing_while_over_budget(rss):
+    rss(950)
+    gov = governor(max_wait=0.01)
+    gov.wait_for_room()
+    gov.wait_for_room()
+    assert gov.pauses == 1 and gov.overruns == 2
+
+
+def test_throttle_passes_every_item(rss):
+    rss(100)
+    assert list(governor().throttle(iter(range(5)))) == [0, 1, 2, 3, 4]
+
+
+def test_document_peak_is_recorded(rss):
+    rss(200, 200, 450, 300)
+    gov = governor()
+    gov.start_document('in/a.pdf')
+    gov.pressure()
+    gov.pressure()
+    document = gov.end_document()
+    assert document.peak_rss == 450 * MB
+    assert gov.end_document() is None
+    assert gov.report().startswith("peak 450 MB (a.pdf)")
@@ -0,0 +1,66 @@
+"""Tests for the shared Page buffer."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.utils.page import Page, as_array
+
+
+def test_contiguous_uint8_array_is_not_copied():
+    array = np.zeros((20, 30, 3), dtype=np.uint8)
+    page = Page(array)
+    assert page.array is array
+    assert page.mode == 'RGB'
+    assert page.size == (30, 20)
+    assert page.nbytes == 20 * 30 * 3
+
+
+def test_strided_array_is_made_contiguous():
+    array = np.zeros((20, 60), dtype=np.uint8)[:, ::2]
+    page = Page(array)
+    assert page.array.flags['C_CONTIGUOUS']
+    assert page.mode == 'L'
+    assert page.size == (30, 20)
+
+
+@pytest.mark.parametrize('shape', [(10,), (10, 10, 4), (10, 10, 1, 1)])
+def test_unsupported_shape_is_rejected(shape):
+    with pytest.raises(ValueError):
+        Page(np.zeros(shape, dtype=np.uint8))
+
+
+@pytest.mark.parametrize('mode, expected', [
+    ('1', 'L'),
+    ('L', 'L'),
+    ('RGB', 'RGB'),
+    ('RGBA', 'RGB'),
+    ('P', 'RGB'),
+])
+def test_from_pil_keeps_grayscale_single_channel(mode, expected):
+    page = Page.from_pil(Image.new(mode, (16, 8)))
+    assert page.mode == expected
+    assert page.size == (16, 8)
+
+
+def test_from_pil_reads_dpi_unless_overridden():
+    image = Image.new('L', (16, 8))
+    image.info['dpi'] = (299.9994, 299.9994)
+    assert Page.from_pil(image).dpi == 300
+    assert Page.from_pil(image, dpi=150).dpi == 150
+    assert Page.from_pil(Image.new('L', (16, 8))).dpi is None
+
+
+def test_pil_round_trip():
+    array = np.arange(48, dtype=np.uint8).reshape(4, 4, 3)
+    image = Page(array).to_pil()
+    assert image.mode == 'RGB'
+    assert np.array_equal(np.asarray(image), array)
+
+
+def test_as_array_accepts_every_image_type():
+    array = np.zeros((4, 4), dtype=np.uint8)
+    page = Page(array)
+    assert as_array(page) is array
+    assert as_array(array) is array
+    assert np.array_equal(as_array(page.to_pil()), array)
@@ -0,0 +1,73 @@
+"""Tests for the pieces of PDF rasterization that do not need poppler."""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.utils import pdf_raster
+from src.utils.pdf_raster import default_threads, plan_chunks, read_pnm
+
+
+@pytest.fixture(params=[True, False], ids=['memmap', 'read'])
+def memmap_pages(request, monkeypatch):
+    monkeypatch.setattr(pdf_raster, 'MEMMAP_PAGES', request.param)
+    return request.param
+
+
+@pytest.mark.parametrize('mode, suffix', [('L', '.pgm'), ('RGB', '.ppm')])
+def test_read_pnm_matches_pil(tmp_path, memmap_pages, mode, suffix):
+    shape = (30, 40) if mode == 'L' else (30, 40, 3)
+    array = np.random.RandomState(0).randint(0, 256, shape).astype(np.uint8)
+    path = str(tmp_path / ('page' + suffix))
+    Image.fromarray(array, mode).save(path)
+    assert np.array_equal(read_pnm(path), array)
+
+
+def test_read_pnm_handles_whitespace_pixels(tmp_path, memmap_pages):
+    # The first pixel values are whitespace bytes (tab, newline, space)
+    pixels = bytes([9, 10, 32, 200, 0, 255])
+    path = tmp_path / 'page.pgm'
+    path.write_bytes(b'P5 3\n2\t255\n' + pixels)
+    assert read_pnm(str(path)).tolist() == [[9, 10, 32], [200, 0, 255]]
+
+
+def test_writing_to_page_leaves_file_untouched(tmp_path, memmap_pages):
+    path = tmp_path / 'page.pgm'
+    path.write_bytes(b'P5\n2 1\n255\n' + bytes([1, 2]))
+    array = read_pnm(str(path))
+    array[...] = 0
+    del array
+    assert read_pnm(str(path)).tolist() == [[1, 2]]
+
+
+@pytest.mark.parametrize('content', [
+    b'P2\n2 1\n255\n1 2\n',
+    b'P5\n2 1\n65535\n' + bytes(4),
+    b'P5\n2',
+])
+def test_read_pnm_rejects_unsupported_files(tmp_path, content):
+    path = tmp_path / 'page.pnm'
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        read_pnm(str(path))
+
+
+@pytest.mark.parametrize('indices, chunk_size, expected', [
+    ([], 4, []),
+    ([0, 1, 2, 3, 4, 5], 4, [[(0, 3)], [(4, 5)]]),
+    ([0, 1, 3, 4, 7], 3, [[(0, 1), (3, 3)], [(4, 4), (7, 7)]]),
+    ([5, 9, 10, 11], 10, [[(5, 5), (9, 11)]]),
+])
+def test_plan_chunks(indices, chunk_size, expected):
+    assert plan_chunks(indices, chunk_size) == expected
+
+
+@pytest.mark.parametrize('value, expected', [('3', 3), ('0', 1), (' 2 ', 2)])
+def test_default_threads_from_environment(monkeypatch, value, expected):
+    monkeypatch.setenv('OCR_PDF_THREADS', value)
+    assert default_threads() == expected
+
+
+def test_default_threads_ignores_invalid_values(monkeypatch):
+    monkeypatch.setenv('OCR_PDF_THREADS', 'many')
+    assert 1 <= default_threads() <= 4
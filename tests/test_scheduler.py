@@ -0,0 +1,82 @@
+"""Tests for size-aware ordering of batch files."""
+
+import shutil
+
+import pytest
+from PIL import Image
+
+from src.ocr.results import PageResult
+from src.ocr.scheduler import JobScheduler, ScheduleStats
+
+A4_300DPI = (2480, 3508)
+
+
+@pytest.fixture
+def files(tmp_path):
+    """A large-format scan, an A4 scan, a receipt and a two-frame TIFF of A4 scans."""
+    plan = str(tmp_path / 'plan.png')
+    Image.new('L', (4960, 7016), 255).save(plan)
+    scan = str(tmp_path / 'scan.png')
+    Image.new('L', A4_300DPI, 255).save(scan)
+    receipt = str(tmp_path / 'receipt.png')
+    Image.new('L', (620, 877), 255).save(receipt)
+    tiff = str(tmp_path / 'pair.tif')
+    frames = [Image.new('L', A4_300DPI, 255) for _ in range(2)]
+    frames[0].save(tiff, save_all=True, append_images=frames[1:], compression='tiff_lzw')
+    return [plan, scan, receipt, tiff]
+
+
+def test_estimate_cost_in_reference_pages(files, tmp_path):
+    plan, scan, receipt, tiff = files
+    assert JobScheduler.estimate_cost(plan) == pytest.approx(4.0)
+    assert JobScheduler.estimate_cost(scan) == pytest.approx(1.0)
+    assert JobScheduler.estimate_cost(receipt) == pytest.approx(0.0625, rel=0.01)
+    assert JobScheduler.estimate_cost(tiff) == pytest.approx(2.0)
+    assert JobScheduler.estimate_cost(str(tmp_path / 'missing.png')) == 1.0
+
+
+@pytest.mark.skipif(shutil.which('pdfinfo') is None, reason="poppler is not installed")
+def test_pdf_cost_is_its_page_count(tmp_path):
+    pdf = str(tmp_path / 'report.pdf')
+    pages = [Image.new('L', (100, 140), 255) for _ in range(5)]
+    pages[0].save(pdf, save_all=True, append_images=pages[1:])
+    assert JobScheduler.estimate_cost(pdf) == 5.0
+
+
+@pytest.mark.parametrize('policy, expected', [
+    ('fifo', [0, 1, 2, 3]),
+    ('sjf', [2, 1, 3, 0]),
+    ('lpt', [0, 3, 1, 2]),
+])
+def test_order(files, policy, expected):
+    assert JobScheduler(policy).order(files) == [files[i] for i in expected]
+
+
+def test_ties_keep_submission_order(tmp_path):
+    paths = []
+    for name in ('b.png', 'a.png', 'c.png'):
+        path = str(tmp_path / name)
+        Image.new('L', (100, 100), 255).save(path)
+        paths.append(path)
+    assert JobScheduler('sjf').order(paths) == paths
+    assert JobScheduler('lpt').order(paths) == paths
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        JobScheduler('random')
+
+
+def test_stats_record_each_document_once():
+    stats = ScheduleStats()
+    results = [PageResult('a.pdf', 0, ''), PageResult('a.pdf', 1, ''), PageResult('b.png', 0, '')]
+    assert list(stats.track(results)) == results
+    assert list(stats.completions) == ['a.pdf', 'b.png']
+    assert stats.completions['a.pdf'] <= stats.completions['b.png'] == stats.makespan
+    assert stats.report().startswith("2 document(s), makespan")
+
+
+def test_empty_stats():
+    stats = ScheduleStats()
+    assert list(stats.track([])) == []
+    assert stats.makespan == 0.0 and stats.mean_completion == 0.0
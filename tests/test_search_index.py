@@ -0,0 +1,98 @@
+"""Tests for text normalization and the full-text search index."""
+
+import pytest
+
+from src.ocr.results import PageResult
+from src.utils.search_index import SearchIndex, build_query, normalize_text
+
+
+@pytest.mark.parametrize('text, expected', [
+    # French accents, ligatures and case
+    ("Échéance Œuvre", "echeance oeuvre"),
+    # Harakat and shadda
+    ("مُحَمَّد", "محمد"),
+    # Hamza on alef, madda, alef wasla
+    ("أحمد إبراهيم آمنة ٱلله", "احمد ابراهيم امنة الله"),
+    # Tatweel
+    ("مـــدرسة", "مدرسة"),
+    # Alef maksura and Persian ya
+    ("مستشفى ی", "مستشفي ي"),
+    # Arabic-Indic and extended Arabic-Indic digits
+    ("٠١٢٣٤٥٦٧٨٩ ۰۱۲۳۴۵۶۷۸۹", "0123456789 0123456789"),
+    # Presentation forms (lam-alef ligature)
+    ("ﻻ", "لا"),
+])
+def test_normalize_text(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize('query, prefix, expected', [
+    ("Facture  N°42", False, '"facture" "n°42"'),
+    ('say "hi"', False, '"say" """hi"""'),
+    ("- *", False, ''),
+    ("fact", True, '"fact"*'),
+    ("", True, ''),
+])
+def test_build_query(query, prefix, expected):
+    assert build_query(query, prefix) == expected
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / 'search.sqlite'))
+    yield index
+    index.close()
+
+
+def test_search_ignores_accents_and_harakat(index):
+    index.add_page('h1', 'facture.pdf', 0, 2, "Facture FAC-2023-0042\nÉchéance : 30 jours")
+    index.add_page('h1', 'facture.pdf', 1, 2, "مُحَمَّد بن أحمد\nالمبلغ ١٢٠")
+
+    hits = index.search("echeance")
+    assert [(hit.path.endswith('facture.pdf'), hit.page_index) for hit in hits] == [(True, 0)]
+    assert hits[0].snippet == "Échéance : 30 jours"
+
+    assert [hit.page_index for hit in index.search("محمد احمد")] == [1]
+    assert [hit.page_index for hit in index.search("120")] == [1]
+    assert [hit.page_index for hit in index.search("FAC-2023-0042")] == [0]
+    assert index.search("FAC-2023-0043") == []
+
+
+def test_prefix_search(index):
+    index.add_page('h1', 'a.pdf', 0, 1, "Rechnung Bestellung")
+    assert index.search("bestel") == []
+    assert len(index.search("bestel", prefix=True)) == 1
+
+
+def test_reindexing_replaces_the_page(index):
+    index.add_page('h1', 'a.pdf', 0, 1, "ancien texte")
+    index.add_page('h1', 'moved/a.pdf', 0, 1, "nouveau texte")
+    assert index.page_total() == 1
+    assert index.search("ancien") == []
+    assert index.search("nouveau")[0].path.endswith('moved/a.pdf')
+    assert index.page_text('h1', 0) == "nouveau texte"
+    assert index.page_text('h1', 1) is None
+
+
+def test_add_result_skips_failed_and_blank_pages(index, tmp_path):
+    source = tmp_path / 'scan.png'
+    source.write_bytes(b'not really a png')
+    blank = PageResult(str(source), 1, '', page_count=3)
+    blank.blank = True
+
+    assert index.add_result(PageResult(str(source), 0, "bonjour", page_count=3))
+    assert not index.add_result(blank)
+    assert not index.add_result(PageResult(str(source), 2, '', page_count=3, error="failed"))
+    assert not index.add_result(PageResult(str(tmp_path / 'gone.png'), 0, "bonjour"))
+    assert index.page_total() == 1
+
+
+def test_writes_are_visible_after_commit(tmp_path):
+    path = str(tmp_path / 'search.sqlite')
+    writer = SearchIndex(path)
+    writer.add_page('h1', 'a.pdf', 0, 1, "bonjour")
+    writer.commit()
+    reader = SearchIndex(path)
+    assert len(reader.search("bonjour")) == 1
+    reader.close()
+    writer.close()
@@ -0,0 +1,100 @@
+"""Tests for sharded batch runs and the merge of their outputs."""
+
+import json
+import os
+
+import pytest
+from PIL import Image
+
+from src.ocr import sharding
+from src.ocr.results import PageResult
+
+
+@pytest.mark.parametrize('value, expected', [('1/1', (1, 1)), ('3/8', (3, 8))])
+def test_parse_shard(value, expected):
+    assert sharding.parse_shard(value) == expected
+
+
+@pytest.mark.parametrize('value', ['0/4', '5/4', '1/0', '2', 'a/b', '1/2/3'])
+def test_parse_shard_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        sharding.parse_shard(value)
+
+
+def test_shard_assignment_is_stable_and_spread():
+    shards = [sharding.shard_of('scans/big.pdf', page, 4) for page in range(400)]
+    assert shards == [sharding.shard_of('scans/big.pdf', page, 4) for page in range(400)]
+    assert set(shards) == {1, 2, 3, 4}
+    # Paths are normalized, so equivalent spellings land on the same shard
+    assert sharding.unit_key('scans/./big.pdf', 3) == sharding.unit_key('scans/big.pdf', 3)
+
+
+@pytest.fixture
+def batch(tmp_path):
+    """A ten-page TIFF and a single-page PNG."""
+    frames = [Image.new('L', (40, 40), color) for color in range(0, 250, 25)]
+    tiff = str(tmp_path / 'scan.tif')
+    frames[0].save(tiff, save_all=True, append_images=frames[1:])
+    png = str(tmp_path / 'letter.png')
+    Image.new('RGB', (40, 40), 'white').save(png)
+    return [tiff, png]
+
+
+def test_shards_partition_the_batch(batch):
+    count = 3
+    owners = {}
+    for index in range(1, count + 1):
+        page_counts, selection = sharding.plan_shard(batch, index, count)
+        assert page_counts == [(batch[0], 10), (batch[1], 1)]
+        for file_path, pages in selection.items():
+            for page in pages:
+                owners.setdefault((file_path, page), []).append(index)
+    assert len(owners) == 11
+    assert all(len(shards) == 1 for shards in owners.values())
+
+
+def run_shards(directory, batch, count, drop=()):
+    """Write the outputs and manifests each shard of a batch would produce."""
+    for index in range(1, count + 1):
+        page_counts, selection = sharding.plan_shard(batch, index, count)
+        base = os.path.join(directory, sharding.shard_name(index, count))
+        with open(base + '.jsonl', 'w', encoding='utf-8') as f:
+            for file_path, page_count in page_counts:
+                for page in selection.get(file_path, []):
+                    if (file_path, page) in drop:
+                        continue
+                    result = PageResult(file_path, page, f"page {page + 1}", page_count=page_count)
+                    f.write(json.dumps(result.to_dict()) + '\n')
+        sharding.write_manifest(base + sharding.MANIFEST_SUFFIX, index, count, page_counts, {'pages': 0})
+
+
+def test_merge_restores_batch_order(tmp_path, batch):
+    run_shards(str(tmp_path), batch, 3)
+    merged = [(r.source, r.page_index, r.text) for r in sharding.merge_shards(str(tmp_path))]
+    expected = [(batch[0], page, f"page {page + 1}") for page in range(10)]
+    expected.append((batch[1], 0, "page 1"))
+    assert merged == expected
+
+
+def test_merge_reports_missing_pages(tmp_path, batch):
+    run_shards(str(tmp_path), batch, 2, drop={(batch[0], 4)})
+    merged = list(sharding.merge_shards(str(tmp_path)))
+    assert len(merged) == 11
+    missing = [r for r in merged if not r.ok]
+    assert [(r.source, r.page_index, r.page_count) for r in missing] == [(batch[0], 4, 10)]
+    assert missing[0].error == sharding.MISSING_PAGE_ERROR
+
+
+def test_merge_requires_every_shard(tmp_path, batch):
+    run_shards(str(tmp_path), batch, 3)
+    os.remove(os.path.join(str(tmp_path), sharding.shard_name(2, 3) + sharding.MANIFEST_SUFFIX))
+    with pytest.raises(ValueError, match='shard-0002-of-0003'):
+        list(sharding.merge_shards(str(tmp_path)))
+
+
+def test_merge_rejects_shards_of_different_batches(tmp_path, batch):
+    run_shards(str(tmp_path), batch, 2)
+    path = os.path.join(str(tmp_path), sharding.shard_name(2, 2) + sharding.MANIFEST_SUFFIX)
+    sharding.write_manifest(path, 2, 2, [(batch[0], 10)], {'pages': 0})
+    with pytest.raises(ValueError, match='different batches'):
+        sharding.read_manifests(str(tmp_path))
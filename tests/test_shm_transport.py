@@ -0,0 +1,107 @@
+"""Tests for the shared-memory page pool."""
+
+import numpy as np
+import pytest
+
+from src.utils.shm_transport import (
+    GRANULARITY, MIN_SHARED_BYTES, PageDescriptor, SharedPagePool, SharedPageReader, pack_page
+)
+
+
+@pytest.fixture
+def pool():
+    pool = SharedPagePool()
+    yield pool
+    pool.close()
+
+
+def page(height, width, channels=3, seed=0):
+    shape = (height, width, channels) if channels > 1 else (height, width)
+    return np.random.RandomState(seed).randint(0, 256, shape).astype(np.uint8)
+
+
+def test_reader_sees_the_pixels(pool):
+    array = page(700, 500)
+    descriptor = pool.put(array)
+    reader = SharedPageReader()
+    view = reader.view(descriptor)
+    assert view.shape == array.shape and view.dtype == np.uint8
+    assert np.array_equal(view, array)
+    del view
+    reader.close()
+
+
+def test_buffers_are_reused_for_pages_of_similar_size(pool):
+    for seed in range(5):
+        descriptor = pool.put(page(700, 500, seed=seed))
+        pool.release(descriptor)
+    assert pool.created == 1 and pool.reused == 4
+    assert pool.report() == "1 shared buffer(s) created, 4 reused"
+
+
+def test_smallest_fitting_buffer_is_taken(pool):
+    small = pool.put(page(10, 10))
+    large = pool.put(page(1000, 1000))
+    pool.release(large)
+    pool.release(small)
+
+    assert pool.put(page(20, 20)).name == small.name
+    assert pool.put(page(900, 900)).name == large.name
+
+
+def test_buffers_in_use_are_not_shared(pool):
+    first = pool.put(page(10, 10))
+    second = pool.put(page(10, 10))
+    assert first.name != second.name
+    assert pool.created == 2
+
+
+def test_free_buffers_beyond_the_limit_are_freed_smallest_first():
+    pool = SharedPagePool(max_free=1)
+    try:
+        small = pool.put(page(10, 10))
+        large = pool.put(page(1000, 1000))
+        pool.release(large)
+        pool.release(small)
+        assert [buffer.name for buffer in pool._free] == [large.name]
+    finally:
+        pool.close()
+
+
+def test_buffer_size_is_rounded_to_granularity(pool):
+    pool.put(page(10, 10))
+    assert all(buffer.size % GRANULARITY == 0 for buffer in pool._in_use.values())
+
+
+def test_releasing_twice_is_harmless(pool):
+    descriptor = pool.put(page(10, 10))
+    pool.release(descriptor)
+    pool.release(descriptor)
+    assert len(pool._free) == 1
+
+
+def test_pack_page_pickles_small_pages(pool):
+    small = np.zeros((100, 100), dtype=np.uint8)
+    assert small.nbytes < MIN_SHARED_BYTES
+    assert pack_page(pool, small) is small
+
+    # Large pages go to shared memory, strided ones made contiguous first
+    large = page(1000, 2000, channels=1)[:, ::2]
+    descriptor = pack_page(pool, large)
+    assert isinstance(descriptor, PageDescriptor)
+    reader = SharedPageReader()
+    view = reader.view(descriptor)
+    assert np.array_equal(view, large)
+    del view
+    reader.close()
+
+
+def test_reader_unmaps_old_segments(pool):
+    reader = SharedPageReader(max_mapped=2)
+    descriptors = [pool.put(page(10, 10, seed=seed)) for seed in range(3)]
+    for descriptor in descriptors:
+        reader.view(descriptor)
+    assert descriptors[-1].name in reader._segments
+    assert len(reader._segments) <= 2
+    reader.close()
+    assert reader._segments == {}
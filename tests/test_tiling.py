@@ -0,0 +1,124 @@
+"""Tests for tiled recognition of oversized scans."""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.ocr.profiles import PROFILES
+from src.ocr.results import OCRWord
+from src.ocr.tiling import TiledRecognizer
+from src.utils.page import Page
+
+A4_INCHES = (8.27, 11.69)
+A3_INCHES = (11.69, 16.54)
+
+
+def blank_page(inches, dpi):
+    """Create a white page of a paper size at a resolution."""
+    width, height = (int(round(side * dpi)) for side in inches)
+    return Page(np.full((height, width), 255, dtype=np.uint8), dpi=dpi)
+
+
+@pytest.mark.parametrize('profile', sorted(PROFILES))
+def test_a4_page_is_not_tiled_at_any_profile_dpi(profile):
+    dpi = PROFILES[profile].dpi
+    assert not TiledRecognizer(None).should_tile(blank_page(A4_INCHES, dpi))
+
+
+@pytest.mark.parametrize('dpi', [300, 400])
+def test_a3_page_is_tiled(dpi):
+    assert TiledRecognizer(None).should_tile(blank_page(A3_INCHES, dpi))
+
+
+def test_plain_array_uses_pixel_limit():
+    recognizer = TiledRecognizer(None, max_pixels=100)
+    assert recognizer.should_tile(np.zeros((11, 10), dtype=np.uint8))
+    assert not recognizer.should_tile(np.zeros((10, 10), dtype=np.uint8))
+
+
+class BoxEngine:
+    """Fake engine that recognizes every dark blob fully inside the image as a word."""
+
+    def __init__(self):
+        self.calls = []
+        self.fragments = 0
+
+    def extract_words(self, image, language='Both', preprocess=True, **kwargs):
+        self.calls.append((image.shape, kwargs))
+        count, _, stats, _ = cv2.connectedComponentsWithStats((image < 128).astype(np.uint8))
+        height, width = image.shape
+        words = []
+        for x, y, w, h, _ in stats[1:count]:
+            # Blobs cut by the image edge are recognized too, as fragments
+            partial = x == 0 or y == 0 or x + w == width or y + h == height
+            self.fragments += partial
+            words.append(OCRWord('part' if partial else 'word', 0.5 if partial else 0.9, (x, y, x + w, y + h)))
+        return words
+
+
+def word_page(width, height, step=310):
+    """Draw a grid of word-sized blobs and return the page and their boxes."""
+    page = np.full((height, width), 255, dtype=np.uint8)
+    boxes = []
+    for y in range(100, height - 100, step // 2):
+        for x in range(100, width - 300, step):
+            page[y:y + 40, x:x + 140] = 0
+            boxes.append((float(x), float(y), float(x + 140), float(y + 40)))
+    return page, boxes
+
+
+@pytest.mark.parametrize('width, height', [(2048, 2048), (2049, 1000), (5000, 3000)])
+def test_tiles_cover_the_image(width, height):
+    tiles = TiledRecognizer.split_tiles(width, height, 2048, 160)
+    covered = np.zeros((height, width), dtype=bool)
+    for x0, y0, x1, y1 in tiles:
+        assert x1 - x0 <= 2048 and y1 - y0 <= 2048
+        covered[y0:y1, x0:x1] = True
+    assert covered.all()
+
+
+def test_cores_partition_the_image():
+    tiles = TiledRecognizer.split_tiles(5000, 3000, 2048, 160)
+    owners = np.zeros((3000, 5000), dtype=np.uint8)
+    for tile in tiles:
+        x0, y0, x1, y1 = (int(round(v)) for v in TiledRecognizer.core_region(tile, tiles))
+        owners[y0:y1, x0:x1] += 1
+    assert (owners == 1).all()
+
+
+def test_overlap_must_be_smaller_than_tile():
+    with pytest.raises(ValueError):
+        TiledRecognizer(None, tile_size=512, overlap=512)
+
+
+def test_tiled_words_match_the_page():
+    page, boxes = word_page(5000, 3000)
+    engine = BoxEngine()
+    recognizer = TiledRecognizer(engine, max_pixels=1_000_000, max_workers=2)
+    words = recognizer.extract_words(page, preprocess=False)
+
+    assert len(engine.calls) == len(TiledRecognizer.split_tiles(5000, 3000, 2048, 160))
+    # Some words are cut by tile edges, only their complete copies are kept
+    assert engine.fragments > 0
+    assert all(kwargs['deskew'] is False for _, kwargs in engine.calls)
+    assert sorted(word.bbox for word in words) == sorted(boxes)
+    assert {word.text for word in words} == {'word'}
+
+
+def test_small_page_goes_straight_to_engine():
+    page, boxes = word_page(1000, 800)
+    engine = BoxEngine()
+    words = TiledRecognizer(engine).extract_words(page, preprocess=False)
+    assert engine.calls == [((800, 1000), {})]
+    assert sorted(word.bbox for word in words) == sorted(boxes)
+
+
+def test_merge_keeps_most_confident_of_overlapping_boxes():
+    tiles = [(0, 0, 100, 100)]
+    words = [[
+        OCRWord('low', 0.4, (10, 10, 50, 30)),
+        OCRWord('high', 0.8, (11, 10, 51, 30)),
+        OCRWord('apart', 0.5, (60, 60, 90, 80)),
+    ]]
+    merged = TiledRecognizer.merge_tile_words(tiles, words)
+    assert sorted(word.text for word in merged) == ['apart', 'high']